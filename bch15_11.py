@@ -1,25 +1,22 @@
 import bch_utils
 
 
-class BCH15_11:
-    def __init__(self):
-        self.n = 15
-        self.k = 11
-        self.t = 1
-        self.generator = [1, 0, 0, 1, 1]
+class BCH15_11(bch_utils.BCHCode):
+    def __init__(self, decoder="table"):
+        super().__init__(15, 11, decoder=decoder)
 
-    def encode(self, data, output="codeword"):
-        return bch_utils.encode(data, self.generator, self.n, self.k, output=output)
-
-    def validation_encode(self, data, output="codeword"):
-        return bch_utils.validation_encode(data, self.n, self.k, output=output)
-
-    def decode(self, codeword):
-        return bch_utils.decode(codeword, self.generator, self.t)
-
-    def validation_decode(self, codeword):
-        return bch_utils.validation_decode(codeword, self.n, self.k)
 
+# Module-level shortcuts bound to a default instance
+_code = BCH15_11()
+n, k, t = _code.n, _code.k, _code.t
+encode = _code.encode
+encode_batch = _code.encode_batch
+decode = _code.decode
+decode_batch = _code.decode_batch
+validation_encode = true_encode = _code.validation_encode
+validation_decode = true_decode = _code.validation_decode
 
 if __name__ == "__main__":
-    bch_utils.run_bch_interaction(BCH15_11())
+    # The prompts and the simulation helpers they use stay out of plain imports of the code
+    import interactive
+    interactive.run_bch_interaction(BCH15_11())
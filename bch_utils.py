@@ -1,42 +1,122 @@
-import galois
+import functools
+import itertools
+
 import numpy as np
-import pyinputplus as pyip
 
-from transmission_simulation import flip_random_bits, introduce_error
+import gf
+import kernels
+import packed
+import profiling
+import shared_tables
 
+DECODERS = ("trapping", "table", "algebraic")
+
+
+def _bits_to_int(bits):
+    bits = np.asarray(bits, dtype=np.uint8)
+    padding = -len(bits) % 8
+    return int.from_bytes(np.packbits(bits).tobytes(), "big") >> padding
+
+
+def _int_to_bits(value, length):
+    byte_count = (length + 7) // 8
+    bits = np.unpackbits(np.frombuffer(value.to_bytes(byte_count, "big"), dtype=np.uint8))
+    return bits[byte_count * 8 - length:]
 
-def encode(data, generator, n, k, output="codeword"):
-    field = galois.GF(2)
 
-    data_poly = galois.Poly(data, field=field)
-    generator_poly = galois.Poly(generator, field=field)
+@functools.lru_cache(maxsize=None)
+def _remainder_table(generator):
+    # table[b] = (b * x^(n-k)) mod g(x) for every byte b, with g(x) packed into an integer
+    generator_int = _bits_to_int(generator)
+    degree = len(generator) - 1
+    table = []
+    for byte in range(256):
+        register = byte << degree
+        for bit in range(7 + degree, degree - 1, -1):
+            if register >> bit & 1:
+                register ^= generator_int << (bit - degree)
+        table.append(register)
+    return table
 
-    degree = generator_poly.degree
-    shifted_data = data_poly * galois.Poly([1] + [0] * degree, field=field)
 
-    parity_poly = shifted_data % generator_poly
-    codeword_poly = shifted_data + parity_poly
+def _parity(data_int, data_length, generator):
+    # Byte-at-a-time LFSR division, the same way a table-driven CRC is computed
+    table = _remainder_table(generator)
+    degree = len(generator) - 1
+    mask = (1 << degree) - 1
+    register = 0
+    for byte in data_int.to_bytes((data_length + 7) // 8, "big"):
+        shifted = register << 8
+        register = table[(shifted >> degree) ^ byte] ^ (shifted & mask)
+    return register
+
+
+def encode(data, generator, n, k, output="codeword"):
+    generator = tuple(int(g) for g in generator)
+    degree = len(generator) - 1
+
+    data_int = _bits_to_int(data)
+    parity_int = _parity(data_int, len(data), generator)
 
     # Ensure codeword has a length of n
-    codeword_coeffs = codeword_poly.coeffs
-    if len(codeword_coeffs) < n:
-        codeword_coeffs = np.pad(codeword_coeffs, (n - len(codeword_coeffs), 0), 'constant', constant_values=0)
+    codeword_coeffs = _int_to_bits((data_int << degree) | parity_int, max(n, len(data) + degree))
 
     if output == "codeword":
         return codeword_coeffs
     elif output == "all":
         # Generator polynomial (no padding required)
-        generator_coeffs = generator_poly.coeffs
+        generator_coeffs = np.array(generator, dtype=np.uint8)
         # Parity polynomial should be exactly n-k bits (no padding beyond n-k)
-        parity_coeffs = parity_poly.coeffs
-        if len(parity_coeffs) < n - k:
-            parity_coeffs = np.pad(parity_coeffs, (n - k - len(parity_coeffs), 0), 'constant', constant_values=0)
+        parity_coeffs = _int_to_bits(parity_int, n - k)
         return codeword_coeffs, generator_coeffs, parity_coeffs
 
 
+@functools.lru_cache(maxsize=None)
+def _generator_matrix(generator, n, k):
+    # Systematic generator matrix [I_k | P]: row i is the codeword of the i-th unit message
+    identity = np.eye(k, dtype=np.uint8)
+    matrix = np.array([encode(row, generator, n, k) for row in identity], dtype=np.float32)
+    matrix.flags.writeable = False
+    return matrix
+
+
+def encode_batch(messages, generator, n, k):
+    messages = np.asarray(messages, dtype=np.uint8)
+    if messages.ndim != 2 or messages.shape[1] != k:
+        raise ValueError(f"Expected a message matrix of shape (N, {k}), got {messages.shape}")
+
+    generator_matrix = _generator_matrix(tuple(int(g) for g in generator), n, k)
+    # GF(2) matrix product; float32 goes through BLAS and stays exact for k < 2^24
+    codewords = messages.astype(np.float32) @ generator_matrix
+    # Column sums never exceed k, so they fit in uint8 unless k is large
+    sums = codewords.astype(np.uint8 if k < 256 else np.uint32)
+    return (sums & 1).astype(np.uint8, copy=False)
+
+
+@functools.lru_cache(maxsize=None)
+def _packed_encode_tables(generator, n, k):
+    return packed.byte_tables(_generator_matrix(generator, n, k))
+
+
+def encode_packed(messages, generator, n, k):
+    # PackedCodewords of k-bit messages to PackedCodewords of codewords; the generator matrix is applied one
+    # message byte at a time through lookup tables, so no bit is ever unpacked
+    if messages.n != k:
+        raise ValueError(f"Expected packed messages of {k} bits, got {messages.n}")
+    tables = _packed_encode_tables(tuple(int(g) for g in generator), n, k)
+    return packed.PackedCodewords(packed.apply_tables(tables, messages.data), n)
+
+
+@functools.lru_cache(maxsize=None)
+def reference_code(n, k):
+    # Building a galois.BCH is expensive, so every validation path shares one instance per code. galois itself
+    # takes seconds to import and is only needed here
+    import galois
+    return galois.BCH(n=n, k=k, field=galois.GF(2))
+
+
 def validation_encode(data, n, k, output="codeword"):
-    field = galois.GF(2)
-    bch_code = galois.BCH(n=n, k=k, field=field)
+    bch_code = reference_code(n, k)
     generator_poly = bch_code.generator_poly.coeffs
     parity_poly = bch_code.encode(data, output="parity")
     codeword_poly = bch_code.encode(data, output="codeword")
@@ -47,106 +127,419 @@ def validation_encode(data, n, k, output="codeword"):
 
 
 def decode(codeword, generator, t):
-    field = galois.GF(2)
-    codeword_poly = galois.Poly(codeword, field=field)
-    generator_poly = galois.Poly(generator, field=field)
-    max_shifts = len(codeword)  # maximum number of cyclic shifts
-
-    for i in range(max_shifts):
-        # Calculate the syndrome as the remainder of the division by the generator polynomial
-        syndrome_poly = codeword_poly % generator_poly
-        syndrome = syndrome_poly.coeffs
-
-        # Pad the syndrome to the required length (if necessary)
-        while len(syndrome) < len(generator) - 1:
-            syndrome = np.append(syndrome, field(0))
-
-        # Calculate the Hamming weight of the syndrome
-        hamming_weight = sum(1 for s in syndrome if s != field(0))
-        # print(f"Syndrome: {syndrome}, Hamming weight: {hamming_weight}")
-
-        if hamming_weight <= t:
-            # Add the syndrome to the current vector
-            corrected_codeword = (codeword_poly + syndrome_poly).coeffs
-            # Restore the original position only if there was a shift
-            # Ensure corrected_codeword has the same length as codeword
-            if len(corrected_codeword) < len(codeword):
-                # Add zeros to the start of corrected_codeword
-                corrected_codeword = np.pad(corrected_codeword, (len(codeword) - len(corrected_codeword), 0),
-                                            'constant', constant_values=0)
-            if i > 0:
-                corrected_codeword = np.roll(corrected_codeword, -i)
-            # print(f"Corrected codeword: {corrected_codeword}")
-            return corrected_codeword, hamming_weight  # Return the corrected code and the number of errors
-
-        # Cyclic shift to the right
-        codeword_poly = galois.Poly(np.roll(codeword, i + 1), field=field)
-        # print(f"Codeword after {i + 1}-th shift: {codeword_poly.coeffs}")
+    # Meggitt-style error trapping: rotate the word one position at a time until its syndrome has weight <= t,
+    # then the errors sit in the parity positions and equal the syndrome. Rotating r(x) right is r(x) / x
+    # modulo x^n - 1, and since g(x) divides x^n - 1 with g(0) = 1 the syndrome register follows with one
+    # shift and a conditional XOR instead of a fresh division
+    generator = tuple(int(g) for g in generator)
+    generator_int = _bits_to_int(generator)
+    n = len(codeword)
+    codeword_int = _bits_to_int(codeword)
+    syndrome = _syndrome(codeword_int, n, generator)
+
+    for i in range(n):
+        weight = syndrome.bit_count()
+        if weight <= t:
+            # The error of the word rotated right by i, rotated back left by i
+            error = ((syndrome << i) | (syndrome >> (n - i))) & ((1 << n) - 1)
+            profiling.count("trapping_words")
+            profiling.count("trapping_shifts", i)
+            return _int_to_bits(codeword_int ^ error, n), weight
+        syndrome = (syndrome ^ generator_int) >> 1 if syndrome & 1 else syndrome >> 1
 
     # If correction is not possible
-    # print("Uncorrectable errors")
+    profiling.count("trapping_words")
+    profiling.count("trapping_shifts", n)
     return None, None
 
 
+def _syndrome(codeword_int, n, generator):
+    # c(x) mod g(x): the top k bits go through the remainder table, the low n-k bits are already reduced
+    degree = len(generator) - 1
+    return _parity(codeword_int >> degree, n - degree, generator) ^ (codeword_int & ((1 << degree) - 1))
+
+
+@shared_tables.table
+def _coset_leader_table(generator, n, t):
+    # table[syndrome] = packed error pattern of weight <= t with that syndrome, or -1 if there is none
+    if n > 63:
+        raise ValueError(f"Table decoding needs n <= 63, got n={n}")
+    degree = len(generator) - 1
+    position_syndromes = np.array([_syndrome(1 << position, n, generator) for position in range(n)], dtype=np.int64)
+    position_patterns = np.left_shift(1, np.arange(n, dtype=np.int64))
+
+    table = np.full(1 << degree, -1, dtype=np.int64)
+    table[0] = 0
+    for weight in range(1, t + 1):
+        positions = np.array(list(itertools.combinations(range(n), weight)), dtype=np.intp)
+        # Patterns of weight <= t have distinct syndromes, so each one is its own coset leader
+        syndromes = np.bitwise_xor.reduce(position_syndromes[positions], axis=1)
+        table[syndromes] = np.bitwise_or.reduce(position_patterns[positions], axis=1)
+    table.flags.writeable = False
+    return table
+
+
+def table_decode(codeword, generator, n, t):
+    generator = tuple(int(g) for g in generator)
+    codeword_int = _bits_to_int(codeword)
+
+    # One syndrome computation and one lookup instead of up to n polynomial divisions
+    error_pattern = int(_coset_leader_table(generator, n, t)[_syndrome(codeword_int, n, generator)])
+    if error_pattern < 0:
+        return None, None
+    return _int_to_bits(codeword_int ^ error_pattern, n), error_pattern.bit_count()
+
+
+def _extension_field(n):
+    # Same primitive polynomial galois.BCH uses, so alpha is a root of our generators
+    return gf.field(n.bit_length())
+
+
+@functools.lru_cache(maxsize=None)
+def _power_sum_matrix(n, t):
+    # Bit b of r(alpha^j) for j = 1 .. 2t is linear in the received bits, so all syndromes of a batch come from
+    # one GF(2) matrix product. Row i holds the bits of alpha^(j * (n - 1 - i)), m columns per syndrome
+    field = _extension_field(n)
+    powers = field.alpha_power(np.outer(np.arange(n - 1, -1, -1), np.arange(1, 2 * t + 1)))
+    bits = (powers[:, :, None] >> np.arange(field.m - 1, -1, -1)) & 1
+    matrix = bits.reshape(n, -1).astype(np.float32)
+    matrix.flags.writeable = False
+    return matrix
+
+
+def _power_sum_syndromes(received, n, t):
+    # (N, 2t) field elements S_j = r(alpha^j); the column sums stay at most n, exact in float32
+    field = _extension_field(n)
+    bits = (received.astype(np.float32) @ _power_sum_matrix(n, t)).astype(np.int64) & 1
+    return bits.reshape(len(received), 2 * t, field.m) @ np.left_shift(1, np.arange(field.m - 1, -1, -1))
+
+
+def _berlekamp_massey(syndromes, field):
+    # Error locators of a batch of words at once, coefficients in ascending order with locator[:, 0] = 1, and
+    # their lengths. Every word runs the same 2t steps; np.where picks each word's branch of the update
+    compiled = kernels.compiled()
+    if compiled is not None:
+        return compiled.berlekamp_massey(syndromes, field.exp, field.log, field.order)
+    words, count = syndromes.shape
+    columns = np.arange(count + 1)
+    locator = np.zeros((words, count + 1), dtype=np.int64)
+    locator[:, 0] = 1
+    previous = locator.copy()
+    previous_discrepancy = np.ones(words, dtype=np.int64)
+    length = np.zeros(words, dtype=np.int64)
+    shift = np.ones(words, dtype=np.int64)
+
+    for i in range(count):
+        terms = field.multiply(locator[:, 1:i + 1], syndromes[:, i - 1::-1] if i else syndromes[:, :0])
+        terms[columns[1:i + 1] > length[:, None]] = 0
+        discrepancy = syndromes[:, i] ^ np.bitwise_xor.reduce(terms, axis=1)
+        active = discrepancy != 0
+
+        # locator += (discrepancy / previous_discrepancy) * x^shift * previous
+        source = columns - shift[:, None]
+        shifted = np.where(source >= 0, np.take_along_axis(previous, np.maximum(source, 0), axis=1), 0)
+        correction = field.multiply(field.divide(discrepancy, previous_discrepancy)[:, None], shifted)
+        grow = active & (2 * length <= i)
+        previous = np.where(grow[:, None], locator, previous)
+        previous_discrepancy = np.where(grow, discrepancy, previous_discrepancy)
+        locator = np.where(active[:, None], locator ^ correction, locator)
+        length = np.where(grow, i + 1 - length, length)
+        shift = np.where(grow, 1, shift + 1)
+
+    locator[columns > length[:, None]] = 0
+    return locator, length
+
+
+def _chien_search(locator, field, n):
+    # (N, n) mask of the error degrees p, where alpha^-p is a root of the locator
+    compiled = kernels.compiled()
+    if compiled is not None:
+        return compiled.chien_search(locator, field.exp, field.log, field.order, n)
+    degrees = np.arange(n)
+    values = np.zeros((len(locator), n), dtype=np.int64)
+    for j in range(locator.shape[1]):
+        values ^= field.multiply(locator[:, j, None], field.alpha_power(-j * degrees))
+    return values == 0
+
+
+def algebraic_decode(codeword, n, t):
+    corrected, error_counts, failed = decode_batch(np.array(codeword, dtype=np.uint8)[None], None, n, t, "algebraic")
+    if failed[0]:
+        return None, None
+    return corrected[0], int(error_counts[0])
+
+
+@functools.lru_cache(maxsize=None)
+def _parity_check_matrix(generator, n):
+    # Row i is the syndrome x^(n-1-i) mod g(x) of an error in position i, most significant bit first
+    degree = len(generator) - 1
+    rows = [_int_to_bits(_syndrome(1 << (n - 1 - i), n, generator), degree) for i in range(n)]
+    matrix = np.array(rows, dtype=np.float32)
+    matrix.flags.writeable = False
+    return matrix
+
+
+def syndrome_batch(received, generator, n, t, decoder="table"):
+    # One row per word in the form `decoder` consumes: the n-k bits of r(x) mod g(x) for the table and trapping
+    # decoders, the 2t power sums r(alpha^j) for the algebraic one. Both are linear in the word, so the syndrome
+    # of received ^ e is the XOR of the two syndromes
+    received = np.asarray(received, dtype=np.uint8)
+    if decoder == "algebraic":
+        return _power_sum_syndromes(received, n, t)
+    # All words in one GF(2) matrix product; the sums stay at most n, so a narrow integer cast keeps their parity
+    parity_check = _parity_check_matrix(tuple(int(g) for g in generator), n)
+    syndrome_bits = (received.astype(np.float32) @ parity_check).astype(np.uint8 if n < 256 else np.int64) & 1
+    return syndrome_bits.astype(np.uint8, copy=False)
+
+
+@functools.lru_cache(maxsize=None)
+def position_syndromes(generator, n, t, decoder="table"):
+    # Row i is the syndrome of a single error at index i
+    syndromes = syndrome_batch(np.eye(n, dtype=np.uint8), generator, n, t, decoder)
+    syndromes.flags.writeable = False
+    return syndromes
+
+
+def decode_syndromes(received, syndromes, generator, n, t, decoder="table"):
+    # decode_batch for words whose syndromes are already known, e.g. updated incrementally from another word's
+    received = np.asarray(received, dtype=np.uint8)
+    corrected = received.copy()
+    error_counts = np.zeros(len(received), dtype=np.int64)
+    failed = np.zeros(len(received), dtype=bool)
+
+    # Most rows are error-free at low BER. The table decoder packs every syndrome into its table index with one
+    # more product, exact while it fits the mantissa, and finds those rows from the packed values
+    if decoder == "table":
+        degree = syndromes.shape[1]
+        weights = np.exp2(np.arange(degree - 1, -1, -1)).astype(np.float32 if degree <= 24 else np.float64)
+        indices = syndromes.astype(weights.dtype) @ weights
+        rows = np.flatnonzero(indices)
+    else:
+        rows = np.flatnonzero(syndromes.any(axis=1))
+    profiling.count("nonzero_syndromes", len(rows))
+    if len(rows) == 0:
+        return corrected, error_counts, failed
+
+    if decoder == "algebraic":
+        field = _extension_field(n)
+        locator, length = _berlekamp_massey(syndromes[rows], field)
+        # Decodable words have at most t errors, so only the first t + 1 coefficients can be nonzero
+        failed[rows[length > t]] = True
+        locator, length, rows = locator[length <= t, :t + 1], length[length <= t], rows[length <= t]
+
+        # A word is only corrected when its locator has as many distinct roots as its degree
+        errors = _chien_search(locator, field, n)
+        found = errors.sum(axis=1) == length
+        failed[rows[~found]] = True
+        corrected[rows[found]] ^= errors[found, ::-1].astype(np.uint8)
+        error_counts[rows[found]] = length[found]
+        return corrected, error_counts, failed
+
+    generator = tuple(int(g) for g in generator)
+    if decoder == "table":
+        error_patterns = _coset_leader_table(generator, n, t)[indices[rows].astype(np.int64)]
+        failed[rows] = error_patterns < 0
+        rows, error_patterns = rows[error_patterns >= 0], error_patterns[error_patterns >= 0]
+        error_bits = (error_patterns[:, None] >> np.arange(n - 1, -1, -1, dtype=np.int64)) & 1
+        corrected[rows] ^= error_bits.astype(np.uint8)
+        error_counts[rows] = error_bits.sum(axis=1)
+        return corrected, error_counts, failed
+
+    compiled = kernels.compiled()
+    if compiled is not None:
+        corrected[rows], error_counts[rows], failed[rows], shifts = compiled.trapping(
+            received[rows], syndromes[rows].astype(np.uint8), np.array(generator, dtype=np.uint8), t)
+        profiling.count("trapping_words", len(rows))
+        profiling.count("trapping_shifts", int(shifts.sum()))
+        return corrected, error_counts, failed
+
+    for row in rows:
+        decoded, error_count = decode(received[row], generator, t)
+        if decoded is None:
+            failed[row] = True
+        else:
+            corrected[row] = decoded
+            error_counts[row] = error_count
+    return corrected, error_counts, failed
+
+
+def decode_batch(received, generator, n, t, decoder="table"):
+    received = np.asarray(received, dtype=np.uint8)
+    if received.ndim != 2 or received.shape[1] != n:
+        raise ValueError(f"Expected a received matrix of shape (N, {n}), got {received.shape}")
+    return decode_syndromes(received, syndrome_batch(received, generator, n, t, decoder), generator, n, t, decoder)
+
+
+@functools.lru_cache(maxsize=None)
+def _packed_syndrome_tables(generator, n):
+    return packed.byte_tables(_parity_check_matrix(generator, n))
+
+
+@shared_tables.table
+def _packed_coset_leaders(generator, n, t):
+    # The coset-leader table as packed rows, with the weight of every leader; unused syndromes map to zeros.
+    # Weights are at most t, so one byte each
+    table = _coset_leader_table(generator, n, t)
+    patterns = np.where(table >= 0, table, 0).astype(np.uint64) << np.uint64(-n % 8)
+    # One byte column at a time keeps the temporaries at the size of the table itself
+    leaders = np.empty((len(table), (n + 7) // 8), dtype=np.uint8)
+    weights = np.zeros(len(table), dtype=np.uint8)
+    for column in range(leaders.shape[1]):
+        leaders[:, column] = patterns >> np.uint64(8 * (leaders.shape[1] - 1 - column)) & np.uint64(0xFF)
+        weights += packed.byte_weights(leaders[:, column])
+    leaders.flags.writeable = False
+    weights.flags.writeable = False
+    return leaders, weights
+
+
+def decode_packed(received, generator, n, t, decoder="table"):
+    # decode_batch on PackedCodewords. The table decoder stays packed throughout: syndromes come from byte
+    # lookup tables and corrections are XORed in as packed coset leaders. The other decoders work on bits, so
+    # only the words with a nonzero syndrome are unpacked for them
+    if received.n != n:
+        raise ValueError(f"Expected packed words of {n} bits, got {received.n}")
+    generator = tuple(int(g) for g in generator)
+    syndromes = packed.apply_tables(_packed_syndrome_tables(generator, n), received.data)
+    corrected = received.data.copy()
+    error_counts = np.zeros(len(received), dtype=np.int64)
+    failed = np.zeros(len(received), dtype=bool)
+
+    if decoder != "table":
+        rows = np.flatnonzero(syndromes.any(axis=1))
+        if len(rows):
+            decoded, error_counts[rows], failed[rows] = decode_batch(received[rows].to_bits(), generator, n, t,
+                                                                     decoder)
+            corrected[rows] = np.packbits(decoded, axis=1)
+        return packed.PackedCodewords(corrected, n), error_counts, failed
+
+    # Packed syndrome bytes to table indices, most significant byte first
+    indices = np.zeros(len(received), dtype=np.int64)
+    for column in syndromes.T:
+        indices = (indices << 8) | column
+    indices >>= 8 * syndromes.shape[1] - (len(generator) - 1)
+    rows = np.flatnonzero(indices)
+    profiling.count("nonzero_syndromes", len(rows))
+    leaders, weights = _packed_coset_leaders(generator, n, t)
+    failed[rows] = _coset_leader_table(generator, n, t)[indices[rows]] < 0
+    rows = rows[~failed[rows]]
+    corrected[rows] ^= leaders[indices[rows]]
+    error_counts[rows] = weights[indices[rows]]
+    return packed.PackedCodewords(corrected, n), error_counts, failed
+
+
+def publish_tables(publisher, generator, n, t, decoder="table"):
+    # Shares the tables that grow as 2^(n-k) through a shared_tables.Publisher; the other decoders only keep
+    # tables of a few kilobytes per process
+    if decoder == "table":
+        generator = tuple(int(g) for g in generator)
+        publisher.publish(_coset_leader_table, generator, n, t)
+        publisher.publish(_packed_coset_leaders, generator, n, t)
+
+
 def validation_decode(codeword, n, k):
-    field = galois.GF(2)
-    bch_code = galois.BCH(n=n, k=k, field=field)
+    bch_code = reference_code(n, k)
     decoded_codeword, errors = bch_code.decode(codeword, output="codeword", errors=True)
     return decoded_codeword, errors
 
 
-def run_bch_interaction(bch_code):
-    # Prompt the user to choose the error method
-    error_method = pyip.inputMenu(
-        ["Fixed number of errors", "Probability of error (BER)"],
-        numbered=True,
-        prompt="Choose the error method:\n"
-    )
-
-    # Get a valid string of bits
-    bit_string = pyip.inputRegex(
-        f"^[01]{{{bch_code.k}}}$",
-        prompt=f"Enter a string of {bch_code.k} bits (0 and 1 only): "
-    )
-    data = [int(bit) for bit in bit_string]
-
-    # Encode the data
-    codeword_bits = bch_code.encode(data, output="codeword")
-    validation_codeword_bits = bch_code.validation_encode(data, output="codeword")
-
-    # Handle the chosen error method
-    if error_method == "Fixed number of errors":
-        error_count = pyip.inputInt(
-            prompt=f"Enter the number of errors (integer between 0 and {bch_code.n}): ",
-            min=0, max=bch_code.n
-        )
-        flipped_codeword_bits = flip_random_bits(codeword_bits, error_count)
-        print(f"Errors introduced: {error_count}")
-
-    elif error_method == "Probability of error (BER)":
-        ber = pyip.inputFloat(
-            prompt="Enter the bit error rate (float between 0.0 and 1.0): ",
-            min=0.0, max=1.0
-        )
-        flipped_codeword_bits = introduce_error(codeword_bits, ber)
-        print(f"Errors introduced based on BER: {ber}")
-
-    # Decode the data
-    decoded_bits, error_count = bch_code.decode(flipped_codeword_bits)
-    validation_decoded_bits, validation_error_count = bch_code.validation_decode(flipped_codeword_bits)
-
-    # Display results
-    print("======== ENCODED DATA ========")
-    print(f"Codeword: {codeword_bits}")
-    print(f"Validation codeword: {validation_codeword_bits}")
-    print("\n====== DATA WITH ERRORS ======")
-    print(f"Codeword with errors: {flipped_codeword_bits}")
-    print("\n======== DECODED DATA ========")
-    print(f"Decoded codeword: {decoded_bits}, errors identified: {error_count}")
-    print(f"Validation decoded codeword: {validation_decoded_bits}, errors identified: {validation_error_count}")
-    print("\n======== RESULTS =============")
-
-    if np.array_equal(codeword_bits, validation_decoded_bits):
-        print("Decoding successful")
-    else:
-        print("Decoding failed")
+def _minimal_polynomial(power, n):
+    # prod (x + alpha^c) over the cyclotomic coset of power, packed as a binary polynomial
+    field = _extension_field(n)
+
+    coset = [power]
+    while coset[-1] * 2 % n != power:
+        coset.append(coset[-1] * 2 % n)
+
+    coefficients = np.ones(1, dtype=np.int64)  # ascending powers of x, entries in GF(2^m)
+    for c in coset:
+        coefficients = np.append(0, coefficients) ^ np.append(field.multiply(coefficients, field.alpha_power(c)), 0)
+    # The product is over GF(2), so every coefficient is 0 or 1
+    return sum(int(coefficient) << i for i, coefficient in enumerate(coefficients)), set(coset)
+
+
+@functools.lru_cache(maxsize=None)
+def _design_generator(n, k):
+    # g(x) is the product of the distinct minimal polynomials of alpha, alpha^2, ..., alpha^2t;
+    # t is the largest designed correction capability whose generator still has degree n - k
+    if n < 3 or n & (n + 1) or n.bit_length() not in gf.PRIMITIVE_POLYS:
+        raise ValueError(f"Only primitive binary BCH codes with n = 2^m - 1 are supported, got n={n}")
+    generator = 1
+    covered = set()
+    design = None
+
+    for t in range(1, (n - 1) // 2 + 1):
+        for power in (2 * t - 1, 2 * t):
+            if power not in covered:
+                minimal_polynomial, coset = _minimal_polynomial(power, n)
+                covered |= coset
+                # Carry-less multiplication of the packed polynomials
+                product = 0
+                for i in range(minimal_polynomial.bit_length()):
+                    if minimal_polynomial >> i & 1:
+                        product ^= generator << i
+                generator = product
+        degree = generator.bit_length() - 1
+        if degree > n - k:
+            break
+        if degree == n - k:
+            design = [int(bit) for bit in bin(generator)[2:]], t
+
+    if design is None:
+        raise ValueError(f"There is no binary BCH code with n={n} and k={k}")
+    return design
+
+
+class BCHCode:
+    def __init__(self, n, k, decoder=None):
+        self.n = n
+        self.k = k
+        self.generator, self.t = _design_generator(n, k)
+        if decoder is None:
+            # Coset-leader tables have 2^(n-k) entries and pack patterns into int64, beyond that decode algebraically
+            decoder = "table" if n <= 63 and n - k <= 16 else "algebraic"
+        if decoder not in DECODERS:
+            raise ValueError(f"Unknown decoder {decoder!r}, expected one of {DECODERS}")
+        self.decoder = decoder
+
+    def __repr__(self):
+        return f"BCHCode(n={self.n}, k={self.k}, t={self.t}, decoder={self.decoder!r})"
+
+    def encode(self, data, output="codeword"):
+        return encode(data, self.generator, self.n, self.k, output=output)
+
+    def encode_batch(self, messages):
+        return encode_batch(messages, self.generator, self.n, self.k)
+
+    def validation_encode(self, data, output="codeword"):
+        return validation_encode(data, self.n, self.k, output=output)
+
+    def decode(self, codeword):
+        if self.decoder == "table":
+            return table_decode(codeword, self.generator, self.n, self.t)
+        if self.decoder == "algebraic":
+            return algebraic_decode(codeword, self.n, self.t)
+        return decode(codeword, self.generator, self.t)
+
+    def decode_batch(self, received):
+        return decode_batch(received, self.generator, self.n, self.t, decoder=self.decoder)
+
+    def encode_packed(self, messages):
+        return encode_packed(messages, self.generator, self.n, self.k)
+
+    def decode_packed(self, received):
+        return decode_packed(received, self.generator, self.n, self.t, decoder=self.decoder)
+
+    def syndrome_batch(self, received):
+        return syndrome_batch(received, self.generator, self.n, self.t, decoder=self.decoder)
+
+    def position_syndromes(self):
+        return position_syndromes(tuple(self.generator), self.n, self.t, decoder=self.decoder)
+
+    def decode_syndromes(self, received, syndromes):
+        return decode_syndromes(received, syndromes, self.generator, self.n, self.t, decoder=self.decoder)
+
+    def publish_tables(self, publisher):
+        publish_tables(publisher, self.generator, self.n, self.t, decoder=self.decoder)
+
+    def validation_decode(self, codeword):
+        return validation_decode(codeword, self.n, self.k)
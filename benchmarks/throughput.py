@@ -0,0 +1,173 @@
+import argparse
+import json
+import platform
+import time
+
+import numpy as np
+
+import bch127_8
+import bch15_11
+import bch15_5
+import bch15_7
+import bch31_6
+import bch7_4
+import bch_utils
+import channel
+import kernels
+import transmission_simulation
+
+CODES = [bch7_4.BCH7_4, bch15_11.BCH15_11, bch15_7.BCH15_7, bch15_5.BCH15_5, bch31_6.BCH31_6, bch127_8.BCH127_8]
+DEFAULT_BASELINE = "benchmarks/baseline.json"
+
+
+def measure(function, repeat, min_time=0.05, max_time=2.0):
+    # Seconds per call, best of up to repeat timings. The first call warms caches and sizes each timing to
+    # at least min_time so fast cases are not lost in timer noise; slow cases stop once max_time is spent
+    start_time = time.perf_counter()
+    function()
+    spent = time.perf_counter() - start_time
+    if spent >= max_time:
+        return spent
+    number = max(1, int(min_time / spent)) if spent > 0 else 1000
+    best = float("inf")
+    for _ in range(repeat):
+        start_time = time.perf_counter()
+        for _ in range(number):
+            function()
+        elapsed = time.perf_counter() - start_time
+        best = min(best, elapsed / number)
+        spent += elapsed
+        if spent >= max_time:
+            break
+    return best
+
+
+def error_weights(code):
+    # Clean words, the most errors every decoder corrects and one more than that
+    return sorted({0, code.t, min(code.n, code.t + 1)})
+
+
+def result(code, stage, path, batch_size, error_weight, codewords, seconds):
+    # Throughput is counted in n-bit codewords for every stage, so stages of one code compare directly
+    return {"code": f"BCH({code.n},{code.k})", "decoder": code.decoder, "stage": stage, "path": path,
+            "batch_size": batch_size, "error_weight": error_weight, "seconds": seconds,
+            "codewords_per_second": codewords / seconds, "mbit_per_second": codewords * code.n / seconds / 1e6}
+
+
+def benchmark_code(code, batch_sizes=(100, 1000), single_count=200, repeat=3, seed=0):
+    rng = channel.generator(seed)
+    results = []
+    messages = rng.integers(0, 2, size=(max(max(batch_sizes), single_count), code.k), dtype=np.uint8)
+    codewords = code.encode_batch(messages)
+
+    single_messages = messages[:single_count]
+    results.append(result(code, "encode", "single", 1, None, single_count, measure(
+        lambda: [code.encode(message) for message in single_messages], repeat)))
+    for batch_size in batch_sizes:
+        batch = messages[:batch_size]
+        results.append(result(code, "encode", "batch", batch_size, None, batch_size, measure(
+            lambda: code.encode_batch(batch), repeat)))
+        results.append(result(code, "channel", "batch", batch_size, None, batch_size, measure(
+            lambda: channel.binary_symmetric(rng, (batch_size, code.n), 0.05), repeat)))
+
+    # Syndromes of clean words, the whole decode cost at low BER and the first step of every decoder
+    for batch_size in batch_sizes:
+        batch = codewords[:batch_size]
+        results.append(result(code, "syndrome", "batch", batch_size, 0, batch_size, measure(
+            lambda: code.syndrome_batch(batch), repeat)))
+
+    for weight in error_weights(code):
+        received = codewords ^ channel.fixed_weight(rng, codewords.shape, weight)
+        single_received = received[:single_count]
+        results.append(result(code, "decode", "single", 1, weight, single_count, measure(
+            lambda: [code.decode(word) for word in single_received], repeat)))
+        for batch_size in batch_sizes:
+            batch = received[:batch_size]
+            results.append(result(code, "decode", "batch", batch_size, weight, batch_size, measure(
+                lambda: code.decode_batch(batch), repeat)))
+
+    # Messages, encoding, channel, decoding and comparison exactly as one simulation point runs them
+    for batch_size in batch_sizes:
+        results.append(result(code, "end_to_end", "batch", batch_size, None, batch_size, measure(
+            lambda: transmission_simulation.simulate_point(code.k, code, 0.05, batch_size, seed), repeat)))
+    return results
+
+
+def result_key(entry):
+    return (f"{entry['code']}/{entry['decoder']}/{entry['stage']}/{entry['path']}/{entry['batch_size']}"
+            f"/{entry['error_weight']}")
+
+
+def compare(baseline, results, threshold=0.1):
+    # Cases that lost more than threshold of their baseline throughput; cases missing on either side are skipped
+    baseline_results = {result_key(entry): entry for entry in baseline["results"]}
+    regressions = []
+    for entry in results:
+        reference = baseline_results.get(result_key(entry))
+        if reference is None:
+            continue
+        ratio = entry["codewords_per_second"] / reference["codewords_per_second"]
+        if ratio < 1 - threshold:
+            regressions.append({"case": result_key(entry), "baseline": reference["codewords_per_second"],
+                                "current": entry["codewords_per_second"], "ratio": ratio})
+    return regressions
+
+
+def environment():
+    return {"machine": platform.machine(), "processor": platform.processor(), "python": platform.python_version(),
+            "numpy": np.__version__, "backend": kernels.backend(), "time": time.strftime("%Y-%m-%d %H:%M:%S")}
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Encode, channel, syndrome, decode and end-to-end throughput of the BCH codes")
+    parser.add_argument("--codes", nargs="+", default=None, help="codes to benchmark as n,k pairs, default all six")
+    parser.add_argument("--decoder", choices=bch_utils.DECODERS, default=None,
+                        help="override the decoder of every code")
+    parser.add_argument("--batch-sizes", nargs="+", type=int, default=[100, 1000])
+    parser.add_argument("--single-count", type=int, default=200, help="words per single-call measurement")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--save", nargs="?", const=DEFAULT_BASELINE, default=None,
+                        help=f"write the results as a baseline (default {DEFAULT_BASELINE})")
+    parser.add_argument("--compare", nargs="?", const=DEFAULT_BASELINE, default=None,
+                        help=f"flag regressions against a saved baseline (default {DEFAULT_BASELINE})")
+    parser.add_argument("--threshold", type=float, default=0.1, help="tolerated relative throughput loss")
+    args = parser.parse_args()
+
+    codes = [code() for code in CODES]
+    if args.codes is not None:
+        wanted = [tuple(int(value) for value in spec.split(",")) for spec in args.codes]
+        codes = [code for code in codes if (code.n, code.k) in wanted]
+    if args.decoder is not None:
+        codes = [bch_utils.BCHCode(code.n, code.k, args.decoder) for code in codes]
+
+    results = []
+    for code in codes:
+        for entry in benchmark_code(code, args.batch_sizes, args.single_count, args.repeat, args.seed):
+            results.append(entry)
+            weight = "" if entry["error_weight"] is None else f" | Weight: {entry['error_weight']}"
+            print(f"Code: {entry['code']} | Decoder: {entry['decoder']} | {entry['stage']} ({entry['path']}, "
+                  f"batch {entry['batch_size']}){weight} | {entry['codewords_per_second']:,.0f} codewords/s | "
+                  f"{entry['mbit_per_second']:.3f} Mbit/s")
+
+    if args.compare is not None:
+        with open(args.compare, 'r') as file:
+            baseline = json.load(file)
+        regressions = compare(baseline, results, args.threshold)
+        for regression in regressions:
+            print(f"REGRESSION {regression['case']}: {regression['baseline']:,.0f} -> "
+                  f"{regression['current']:,.0f} codewords/s ({regression['ratio']:.0%} of baseline)")
+        print(f"{len(regressions)} regressions beyond {args.threshold:.0%} against {args.compare}")
+
+    if args.save is not None:
+        with open(args.save, 'w') as file:
+            json.dump({"environment": environment(), "results": results}, file, indent=2)
+        print(f"Baseline saved to {args.save}")
+
+    if args.compare is not None and regressions:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+import math
+
+import numpy as np
+
+_erfc = np.vectorize(math.erfc, otypes=[np.float64])
+# Good/bad run pairs drawn at most at once by burst_stream, so long streams are built in bounded chunks
+_BURST_RUN_PAIRS = 1 << 16
+
+
+def generator(seed=None, stream=0):
+    # Independent, reproducible streams from one seed: the same (seed, stream) always gives the same draws
+    return np.random.default_rng(np.random.SeedSequence(seed, spawn_key=(stream,)))
+
+
+def binary_symmetric(rng, shape, ber):
+    # Every bit flips independently with probability ber
+    return (rng.random(shape) < ber).astype(np.uint8)
+
+
+def binary_symmetric_packed(rng, words, n, ber, chunk_bits=1 << 20):
+    # binary_symmetric(rng, (words, n), ber) as np.packbits rows, from the very same draws. Rows are drawn and
+    # packed about chunk_bits at a time, so the uniforms never take more than 8 * chunk_bits bytes
+    errors = np.empty((words, (n + 7) // 8), dtype=np.uint8)
+    rows = max(1, chunk_bits // max(n, 1))
+    for start in range(0, words, rows):
+        stop = min(start + rows, words)
+        errors[start:stop] = np.packbits(rng.random((stop - start, n)) < ber, axis=1)
+    return errors
+
+
+def fixed_weight(rng, shape, weight):
+    # Exactly `weight` flipped bits per row, uniformly placed; weight may also be one value per row
+    shape = (shape,) if np.isscalar(shape) else tuple(shape)
+    weight = np.asarray(weight)
+    if np.any(weight > shape[-1]) or np.any(weight < 0):
+        raise ValueError("Not enough unique numbers in the specified range.")
+    if weight.ndim:
+        weight = weight.reshape(weight.shape + (1,))
+    # The ranks of i.i.d. uniforms are a uniformly random permutation of each row
+    ranks = np.argsort(rng.random(shape), axis=-1)
+    return (ranks < weight).astype(np.uint8)
+
+
+def gilbert_elliott(rng, shape, p_good_to_bad, p_bad_to_good, ber_good=0.0, ber_bad=0.5):
+    # Two-state Markov burst channel along each row; every row starts from the stationary distribution
+    shape = (shape,) if np.isscalar(shape) else tuple(shape)
+    rows = int(np.prod(shape[:-1]))
+    length = shape[-1]
+    p_bad = p_good_to_bad / (p_good_to_bad + p_bad_to_good) if p_good_to_bad + p_bad_to_good > 0 else 0.0
+
+    transitions = rng.random((length, rows))
+    flips = rng.random((length, rows))
+    mask = np.empty((length, rows), dtype=np.uint8)
+    bad = rng.random(rows) < p_bad
+    # Only the state recursion runs over the n positions; each step is vectorized across all rows
+    for position in range(length):
+        mask[position] = flips[position] < np.where(bad, ber_bad, ber_good)
+        bad = np.where(bad, transitions[position] >= p_bad_to_good, transitions[position] < p_good_to_bad)
+    return mask.T.reshape(shape)
+
+
+def burst_stream(rng, length, p_good_to_bad, p_bad_to_good, ber_good=0.0, ber_bad=0.5):
+    # One continuous Gilbert-Elliott stream of `length` bits, built from geometric sojourn times instead of a
+    # loop over positions; starts from the stationary distribution like gilbert_elliott
+    p_bad = p_good_to_bad / (p_good_to_bad + p_bad_to_good) if p_good_to_bad + p_bad_to_good > 0 else 0.0
+    bad = rng.random() < p_bad
+    runs, flags = [], []
+    filled = 0
+    while filled < length:
+        # About as many good/bad run pairs as the remaining bits hold on average, drawn in one call per state.
+        # A chunk holds whole pairs, so the next one continues in the state that follows its last run
+        pair_rate = p_good_to_bad * p_bad_to_good / (p_good_to_bad + p_bad_to_good) if p_bad > 0 else 0.0
+        count = min(int((length - filled) * pair_rate * 1.1) + 2, _BURST_RUN_PAIRS)
+        good_runs = rng.geometric(p_good_to_bad, count) if p_good_to_bad > 0 else np.full(count, length)
+        bad_runs = rng.geometric(p_bad_to_good, count) if p_bad_to_good > 0 else np.full(count, length)
+        runs.append(np.stack([bad_runs, good_runs] if bad else [good_runs, bad_runs], axis=1).reshape(-1))
+        flags.append(np.tile([bad, not bad], count))
+        filled += int(runs[-1].sum())
+        bad = not flags[-1][-1]
+    states = np.zeros(0, dtype=bool)
+    if runs:
+        # Only the run that crosses the end of the stream is cut short
+        runs, flags = np.concatenate(runs), np.concatenate(flags)
+        ends = np.cumsum(runs)
+        last = int(np.searchsorted(ends, length))
+        runs = runs[:last + 1].copy()
+        runs[-1] -= ends[last] - length
+        states = np.repeat(flags[:last + 1], runs)
+    return (rng.random(length) < np.where(states, ber_bad, ber_good)).astype(np.uint8)
+
+
+def burst_parameters(ber, mean_burst_length, ber_bad=0.5):
+    # Gilbert-Elliott transitions whose long-run bit error rate is `ber`, with bad runs of mean_burst_length
+    # bits and an error-free good state. Bursts grow longer when the rate leaves no room between them, and
+    # rates above ber_bad make the whole stream one burst at that rate
+    if ber >= ber_bad:
+        return 1.0, 0.0, ber, ber
+    if ber <= 0:
+        return 0.0, 1.0 / mean_burst_length, 0.0, ber_bad
+    p_bad = ber / ber_bad
+    p_bad_to_good = min(1.0 / mean_burst_length, (1 - p_bad) / p_bad)
+    return p_bad * p_bad_to_good / (1 - p_bad), p_bad_to_good, 0.0, ber_bad
+
+
+def noise_sigma(ebn0_db, rate):
+    # Noise standard deviation for unit-energy BPSK symbols carrying `rate` information bits each
+    return np.sqrt(1 / (2 * rate * 10 ** (np.asarray(ebn0_db, dtype=np.float64) / 10)))
+
+
+def hard_decision_ber(ebn0_db, rate):
+    # Probability that a BPSK symbol lands on the wrong side of zero, Q(1 / sigma)
+    return 0.5 * _erfc(1 / (np.sqrt(2) * noise_sigma(ebn0_db, rate)))
+
+
+def bpsk_awgn(rng, codewords, ebn0_db, rate):
+    # Bits go out as +1 (0) or -1 (1) with Gaussian noise added. Returns the log-likelihood ratios
+    # log P(0 | y) / P(1 | y) = 2 y / sigma^2: the sign is the hard decision, the magnitude its reliability
+    sigma = noise_sigma(ebn0_db, rate)
+    received = 1 - 2 * np.asarray(codewords, dtype=np.float64) + sigma * rng.standard_normal(np.shape(codewords))
+    return 2 * received / sigma ** 2
+
+
+class Link:
+    # Everything between encoder and decoder: an optional interleaver and a memoryless (burst_length None) or
+    # bursty channel. The whole batch travels as one continuous bit stream
+    def __init__(self, burst_length=None, ber_bad=0.5, interleaver=None):
+        self.burst_length = burst_length
+        self.ber_bad = ber_bad
+        self.interleaver = interleaver
+
+    def __repr__(self):
+        return f"Link(burst_length={self.burst_length}, ber_bad={self.ber_bad}, interleaver={self.interleaver!r})"
+
+    @property
+    def name(self):
+        name = "bsc" if self.burst_length is None else f"burst({self.burst_length:g},{self.ber_bad:g})"
+        return name if self.interleaver is None else f"{name}+{self.interleaver.name}"
+
+    def transmit(self, rng, batch, ber):
+        batch = np.asarray(batch)
+        stream = batch.reshape(-1) if self.interleaver is None else self.interleaver.interleave(batch)
+        if self.burst_length is None:
+            errors = binary_symmetric(rng, stream.shape, ber)
+        else:
+            errors = burst_stream(rng, len(stream), *burst_parameters(ber, self.burst_length, self.ber_bad))
+        received = stream ^ errors
+        if self.interleaver is None:
+            return received.reshape(batch.shape)
+        return self.interleaver.deinterleave(received, batch.shape)
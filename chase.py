@@ -0,0 +1,65 @@
+import numpy as np
+
+# Chase-2 flips t positions, which is 2^t test patterns per word; long codes are capped at this many
+MAX_DEFAULT_POSITIONS = 8
+# Words per decode_batch call, so memory stays bounded by this many test patterns of n bits
+_BATCH_PATTERNS = 1 << 16
+
+
+def test_patterns(positions):
+    # Row j flips least reliable position b when bit b of j is set
+    return ((np.arange(1 << positions)[:, None] >> np.arange(positions)) & 1).astype(np.uint8)
+
+
+def chase_decode(bch_code, llrs, positions=None):
+    # Chase-2: decode the hard decision with every subset of its `positions` least reliable bits flipped
+    # (default t, at most MAX_DEFAULT_POSITIONS) and keep the codeword closest to the received values, i.e.
+    # with the least total |LLR| over the bits it changes. Returns (corrected, error_counts, failed) like
+    # decode_batch, error_counts counting changed bits; words without any decodable test pattern keep their
+    # hard decision and are marked failed
+    llrs = np.asarray(llrs, dtype=np.float64)
+    n = bch_code.n
+    if llrs.ndim != 2 or llrs.shape[1] != n:
+        raise ValueError(f"Expected LLRs of shape (N, {n}), got {llrs.shape}")
+    positions = min(min(bch_code.t, MAX_DEFAULT_POSITIONS) if positions is None else positions, n)
+    patterns = test_patterns(positions)
+    hard = (llrs < 0).astype(np.uint8)
+    reliability = np.abs(llrs)
+
+    corrected = hard.copy()
+    error_counts = np.zeros(len(hard), dtype=np.int64)
+    failed = np.zeros(len(hard), dtype=bool)
+    chunk = max(1, _BATCH_PATTERNS // len(patterns))
+    for start in range(0, len(hard), chunk):
+        words = slice(start, start + chunk)
+        corrected[words], error_counts[words], failed[words] = _decode_chunk(
+            bch_code, hard[words], reliability[words], patterns, positions)
+    return corrected, error_counts, failed
+
+
+def _decode_chunk(bch_code, hard, reliability, patterns, positions):
+    words, n = hard.shape
+    least = np.argsort(reliability, axis=1)[:, :positions]
+
+    # Test pattern j + 2^b is pattern j with one more bit flipped, so its syndrome is one XOR away instead of a
+    # full recomputation: the syndrome table doubles once per position
+    syndromes = bch_code.syndrome_batch(hard)[:, None, :]
+    flipped_syndromes = bch_code.position_syndromes()[least]
+    for b in range(positions):
+        syndromes = np.concatenate([syndromes, syndromes ^ flipped_syndromes[:, b, None, :]], axis=1)
+
+    candidates = np.repeat(hard[:, None, :], len(patterns), axis=1)
+    candidates[np.arange(words)[:, None, None], np.arange(len(patterns))[None, :, None], least[:, None, :]] ^= \
+        patterns[None]
+    decoded, _, failed = bch_code.decode_syndromes(candidates.reshape(-1, n),
+                                                   syndromes.reshape(words * len(patterns), -1))
+    decoded = decoded.reshape(words, len(patterns), n)
+
+    changed = decoded != hard[:, None, :]
+    metrics = np.where(failed.reshape(words, len(patterns)), np.inf, (changed * reliability[:, None, :]).sum(axis=2))
+    best = np.argmin(metrics, axis=1)
+    rows = np.arange(words)
+    word_failed = np.isinf(metrics[rows, best])
+    corrected = np.where(word_failed[:, None], hard, decoded[rows, best])
+    error_counts = np.where(word_failed, 0, changed[rows, best].sum(axis=1))
+    return corrected, error_counts, word_failed
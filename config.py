@@ -4,3 +4,24 @@ BER_STEP = 0.025
 SAMPLE_SIZE = 250
 PATIENCE = 3
 THRESHOLD = 0.01
+SEED = None  # None draws fresh entropy, an integer reproduces a run exactly
+WORKERS = None  # Process pool size for the sweep, None uses every core
+ADAPTIVE = False  # Sample each BER point in batches of SAMPLE_SIZE until its 95% interval is narrow enough
+CI_WIDTH = 0.02  # Target Wilson interval width in adaptive mode
+MAX_SAMPLE_SIZE = 20000  # Trial budget per BER point in adaptive mode
+STRATIFIED = False  # Build every curve from per-error-weight trials instead of sampling each BER point
+SAMPLES_PER_WEIGHT = 2000  # Trials per error weight in stratified mode
+CHECKPOINT_FILE = None  # e.g. 'checkpoint.jsonl': finished points are appended there and a rerun resumes
+RESULTS_DB = 'results.db'  # SQLite results store, every run is added to it
+PROFILE = False  # Time every simulation stage and count decoder work per code, reported at the end of a run
+CPROFILE_CODES = ()  # Codes such as 'BCH(31,6)' that also run under cProfile when PROFILE is on
+PROFILE_REPORT = 'profile_report.json'
+BURST_LENGTH = None  # Mean burst length in bits of a Gilbert-Elliott channel, None keeps bit errors independent
+BER_BAD = 0.5  # Bit error rate inside a burst
+INTERLEAVER = None  # None, 'block' (INTERLEAVER_DEPTH codewords bit by bit) or 'convolutional'
+INTERLEAVER_DEPTH = 8  # Block rows or convolutional branches
+INTERLEAVER_DELAY = 1  # Delay step of the convolutional branches
+SOFT_DECISION = False  # Sweep Eb/N0 on an AWGN/BPSK channel instead, comparing hard decisions with Chase-2 decoding
+MAX_EBN0 = 8.0  # dB
+EBN0_STEP = 0.5  # dB
+CHASE_POSITIONS = None  # Least reliable positions Chase-2 flips, None uses t (capped at 8)
@@ -0,0 +1,78 @@
+import functools
+
+import numpy as np
+
+# Primitive polynomials of GF(2^m), the same ones galois.BCH picks (matlab_primitive_poly)
+PRIMITIVE_POLYS = {2: 0x7, 3: 0xB, 4: 0x13, 5: 0x25, 6: 0x43, 7: 0x89, 8: 0x11D, 9: 0x211, 10: 0x409,
+                   11: 0x805, 12: 0x1053, 13: 0x201B, 14: 0x4443, 15: 0x8003, 16: 0x1100B}
+
+
+class Field:
+    # GF(2^m) on exp/log tables. Elements are integers whose bits are the polynomial basis coefficients and
+    # alpha = 2 is a root of PRIMITIVE_POLYS[m]. Every operation works elementwise on numpy arrays or scalars
+    # and returns int64 arrays; addition is plain XOR
+    def __init__(self, m):
+        if m not in PRIMITIVE_POLYS:
+            raise ValueError(f"Expected 2 <= m <= 16, got m={m}")
+        self.m = m
+        self.order = (1 << m) - 1
+
+        # exp is stored twice over so the sum of two logs indexes it without a modulo
+        exp = np.zeros(2 * self.order, dtype=np.int64)
+        value = 1
+        for i in range(self.order):
+            exp[i] = value
+            value <<= 1
+            if value >> m:
+                value ^= PRIMITIVE_POLYS[m]
+        exp[self.order:] = exp[:self.order]
+        # log[0] is never read for a result, it only keeps zeros valid indices
+        log = np.zeros(1 << m, dtype=np.int64)
+        log[exp[:self.order]] = np.arange(self.order)
+        exp.flags.writeable = False
+        log.flags.writeable = False
+        self.exp = exp
+        self.log = log
+
+    def __repr__(self):
+        return f"Field(m={self.m})"
+
+    def alpha_power(self, exponent):
+        return self.exp[np.mod(exponent, self.order)]
+
+    def multiply(self, a, b):
+        a = np.asarray(a, dtype=np.int64)
+        b = np.asarray(b, dtype=np.int64)
+        return np.where((a == 0) | (b == 0), 0, self.exp[self.log[a] + self.log[b]])
+
+    def inverse(self, a):
+        a = np.asarray(a, dtype=np.int64)
+        if np.any(a == 0):
+            raise ZeroDivisionError("0 has no inverse in GF(2^m)")
+        return self.exp[self.order - self.log[a]]
+
+    def divide(self, a, b):
+        return self.multiply(a, self.inverse(b))
+
+    def power(self, a, exponent):
+        # 0^0 = 1 like galois; negative powers of 0 are not checked and come out as 0
+        a = np.asarray(a, dtype=np.int64)
+        exponent = np.asarray(exponent, dtype=np.int64)
+        return np.where(a == 0, (exponent == 0).astype(np.int64),
+                        self.exp[np.mod(self.log[a] * exponent, self.order)])
+
+    def evaluate(self, coefficients, points):
+        # Polynomials with coefficients in descending order along the last axis, like galois.Poly, at every
+        # point by Horner's rule: shape (..., degree + 1) and (P,) give (..., P)
+        coefficients = np.asarray(coefficients, dtype=np.int64)
+        points = np.asarray(points, dtype=np.int64)
+        result = np.zeros(coefficients.shape[:-1] + points.shape, dtype=np.int64)
+        for i in range(coefficients.shape[-1]):
+            result = self.multiply(result, points) ^ coefficients[..., i, None]
+        return result
+
+
+@functools.lru_cache(maxsize=None)
+def field(m):
+    # Tables are built once per process and shared by every code over the same field
+    return Field(m)
@@ -0,0 +1,61 @@
+import numpy as np
+import pyinputplus as pyip
+
+from transmission_simulation import flip_random_bits, introduce_error
+
+
+def run_bch_interaction(bch_code):
+    # Prompt the user to choose the error method
+    error_method = pyip.inputMenu(
+        ["Fixed number of errors", "Probability of error (BER)"],
+        numbered=True,
+        prompt="Choose the error method:\n"
+    )
+
+    # Get a valid string of bits
+    bit_string = pyip.inputRegex(
+        f"^[01]{{{bch_code.k}}}$",
+        prompt=f"Enter a string of {bch_code.k} bits (0 and 1 only): "
+    )
+    data = [int(bit) for bit in bit_string]
+
+    # Encode the data
+    codeword_bits = bch_code.encode(data, output="codeword")
+    validation_codeword_bits = bch_code.validation_encode(data, output="codeword")
+
+    # Handle the chosen error method
+    if error_method == "Fixed number of errors":
+        error_count = pyip.inputInt(
+            prompt=f"Enter the number of errors (integer between 0 and {bch_code.n}): ",
+            min=0, max=bch_code.n
+        )
+        flipped_codeword_bits = flip_random_bits(codeword_bits, error_count)
+        print(f"Errors introduced: {error_count}")
+
+    elif error_method == "Probability of error (BER)":
+        ber = pyip.inputFloat(
+            prompt="Enter the bit error rate (float between 0.0 and 1.0): ",
+            min=0.0, max=1.0
+        )
+        flipped_codeword_bits = introduce_error(codeword_bits, ber)
+        print(f"Errors introduced based on BER: {ber}")
+
+    # Decode the data
+    decoded_bits, error_count = bch_code.decode(flipped_codeword_bits)
+    validation_decoded_bits, validation_error_count = bch_code.validation_decode(flipped_codeword_bits)
+
+    # Display results
+    print("======== ENCODED DATA ========")
+    print(f"Codeword: {codeword_bits}")
+    print(f"Validation codeword: {validation_codeword_bits}")
+    print("\n====== DATA WITH ERRORS ======")
+    print(f"Codeword with errors: {flipped_codeword_bits}")
+    print("\n======== DECODED DATA ========")
+    print(f"Decoded codeword: {decoded_bits}, errors identified: {error_count}")
+    print(f"Validation decoded codeword: {validation_decoded_bits}, errors identified: {validation_error_count}")
+    print("\n======== RESULTS =============")
+
+    if np.array_equal(codeword_bits, validation_decoded_bits):
+        print("Decoding successful")
+    else:
+        print("Decoding failed")
@@ -0,0 +1,79 @@
+import numpy as np
+
+
+class BlockInterleaver:
+    # Writes the bit stream of a batch row by row into rows x columns blocks and sends every block column by
+    # column. With columns equal to the codeword length (columns=None) a burst of up to `rows` bits touches
+    # each codeword at most once
+    def __init__(self, rows, columns=None):
+        if rows < 1 or (columns is not None and columns < 1):
+            raise ValueError(f"Interleaver dimensions must be positive, got {rows} x {columns}")
+        self.rows = rows
+        self.columns = columns
+
+    def __repr__(self):
+        return f"BlockInterleaver(rows={self.rows}, columns={self.columns})"
+
+    @property
+    def name(self):
+        return f"block({self.rows}x{self.columns or 'n'})"
+
+    def _block_size(self, width):
+        return self.rows * (self.columns or width)
+
+    def interleave(self, batch):
+        # (N, width) batch to one flat stream, zero padded to whole blocks
+        batch = np.asarray(batch)
+        block_size = self._block_size(batch.shape[1])
+        stream = np.zeros(-(-batch.size // block_size) * block_size, dtype=batch.dtype)
+        stream[:batch.size] = batch.reshape(-1)
+        return stream.reshape(-1, self.rows, block_size // self.rows).transpose(0, 2, 1).reshape(-1)
+
+    def deinterleave(self, stream, shape):
+        # Inverse of interleave for a batch of the given shape; the padding is dropped
+        block_size = self._block_size(shape[1])
+        blocks = np.asarray(stream).reshape(-1, block_size // self.rows, self.rows).transpose(0, 2, 1)
+        return blocks.reshape(-1)[:shape[0] * shape[1]].reshape(shape)
+
+
+class ConvolutionalInterleaver:
+    # Forney interleaver: bits go round robin to `branches` branches and branch i delays its bits by i * delay
+    # of its own slots, which spreads bits that were adjacent about delay * branches positions apart. The
+    # stream grows by the (branches - 1) * delay * branches positions the delay lines need to drain
+    def __init__(self, branches, delay=1):
+        if branches < 1 or delay < 0:
+            raise ValueError(f"Expected at least one branch and a non-negative delay, got {branches}, {delay}")
+        self.branches = branches
+        self.delay = delay
+
+    def __repr__(self):
+        return f"ConvolutionalInterleaver(branches={self.branches}, delay={self.delay})"
+
+    @property
+    def name(self):
+        return f"convolutional({self.branches}x{self.delay})"
+
+    def _positions(self, size):
+        positions = np.arange(size, dtype=np.int64)
+        return positions + (positions % self.branches) * self.delay * self.branches
+
+    def interleave(self, batch):
+        # Positions nothing is written to stay zero, like the initial contents of the delay lines
+        batch = np.asarray(batch)
+        stream = np.zeros(batch.size + (self.branches - 1) * self.delay * self.branches, dtype=batch.dtype)
+        stream[self._positions(batch.size)] = batch.reshape(-1)
+        return stream
+
+    def deinterleave(self, stream, shape):
+        return np.asarray(stream)[self._positions(shape[0] * shape[1])].reshape(shape)
+
+
+def create(kind, depth, delay=1):
+    # Interleaver from configuration values; kind None means no interleaving
+    if kind is None:
+        return None
+    if kind == "block":
+        return BlockInterleaver(depth)
+    if kind == "convolutional":
+        return ConvolutionalInterleaver(depth, delay)
+    raise ValueError(f"Unknown interleaver {kind!r}, expected 'block' or 'convolutional'")
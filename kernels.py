@@ -0,0 +1,147 @@
+import os
+import threading
+import types
+
+import numpy as np
+
+# Per-word loops that do not vectorize across words, compiled with numba when it is installed. Syndromes are not
+# among them: the float32 matrix products in bch_utils compute them for whole batches faster than any loop. "auto"
+# uses numba if it imports and the pure NumPy code otherwise; the BCH_BACKEND environment variable picks the
+# starting value. numba is only imported on the first decode that could use it, never by importing the code modules
+BACKENDS = ("auto", "numba", "numpy")
+_requested = os.environ.get("BCH_BACKEND", "auto")
+_compiled = None
+_lock = threading.Lock()  # Decodes on several threads, as in the service, must not compile the kernels twice
+
+
+def set_backend(name):
+    global _requested, _compiled
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown backend {name!r}, expected one of {BACKENDS}")
+    with _lock:
+        _requested = name
+        _compiled = None
+
+
+def compiled():
+    # Namespace of the compiled kernels, or None when the NumPy code should run
+    global _compiled
+    if _compiled is None:
+        with _lock:
+            if _compiled is None:
+                if _requested not in BACKENDS:
+                    raise ValueError(f"Unknown backend {_requested!r}, expected one of {BACKENDS}")
+                kernels = False
+                if _requested != "numpy":
+                    try:
+                        import numba
+                    except ImportError:
+                        if _requested == "numba":
+                            raise
+                    else:
+                        # cache=True keeps the machine code next to this file, so later processes skip compiling
+                        kernels = types.SimpleNamespace(**{name: numba.njit(cache=True, nogil=True)(kernel)
+                                                           for name, kernel in _KERNELS.items()})
+                _compiled = kernels
+    return _compiled or None
+
+
+def backend():
+    return "numpy" if compiled() is None else "numba"
+
+
+# The kernels below are plain Python in the subset numba compiles. Field elements use the exp/log tables of
+# gf.Field, where exp holds two periods so a sum of two logs needs no modulo
+
+
+def _berlekamp_massey(syndromes, exp, log, order):
+    # Word-by-word version of bch_utils._berlekamp_massey with the same outputs
+    words, count = syndromes.shape
+    locators = np.zeros((words, count + 1), dtype=np.int64)
+    lengths = np.zeros(words, dtype=np.int64)
+    locator = np.zeros(count + 1, dtype=np.int64)
+    previous = np.zeros(count + 1, dtype=np.int64)
+    saved = np.zeros(count + 1, dtype=np.int64)
+    for word in range(words):
+        locator[:] = 0
+        locator[0] = 1
+        previous[:] = 0
+        previous[0] = 1
+        previous_discrepancy = 1
+        length = 0
+        shift = 1
+        for i in range(count):
+            discrepancy = syndromes[word, i]
+            for j in range(1, min(length, i) + 1):
+                if locator[j] and syndromes[word, i - j]:
+                    discrepancy ^= exp[log[locator[j]] + log[syndromes[word, i - j]]]
+            if discrepancy == 0:
+                shift += 1
+                continue
+            scale_log = log[discrepancy] + order - log[previous_discrepancy]
+            grow = 2 * length <= i
+            if grow:
+                saved[:] = locator
+            for j in range(shift, count + 1):
+                if previous[j - shift]:
+                    locator[j] ^= exp[(scale_log + log[previous[j - shift]]) % order]
+            if grow:
+                previous[:] = saved
+                previous_discrepancy = discrepancy
+                length = i + 1 - length
+                shift = 1
+            else:
+                shift += 1
+        locators[word, :length + 1] = locator[:length + 1]
+        lengths[word] = length
+    return locators, lengths
+
+
+def _chien_search(locator, exp, log, order, n):
+    # errors[word, p] is set when alpha^-p is a root of the word's locator
+    words, width = locator.shape
+    errors = np.zeros((words, n), dtype=np.bool_)
+    for word in range(words):
+        for p in range(n):
+            value = 0
+            for j in range(width):
+                if locator[word, j]:
+                    value ^= exp[log[locator[word, j]] + order - (p * j) % order]
+            errors[word, p] = value == 0
+    return errors
+
+
+def _trapping(received, syndromes, generator, t):
+    # bch_utils.decode on a batch, from the syndrome bits (most significant first) of each word. The register
+    # divides by x once per rotation: shift right, folding g(x) in when the constant term is set
+    words, n = received.shape
+    degree = syndromes.shape[1]
+    corrected = received.copy()
+    error_counts = np.zeros(words, dtype=np.int64)
+    failed = np.zeros(words, dtype=np.bool_)
+    shifts = np.full(words, n, dtype=np.int64)
+    register = np.zeros(degree, dtype=np.uint8)
+    for word in range(words):
+        register[:] = syndromes[word]
+        failed[word] = True
+        for i in range(n):
+            weight = 0
+            for j in range(degree):
+                weight += register[j]
+            if weight <= t:
+                # The trapped errors sit in the parity positions of the word rotated right by i
+                for j in range(degree):
+                    if register[j]:
+                        corrected[word, (n - degree + j - i) % n] ^= 1
+                error_counts[word] = weight
+                failed[word] = False
+                shifts[word] = i
+                break
+            odd = register[degree - 1]
+            for j in range(degree - 1, 0, -1):
+                register[j] = register[j - 1] ^ (generator[j] & odd)
+            register[0] = odd
+    return corrected, error_counts, failed, shifts
+
+
+_KERNELS = {"berlekamp_massey": _berlekamp_massey, "chien_search": _chien_search, "trapping": _trapping}
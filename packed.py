@@ -0,0 +1,85 @@
+import numpy as np
+
+# Set bits of every byte value; np.bitwise_count would need NumPy 2
+_BYTE_WEIGHTS = np.unpackbits(np.arange(256, dtype=np.uint8)[:, None], axis=1).sum(axis=1, dtype=np.uint8)
+
+
+class PackedCodewords:
+    # A batch of n-bit words stored eight bits to a byte, one row of ceil(n/8) bytes per word in np.packbits
+    # order: the first bit is the most significant bit of byte 0 and the padding bits of the last byte stay 0.
+    # Eight times smaller than a uint8 bit matrix and 64 times smaller than int64 bits
+    def __init__(self, data, n):
+        data = np.ascontiguousarray(data, dtype=np.uint8)
+        if data.ndim != 2 or data.shape[1] != (n + 7) // 8:
+            raise ValueError(f"Expected packed rows of {(n + 7) // 8} bytes for n={n}, got shape {data.shape}")
+        self.data = data
+        self.n = n
+
+    def __repr__(self):
+        return f"PackedCodewords({len(self)} words, n={self.n})"
+
+    @classmethod
+    def from_bits(cls, bits):
+        bits = np.asarray(bits, dtype=np.uint8)
+        if bits.ndim != 2:
+            raise ValueError(f"Expected a bit matrix, got shape {bits.shape}")
+        return cls(np.packbits(bits, axis=1), bits.shape[1])
+
+    def to_bits(self):
+        return np.unpackbits(self.data, axis=1, count=self.n)
+
+    def __len__(self):
+        return len(self.data)
+
+    def __getitem__(self, rows):
+        return PackedCodewords(self.data[rows].reshape(-1, self.data.shape[1]), self.n)
+
+    def __xor__(self, other):
+        if self.n != other.n:
+            raise ValueError(f"Cannot combine words of length {self.n} and {other.n}")
+        return PackedCodewords(self.data ^ other.data, self.n)
+
+    @property
+    def nbytes(self):
+        return self.data.nbytes
+
+    def weights(self):
+        # Set bits per word, e.g. the number of errors in a packed error mask
+        return byte_weights(self.data).sum(axis=1, dtype=np.int64)
+
+    def prefix(self, length):
+        # The first `length` bits of every word, such as the message part of systematic codewords
+        data = self.data[:, :(length + 7) // 8].copy()
+        if length % 8:
+            data[:, -1] &= (0xFF << (8 - length % 8)) & 0xFF
+        return PackedCodewords(data, length)
+
+    def equal_rows(self, other):
+        return np.all(self.data == other.data, axis=1)
+
+
+def byte_weights(data):
+    return _BYTE_WEIGHTS[data]
+
+
+def byte_tables(matrix):
+    # Lookup tables for the GF(2) linear map x -> x @ matrix on packed rows. tables[j][b] is the packed image of
+    # input byte j holding b, so the image of a whole row is the XOR of one lookup per input byte
+    matrix = np.asarray(matrix, dtype=np.uint8)
+    rows, columns = matrix.shape
+    byte_bits = np.unpackbits(np.arange(256, dtype=np.uint8)[:, None], axis=1)
+    tables = np.zeros(((rows + 7) // 8, 256, (columns + 7) // 8), dtype=np.uint8)
+    for j in range(len(tables)):
+        block = matrix[8 * j:8 * j + 8]
+        images = (byte_bits[:, :len(block)].astype(np.int64) @ block) & 1
+        tables[j] = np.packbits(images.astype(np.uint8), axis=1)
+    tables.flags.writeable = False
+    return tables
+
+
+def apply_tables(tables, data):
+    # XOR of the lookups of every input byte of every row
+    result = tables[0][data[:, 0]].copy()
+    for j in range(1, len(tables)):
+        result ^= tables[j][data[:, j]]
+    return result
@@ -1,114 +1,113 @@
-import csv
+import sys
+
 import matplotlib.pyplot as plt
 
+import config
+import results_store
+
+# (n, k, color, linestyle, label) of every curve; n == k is the uncoded baseline
+ALL_CODES = [(127, 8, 'purple', '-', 'BCH(127,8), t=31'), (31, 6, 'red', '-', 'BCH(31,6), t=7'),
+             (15, 5, 'green', '-', 'BCH(15,5), t=3'), (15, 7, 'green', '--', 'BCH(15,7), t=2'),
+             (15, 11, 'green', ':', 'BCH(15,11), t=1'), (7, 4, 'blue', '-', 'BCH(7,4), t=1'),
+             (15, 15, 'black', '--', 'No encoding(k=15)'), (7, 7, 'black', ':', 'No encoding(k=7)')]
+BCH15_CODES = [code for code in ALL_CODES if code[0] == 15]
+
+# Markers of the second and later decoders of one code, e.g. chase2 next to the hard decisions of a soft run
+DECODER_MARKERS = ['o', 's', '^', 'v']
+
+
+def load_series(store, run_id):
+    # Every (code, decoder) of the run as its own curve, so decoders compared on the same code are never merged.
+    # Maps (n, k) to a list of (decoder, curve)
+    series = {}
+    for code in store.codes(run_id):
+        curve = store.load_curve(code["n"], code["k"], code["decoder"], code["channel"], run_id)
+        series.setdefault((code["n"], code["k"]), []).append((code["decoder"], curve))
+    return series
+
+
+def plot_curves(series, codes, code_rate=False):
+    # Every code is drawn over the BERs it actually reached; intervals are shaded around success rates
+    for n, k, color, linestyle, label in codes:
+        curves = series.get((n, k), [])
+        for index, (decoder, curve) in enumerate(curves):
+            if len(curve["ber"]) == 0:
+                continue
+            scale = k / n if code_rate else 1
+            marker = DECODER_MARKERS[(index - 1) % len(DECODER_MARKERS)] if index else None
+            plt.plot(curve["ber"], curve["rate"] * scale, color, linestyle=linestyle, marker=marker, linewidth=2,
+                     label=f"{label} [{decoder}]" if len(curves) > 1 else label)
+            if not code_rate:
+                plt.fill_between(curve["ber"], curve["low"], curve["high"], color=color, alpha=0.15, linewidth=0)
+
+
+def main(argv):
+    # Plot the newest BER sweep unless a run id is given on the command line
+    with results_store.ResultsStore(config.RESULTS_DB) as store:
+        run_id = int(argv[1]) if len(argv) > 1 else store.latest_run(("monte_carlo", "stratified"))
+        if run_id is None:
+            raise SystemExit(f"No runs in {config.RESULTS_DB}, run transmission_simulation.py first")
+        series = load_series(store, run_id)
+    print(f"Plotting run {run_id} from {config.RESULTS_DB}")
+
+    # Plot 1: Success Rate vs BER (All codes)
+    plt.figure(figsize=(10, 6))
+    plot_curves(series, ALL_CODES)
+
+    plt.title("Success Rate vs. BER for various BCH Codes", fontsize=20, fontweight='bold')
+    plt.xlabel("Bit Error Rate (BER)", fontsize=12)
+    plt.ylabel("Success Rate", fontsize=12)
+    plt.grid(True, linestyle='--', alpha=0.5)
+    plt.legend(loc="upper right", fontsize=10)
+    plt.tight_layout()
+    plt.savefig('success_plot_all.png', format='png')
+    print("Saved: success_plot_all.png")
+    plt.show()
+
+    # Plot 2: Code Rate vs BER (All codes)
+    plt.figure(figsize=(10, 6))
+    plot_curves(series, ALL_CODES, code_rate=True)
+
+    plt.title("Effective Code Rate vs. BER for various BCH Codes", fontsize=20, fontweight='bold')
+    plt.xlabel("Bit Error Rate (BER)", fontsize=12)
+    plt.ylabel("Effective Code Rate", fontsize=12)
+    plt.grid(True, linestyle='--', alpha=0.5)
+    plt.legend(loc="upper right", fontsize=10)
+    plt.tight_layout()
+    plt.savefig('rate_plot_all.png', format='png')
+    print("Saved: rate_plot_all.png")
+    plt.show()
+
+    # Plot 3: BCH(15,x) Success Rates
+    plt.figure(figsize=(10, 6))
+    plot_curves(series, BCH15_CODES)
+
+    plt.title("Success Rate vs. BER for BCH(15,x) codes", fontsize=20, fontweight='bold')
+    plt.xlabel("Bit Error Rate (BER)", fontsize=12)
+    plt.ylabel("Success Rate", fontsize=12)
+    plt.grid(True, linestyle='--', alpha=0.5)
+    plt.legend(loc="upper right", fontsize=12)
+    plt.tight_layout()
+    plt.savefig('success_plot_bch15.png', format='png')
+    print("Saved: success_plot_bch15.png")
+    plt.show()
+
+    # Plot 4: BCH(15,x) Code Rates
+    plt.figure(figsize=(10, 6))
+    plot_curves(series, BCH15_CODES, code_rate=True)
+
+    plt.title("Effective Code Rate vs. BER for BCH(15,x) codes", fontsize=20, fontweight='bold')
+    plt.xlabel("Bit Error Rate (BER)", fontsize=12)
+    plt.ylabel("Effective Code Rate", fontsize=12)
+    plt.grid(True, linestyle='--', alpha=0.5)
+    plt.legend(loc="upper right", fontsize=12)
+    plt.tight_layout()
+    plt.savefig('rate_plot_bch15.png', format='png')
+    print("Saved: rate_plot_bch15.png")
+    plt.show()
+
+    print("All plots generated successfully!")
+
 
-def read_csv(file_path):
-    with open(file_path, 'r') as file:
-        reader = csv.reader(file)
-        headers = next(reader)
-        data = list(reader)
-    return headers, data
-
-
-# Read data
-success_headers, success_data = read_csv('success_results.csv')
-rate_headers, rate_data = read_csv('rate_results.csv')
-
-# Parse success data
-BER_history = [float(row[0]) for row in success_data]
-bch127_8_success = [float(row[1]) for row in success_data]
-bch31_6_success = [float(row[2]) for row in success_data]
-bch15_5_success = [float(row[3]) for row in success_data]
-bch15_7_success = [float(row[4]) for row in success_data]
-bch15_11_success = [float(row[5]) for row in success_data]
-bch7_4_success = [float(row[6]) for row in success_data]
-baseline_15_success = [float(row[7]) for row in success_data]
-baseline_7_success = [float(row[8]) for row in success_data]
-
-# Parse rate data
-bch127_8_rate = [float(row[1]) for row in rate_data]
-bch31_6_rate = [float(row[2]) for row in rate_data]
-bch15_5_rate = [float(row[3]) for row in rate_data]
-bch15_7_rate = [float(row[4]) for row in rate_data]
-bch15_11_rate = [float(row[5]) for row in rate_data]
-bch7_4_rate = [float(row[6]) for row in rate_data]
-baseline_15_rate = [float(row[7]) for row in rate_data]
-baseline_7_rate = [float(row[8]) for row in rate_data]
-
-# Plot 1: Success Rate vs BER (All codes)
-plt.figure(figsize=(10, 6))
-plt.plot(BER_history, bch127_8_success, 'purple', linewidth=2, label='BCH(127,8), t=31')
-plt.plot(BER_history, bch31_6_success, 'red', linewidth=2, label='BCH(31,6), t=7')
-plt.plot(BER_history, bch15_5_success, 'green', linewidth=2, label='BCH(15,5), t=3')
-plt.plot(BER_history, bch15_7_success, 'green', linestyle='--', linewidth=2, label='BCH(15,7), t=2')
-plt.plot(BER_history, bch15_11_success, 'green', linestyle=':', linewidth=2, label='BCH(15,11), t=1')
-plt.plot(BER_history, bch7_4_success, 'blue', linewidth=2, label='BCH(7,4), t=1')
-plt.plot(BER_history, baseline_15_success, 'black', linestyle='--', linewidth=2, label='No encoding(k=15)')
-plt.plot(BER_history, baseline_7_success, 'black', linestyle=':', linewidth=2, label='No encoding(k=7)')
-
-plt.title("Success Rate vs. BER for various BCH Codes", fontsize=20, fontweight='bold')
-plt.xlabel("Bit Error Rate (BER)", fontsize=12)
-plt.ylabel("Success Rate", fontsize=12)
-plt.grid(True, linestyle='--', alpha=0.5)
-plt.legend(loc="upper right", fontsize=10)
-plt.tight_layout()
-plt.savefig('success_plot_all.png', format='png')
-print("Saved: success_plot_all.png")
-plt.show()
-
-# Plot 2: Code Rate vs BER (All codes)
-plt.figure(figsize=(10, 6))
-plt.plot(BER_history, bch127_8_rate, 'purple', linewidth=2, label='BCH(127,8), t=31')
-plt.plot(BER_history, bch31_6_rate, 'red', linewidth=2, label='BCH(31,6), t=7')
-plt.plot(BER_history, bch15_5_rate, 'green', linewidth=2, label='BCH(15,5), t=3')
-plt.plot(BER_history, bch15_7_rate, 'green', linestyle='--', linewidth=2, label='BCH(15,7), t=2')
-plt.plot(BER_history, bch15_11_rate, 'green', linestyle=':', linewidth=2, label='BCH(15,11), t=1')
-plt.plot(BER_history, bch7_4_rate, 'blue', linewidth=2, label='BCH(7,4), t=1')
-plt.plot(BER_history, baseline_15_rate, 'black', linestyle='--', linewidth=2, label='No encoding(k=15)')
-plt.plot(BER_history, baseline_7_rate, 'black', linestyle=':', linewidth=2, label='No encoding(k=7)')
-
-plt.title("Effective Code Rate vs. BER for various BCH Codes", fontsize=20, fontweight='bold')
-plt.xlabel("Bit Error Rate (BER)", fontsize=12)
-plt.ylabel("Effective Code Rate", fontsize=12)
-plt.grid(True, linestyle='--', alpha=0.5)
-plt.legend(loc="upper right", fontsize=10)
-plt.tight_layout()
-plt.savefig('rate_plot_all.png', format='png')
-print("Saved: rate_plot_all.png")
-plt.show()
-
-# Plot 3: BCH(15,x) Success Rates
-plt.figure(figsize=(10, 6))
-plt.plot(BER_history, bch15_5_success, 'green', linewidth=2, label='BCH(15,5), t=3')
-plt.plot(BER_history, bch15_7_success, 'green', linestyle='--', linewidth=2, label='BCH(15,7), t=2')
-plt.plot(BER_history, bch15_11_success, 'green', linestyle=':', linewidth=2, label='BCH(15,11), t=1')
-plt.plot(BER_history, baseline_15_success, 'black', linestyle='--', linewidth=2, label='No encoding(k=15)')
-
-plt.title("Success Rate vs. BER for BCH(15,x) codes", fontsize=20, fontweight='bold')
-plt.xlabel("Bit Error Rate (BER)", fontsize=12)
-plt.ylabel("Success Rate", fontsize=12)
-plt.grid(True, linestyle='--', alpha=0.5)
-plt.legend(loc="upper right", fontsize=12)
-plt.tight_layout()
-plt.savefig('success_plot_bch15.png', format='png')
-print("Saved: success_plot_bch15.png")
-plt.show()
-
-# Plot 4: BCH(15,x) Code Rates
-plt.figure(figsize=(10, 6))
-plt.plot(BER_history, bch15_5_rate, 'green', linewidth=2, label='BCH(15,5), t=3')
-plt.plot(BER_history, bch15_7_rate, 'green', linestyle='--', linewidth=2, label='BCH(15,7), t=2')
-plt.plot(BER_history, bch15_11_rate, 'green', linestyle=':', linewidth=2, label='BCH(15,11), t=1')
-plt.plot(BER_history, baseline_15_rate, 'black', linestyle='--', linewidth=2, label='No encoding(k=15)')
-
-plt.title("Effective Code Rate vs. BER for BCH(15,x) codes", fontsize=20, fontweight='bold')
-plt.xlabel("Bit Error Rate (BER)", fontsize=12)
-plt.ylabel("Effective Code Rate", fontsize=12)
-plt.grid(True, linestyle='--', alpha=0.5)
-plt.legend(loc="upper right", fontsize=12)
-plt.tight_layout()
-plt.savefig('rate_plot_bch15.png', format='png')
-print("Saved: rate_plot_bch15.png")
-plt.show()
-
-print("All plots generated successfully!")
+if __name__ == "__main__":
+    main(sys.argv)
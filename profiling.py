@@ -0,0 +1,116 @@
+import contextlib
+import cProfile
+import json
+import pstats
+import time
+
+# Profile collecting counters in this process, set by Profile.activate; None keeps count() a single check
+_active = None
+_off = contextlib.nullcontext()
+
+
+class Profile:
+    # Cumulative wall time and call count per stage, free-form counters and optionally cProfile statistics.
+    # Holds only plain data so worker processes can send it back to the parent
+    def __init__(self, cprofile=False):
+        self.cprofile = cprofile
+        self.stages = {}
+        self.counters = {}
+        self.functions = {}
+
+    @contextlib.contextmanager
+    def stage(self, name):
+        start_time = time.perf_counter()
+        try:
+            yield
+        finally:
+            seconds, calls = self.stages.get(name, (0.0, 0))
+            self.stages[name] = (seconds + time.perf_counter() - start_time, calls + 1)
+
+    def count(self, name, value=1):
+        self.counters[name] = self.counters.get(name, 0) + value
+
+    @contextlib.contextmanager
+    def activate(self):
+        # Route count() calls made anywhere in this process here, under cProfile if requested
+        global _active
+        previous, _active = _active, self
+        profiler = cProfile.Profile() if self.cprofile else None
+        if profiler is not None:
+            profiler.enable()
+        try:
+            yield self
+        finally:
+            _active = previous
+            if profiler is not None:
+                profiler.disable()
+                profiler.create_stats()
+                _merge_functions(self.functions, profiler.stats)
+
+    def merge(self, other):
+        for name, (seconds, calls) in other.stages.items():
+            total_seconds, total_calls = self.stages.get(name, (0.0, 0))
+            self.stages[name] = (total_seconds + seconds, total_calls + calls)
+        for name, value in other.counters.items():
+            self.count(name, value)
+        _merge_functions(self.functions, other.functions)
+
+    def report(self, top=20):
+        total = sum(seconds for seconds, _ in self.stages.values())
+        report = {
+            "stages": {name: {"seconds": seconds, "calls": calls, "share": seconds / total if total else 0.0}
+                       for name, (seconds, calls) in sorted(self.stages.items(), key=lambda item: -item[1][0])},
+            "counters": dict(sorted(self.counters.items())),
+        }
+        if self.functions:
+            # Same columns as pstats, heaviest own time first: that is where a faster kernel would pay off
+            rows = sorted(self.functions.items(), key=lambda item: -item[1][2])[:top]
+            report["functions"] = [{"function": pstats.func_std_string(function), "calls": calls,
+                                    "total_time": total_time, "cumulative_time": cumulative_time}
+                                   for function, (_, calls, total_time, cumulative_time, _) in rows]
+        return report
+
+
+def _merge_functions(target, source):
+    for function, stats in source.items():
+        target[function] = pstats.add_func_stats(target[function], stats) if function in target else stats
+
+
+def stage(profile, name):
+    # Timer for one stage, or a shared no-op context when profiling is off
+    return _off if profile is None else profile.stage(name)
+
+
+def count(name, value=1):
+    if _active is not None:
+        _active.count(name, value)
+
+
+class Report:
+    # One merged Profile per sweep, e.g. 'BCH(31,6) [table, bsc]', filled by the simulation runners. Codes
+    # named in cprofile_codes, such as 'BCH(31,6)', also run under cProfile with every decoder and channel
+    def __init__(self, cprofile_codes=()):
+        self.cprofile_codes = set(cprofile_codes)
+        self.profiles = {}
+
+    def new_profile(self, code):
+        return Profile(cprofile=code in self.cprofile_codes)
+
+    def add(self, code, profile):
+        self.profiles.setdefault(code, Profile()).merge(profile)
+
+    def as_dict(self, top=20):
+        return {code: profile.report(top) for code, profile in self.profiles.items()}
+
+    def save(self, path, top=20):
+        with open(path, 'w') as file:
+            json.dump(self.as_dict(top), file, indent=2)
+
+    def print(self):
+        for code, profile in self.profiles.items():
+            report = profile.report()
+            stages = " | ".join(f"{name}: {stats['seconds']:.3f}s ({stats['share']:.0%})"
+                                for name, stats in report["stages"].items())
+            print(f"Code: {code} | {stages}")
+            if report["counters"]:
+                print("    " + ", ".join(f"{name}: {value}" for name, value in report["counters"].items()))
@@ -0,0 +1,130 @@
+import json
+import sqlite3
+import time
+
+import numpy as np
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    created REAL NOT NULL,
+    mode TEXT NOT NULL,
+    seed TEXT,
+    settings TEXT
+);
+CREATE TABLE IF NOT EXISTS points (
+    run_id INTEGER NOT NULL REFERENCES runs (id) ON DELETE CASCADE,
+    n INTEGER NOT NULL,
+    k INTEGER NOT NULL,
+    t INTEGER NOT NULL,
+    decoder TEXT NOT NULL,
+    channel TEXT NOT NULL,
+    ber REAL NOT NULL,
+    trials INTEGER,
+    successes INTEGER,
+    rate REAL NOT NULL,
+    low REAL NOT NULL,
+    high REAL NOT NULL,
+    time REAL,
+    PRIMARY KEY (run_id, n, k, decoder, channel, ber)
+);
+CREATE INDEX IF NOT EXISTS points_by_code ON points (n, k, t, decoder, channel, ber);
+CREATE INDEX IF NOT EXISTS runs_by_seed ON runs (seed);
+"""
+
+# Decoder name stored for the uncoded baseline, which has n == k and t == 0
+UNCODED = "none"
+
+
+class ResultsStore:
+    # Every simulation run and its (code, decoder, channel, BER) points in one SQLite file. Rates come back
+    # per code without padding, so runs that stopped early at different BERs compare directly
+    def __init__(self, path):
+        self.path = path
+        self.connection = sqlite3.connect(path)
+        self.connection.row_factory = sqlite3.Row
+        self.connection.execute("PRAGMA foreign_keys = ON")
+        self.connection.executescript(SCHEMA)
+
+    def __repr__(self):
+        return f"ResultsStore({self.path!r})"
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        self.connection.close()
+
+    def start_run(self, mode, seed=None, settings=None):
+        # Seeds are stored as text, SeedSequence entropy easily exceeds SQLite's 64-bit integers
+        with self.connection:
+            cursor = self.connection.execute(
+                "INSERT INTO runs (created, mode, seed, settings) VALUES (?, ?, ?, ?)",
+                (time.time(), mode, None if seed is None else str(seed), json.dumps(settings or {})))
+        return cursor.lastrowid
+
+    def add_points(self, run_id, points):
+        # points are dicts with n, k, t, decoder, channel, ber, rate, low, high and optionally trials,
+        # successes and time; writing a point again replaces it
+        rows = [(run_id, point["n"], point["k"], point["t"], point["decoder"] or UNCODED, point["channel"],
+                 round(point["ber"], 10), point.get("trials"), point.get("successes"), point["rate"], point["low"],
+                 point["high"], point.get("time")) for point in points]
+        with self.connection:
+            self.connection.executemany("INSERT OR REPLACE INTO points VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                                        rows)
+
+    def runs(self, n=None, k=None, seed=None):
+        # Newest first, optionally only runs that contain the given code or used the given seed
+        query = "SELECT * FROM runs WHERE 1"
+        parameters = []
+        if n is not None or k is not None:
+            query += " AND id IN (SELECT run_id FROM points WHERE n = coalesce(?, n) AND k = coalesce(?, k))"
+            parameters += [n, k]
+        if seed is not None:
+            query += " AND seed = ?"
+            parameters.append(str(seed))
+        rows = self.connection.execute(query + " ORDER BY id DESC", parameters).fetchall()
+        return [dict(row, settings=json.loads(row["settings"])) for row in rows]
+
+    def latest_run(self, modes=None):
+        # Newest run, optionally only among the given modes
+        if modes is None:
+            row = self.connection.execute("SELECT max(id) FROM runs").fetchone()
+        else:
+            row = self.connection.execute(f"SELECT max(id) FROM runs WHERE mode IN ({', '.join('?' * len(modes))})",
+                                          tuple(modes)).fetchone()
+        return row[0]
+
+    def codes(self, run_id):
+        rows = self.connection.execute(
+            "SELECT DISTINCT n, k, t, decoder, channel FROM points WHERE run_id = ? ORDER BY n DESC, k",
+            (run_id,)).fetchall()
+        return [dict(row) for row in rows]
+
+    def load_curve(self, n, k, decoder=None, channel="bsc", run_id=None):
+        # One curve as numpy arrays sorted by BER; run_id None picks the newest run that has this code.
+        # decoder or channel None match any value, trials and successes are NaN for points without raw counts
+        if run_id is None:
+            row = self.connection.execute(
+                "SELECT max(run_id) FROM points WHERE n = ? AND k = ? AND decoder = coalesce(?, decoder) "
+                "AND channel = coalesce(?, channel)", (n, k, decoder, channel)).fetchone()
+            run_id = row[0]
+        rows = self.connection.execute(
+            "SELECT ber, rate, low, high, trials, successes, time FROM points WHERE run_id = ? AND n = ? AND k = ? "
+            "AND decoder = coalesce(?, decoder) AND channel = coalesce(?, channel) ORDER BY ber",
+            (run_id, n, k, decoder, channel)).fetchall()
+        columns = ("ber", "rate", "low", "high", "trials", "successes", "time")
+        curve = {column: np.array([np.nan if row[column] is None else row[column] for row in rows], dtype=np.float64)
+                 for column in columns}
+        curve["run_id"] = run_id
+        return curve
+
+    def load_curves(self, n, k, decoder=None, channel="bsc"):
+        # The same code across every run that has it, keyed by run id
+        rows = self.connection.execute(
+            "SELECT DISTINCT run_id FROM points WHERE n = ? AND k = ? AND decoder = coalesce(?, decoder) "
+            "AND channel = coalesce(?, channel) ORDER BY run_id", (n, k, decoder, channel)).fetchall()
+        return {row[0]: self.load_curve(n, k, decoder, channel, row[0]) for row in rows}
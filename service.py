@@ -0,0 +1,238 @@
+import argparse
+import asyncio
+import collections
+import json
+import sys
+import time
+
+import numpy as np
+
+import bch127_8
+import bch15_11
+import bch15_5
+import bch15_7
+import bch31_6
+import bch7_4
+import kernels
+
+# Requests and responses are JSON lines:
+#   {"id": 1, "op": "encode", "code": "15,7", "bits": "0110101"} -> {"id": 1, "bits": "011010100111010"}
+#   {"id": 2, "op": "decode", "code": "15,7", "bits": "..."} -> {"id": 2, "bits": "...", "errors": 1, "failed": false}
+#   {"id": 3, "op": "stats"} -> {"id": 3, "stats": {"15,7/decode": {"queue_depth": 0, ...}}}
+# Failures come back as {"id": ..., "error": "..."}. Responses on one connection may arrive out of order
+CODES = [bch7_4.BCH7_4, bch15_11.BCH15_11, bch15_7.BCH15_7, bch15_5.BCH15_5, bch31_6.BCH31_6, bch127_8.BCH127_8]
+OPERATIONS = ("encode", "decode")
+MAX_BATCH = 1024
+MAX_DELAY = 0.002  # Seconds the first request of a batch may wait for more to join it
+LATENCY_SAMPLES = 10000
+
+
+class MicroBatcher:
+    # Collects concurrent requests for one (code, operation) and runs them through the vectorized path
+    # together. A batch closes when it holds max_batch words or max_delay after its first request, whichever
+    # comes first, so latency stays bounded when traffic is light
+    def __init__(self, code, operation, max_batch=MAX_BATCH, max_delay=MAX_DELAY):
+        self.code = code
+        self.operation = operation
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.queue = asyncio.Queue()
+        self.requests = 0
+        self.batches = 0
+        self.latencies = collections.deque(maxlen=LATENCY_SAMPLES)
+        self.task = asyncio.get_running_loop().create_task(self.run())
+
+    async def submit(self, bits):
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((bits, future, time.perf_counter()))
+        return await future
+
+    async def run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self.queue.get()]
+            deadline = loop.time() + self.max_delay
+            while len(batch) < self.max_batch:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self.queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            # The codec runs on a worker thread, so a long batch does not stall reading requests or the deadlines
+            # of the other batchers; numpy and the compiled kernels release the GIL for most of it
+            results = await loop.run_in_executor(None, self.process, [bits for bits, _, _ in batch])
+            self.resolve(batch, results)
+
+    def process(self, words):
+        words = np.array(words, dtype=np.uint8)
+        try:
+            if self.operation == "encode":
+                return [{"bits": bits} for bits in _to_strings(self.code.encode_batch(words))]
+            corrected, error_counts, failed = self.code.decode_batch(words)
+            return [{"bits": bits, "errors": int(errors), "failed": bool(word_failed)}
+                    for bits, errors, word_failed in zip(_to_strings(corrected), error_counts, failed)]
+        except Exception as error:
+            return [{"error": str(error)}] * len(words)
+
+    def resolve(self, batch, results):
+        finished = time.perf_counter()
+        self.requests += len(batch)
+        self.batches += 1
+        for (_, future, submitted), result in zip(batch, results):
+            self.latencies.append(finished - submitted)
+            if not future.cancelled():
+                future.set_result(result)
+
+    def stats(self):
+        latencies = np.array(self.latencies) * 1000
+        percentiles = np.percentile(latencies, [50, 90, 99]) if len(latencies) else [None] * 3
+        return {"queue_depth": self.queue.qsize(), "requests": self.requests, "batches": self.batches,
+                "mean_batch": self.requests / self.batches if self.batches else 0.0,
+                "latency_ms": {name: None if value is None else float(value)
+                               for name, value in zip(("p50", "p90", "p99"), percentiles)}}
+
+
+def _to_strings(words):
+    # Rows of 0/1 bytes to '0'/'1' strings without a Python loop over the bits
+    characters = (np.asarray(words, dtype=np.uint8) + ord("0")).view("S1")
+    return [row.tobytes().decode() for row in characters]
+
+
+class CodecService:
+    # Keeps every code and its tables warm and owns one MicroBatcher per (code, operation), started on first use
+    def __init__(self, codes=None, max_batch=MAX_BATCH, max_delay=MAX_DELAY):
+        codes = [code() for code in CODES] if codes is None else codes
+        self.codes = {f"{code.n},{code.k}": code for code in codes}
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.batchers = {}
+        for code in self.codes.values():
+            # Builds the lookup tables now rather than inside the first request
+            code.decode_batch(code.encode_batch(np.zeros((1, code.k), dtype=np.uint8)))
+        # Loads the compiled kernels before any batch reaches the worker threads
+        kernels.compiled()
+
+    def batcher(self, code_key, operation):
+        if (code_key, operation) not in self.batchers:
+            self.batchers[code_key, operation] = MicroBatcher(self.codes[code_key], operation, self.max_batch,
+                                                              self.max_delay)
+        return self.batchers[code_key, operation]
+
+    async def handle(self, request):
+        response = {"id": request.get("id")} if isinstance(request, dict) else {"id": None}
+        try:
+            operation = request.get("op")
+            if operation == "stats":
+                response["stats"] = self.stats()
+                return response
+            if operation not in OPERATIONS:
+                raise ValueError(f"Unknown op {operation!r}, expected one of {OPERATIONS + ('stats',)}")
+            code_key = str(request.get("code", "")).removeprefix("BCH(").removesuffix(")").replace(" ", "")
+            if code_key not in self.codes:
+                raise ValueError(f"Unknown code {request.get('code')!r}, expected one of {sorted(self.codes)}")
+            code = self.codes[code_key]
+            bits = request.get("bits", "")
+            length = code.k if operation == "encode" else code.n
+            if not isinstance(bits, str) or len(bits) != length or bits.strip("01"):
+                raise ValueError(f"Expected {length} bits as a string of 0 and 1")
+            response.update(await self.batcher(code_key, operation).submit(
+                np.frombuffer(bits.encode(), dtype=np.uint8) - ord("0")))
+        except (AttributeError, ValueError) as error:
+            response["error"] = str(error)
+        return response
+
+    async def handle_line(self, line):
+        try:
+            request = json.loads(line)
+        except json.JSONDecodeError as error:
+            return {"id": None, "error": f"Invalid JSON: {error}"}
+        return await self.handle(request)
+
+    def stats(self):
+        return {f"{code_key}/{operation}": batcher.stats()
+                for (code_key, operation), batcher in sorted(self.batchers.items())}
+
+
+async def serve_stream(service, reader, write):
+    # Every line becomes its own task, so requests from one producer batch with each other and with other
+    # producers; `await write(data)` sends a response line back and waits while the client is not reading
+    pending = set()
+
+    async def respond(line):
+        await write((json.dumps(await service.handle_line(line)) + "\n").encode())
+
+    while line := await reader.readline():
+        if line.strip():
+            task = asyncio.create_task(respond(line))
+            pending.add(task)
+            task.add_done_callback(pending.discard)
+    if pending:
+        await asyncio.gather(*pending)
+
+
+async def serve_stdio(service):
+    loop = asyncio.get_running_loop()
+    reader = asyncio.StreamReader(limit=1 << 24)
+    await loop.connect_read_pipe(lambda: asyncio.StreamReaderProtocol(reader), sys.stdin)
+
+    # Responses go through a pipe transport as well, so a consumer that stops reading suspends the writers in
+    # drain() instead of blocking the loop on a full pipe
+    transport, protocol = await loop.connect_write_pipe(asyncio.streams.FlowControlMixin, sys.stdout)
+    writer = asyncio.StreamWriter(transport, protocol, reader, loop)
+
+    async def write(data):
+        writer.write(data)
+        await writer.drain()
+
+    try:
+        await serve_stream(service, reader, write)
+    finally:
+        writer.close()
+
+
+async def serve_unix(service, path, ready=None):
+    async def connection(reader, writer):
+        # Draining after every response bounds what a slow client can leave buffered
+        async def write(data):
+            writer.write(data)
+            await writer.drain()
+
+        try:
+            await serve_stream(service, reader, write)
+        finally:
+            writer.close()
+
+    server = await asyncio.start_unix_server(connection, path, limit=1 << 24)
+    if ready is not None:
+        ready.set()
+    async with server:
+        await server.serve_forever()
+
+
+async def run(socket_path, max_batch, max_delay):
+    service = CodecService(max_batch=max_batch, max_delay=max_delay)
+    print(f"Codes ready: {', '.join(f'BCH({key})' for key in service.codes)}", file=sys.stderr)
+    if socket_path is None:
+        await serve_stdio(service)
+    else:
+        await serve_unix(service, socket_path)
+    print(json.dumps(service.stats()), file=sys.stderr)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Encode and decode JSON-lines requests in micro-batches")
+    parser.add_argument("--socket", default=None, help="serve on this Unix socket instead of stdin/stdout")
+    parser.add_argument("--max-batch", type=int, default=MAX_BATCH, help="words per batch at most")
+    parser.add_argument("--max-delay-ms", type=float, default=MAX_DELAY * 1000,
+                        help="how long the first request of a batch waits for more")
+    args = parser.parse_args()
+    try:
+        asyncio.run(run(args.socket, args.max_batch, args.max_delay_ms / 1000))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
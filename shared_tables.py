@@ -0,0 +1,83 @@
+import functools
+from multiprocessing import shared_memory
+
+import numpy as np
+
+# Decoding tables grow as 2^(n-k), so pool workers map one shared copy instead of each building their own.
+# Functions decorated with @table cache their result per argument tuple like functools.lru_cache. A Publisher
+# moves cached results into shared memory blocks, and attach() installs them in a worker as read-only views
+# without copying
+_tables = {}
+_blocks = {}  # key -> SharedMemory blocks behind _tables[key], open for as long as the views are in use
+
+
+def table(function):
+    # Results must be a numpy array or a tuple of them, arguments hashable and picklable
+    @functools.wraps(function)
+    def cached(*args):
+        key = (function.__qualname__, args)
+        if key not in _tables:
+            _tables[key] = function(*args)
+        return _tables[key]
+
+    cached.key = lambda *args: (function.__qualname__, args)
+    return cached
+
+
+def _views(blocks, handles, is_tuple):
+    arrays = []
+    for block, (_, shape, dtype) in zip(blocks, handles):
+        array = np.ndarray(shape, dtype=dtype, buffer=block.buf)
+        array.flags.writeable = False
+        arrays.append(array)
+    return tuple(arrays) if is_tuple else arrays[0]
+
+
+class Publisher:
+    # Owns the shared copies of the tables it publishes until close(), also run when a with block ends. The
+    # publishing process switches to the shared copy as well, so every table exists once however many workers
+    # attach. handles holds only block names, shapes and dtypes and is what attach() takes in a worker
+    def __init__(self):
+        self.handles = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def publish(self, function, *args):
+        key = function.key(*args)
+        if key in self.handles:
+            return
+        value = function(*args)
+        is_tuple = isinstance(value, tuple)
+        blocks, handles = [], []
+        for array in value if is_tuple else (value,):
+            block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+            np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)[...] = array
+            blocks.append(block)
+            handles.append((block.name, array.shape, array.dtype.str))
+        _blocks[key] = blocks
+        _tables[key] = _views(blocks, handles, is_tuple)
+        self.handles[key] = (tuple(handles), is_tuple)
+
+    def close(self):
+        for key in self.handles:
+            _tables.pop(key, None)
+            for block in _blocks.pop(key, ()):
+                try:
+                    block.close()
+                except BufferError:
+                    # Someone still holds a view; the memory is released once it goes away
+                    pass
+                block.unlink()
+        self.handles = {}
+
+
+def attach(handles):
+    # Pool initializer taking Publisher.handles. The blocks stay mapped until the worker exits
+    for key, (entries, is_tuple) in handles.items():
+        blocks = [shared_memory.SharedMemory(name=name) for name, _, _ in entries]
+        _blocks[key] = blocks
+        _tables[key] = _views(blocks, entries, is_tuple)
@@ -0,0 +1,59 @@
+import math
+
+import numpy as np
+
+import channel
+
+# Decoders that correct every pattern of weight <= t and nothing else
+BOUNDED_DISTANCE_DECODERS = ("table", "algebraic")
+
+
+def binomial_weights(n, bers):
+    # P(weight = w | p) for every p in bers (rows) and w = 0..n (columns), computed in log space
+    bers = np.asarray(bers, dtype=np.float64)[:, None]
+    weights = np.arange(n + 1)
+    log_combinations = np.array([math.lgamma(n + 1) - math.lgamma(w + 1) - math.lgamma(n - w + 1) for w in weights])
+    with np.errstate(divide='ignore', invalid='ignore'):
+        log_ones = np.where(weights == 0, 0.0, weights * np.log(bers))
+        log_zeros = np.where(weights == n, 0.0, (n - weights) * np.log1p(-bers))
+    return np.exp(log_combinations + log_ones + log_zeros)
+
+
+def estimate_weight_rates(bch_code, samples_per_weight, seed=None):
+    # P(success | w) for every error weight w, each weight on its own random stream. Success means the
+    # decoded message equals the sent one, exactly like simulate_point
+    rates = np.zeros(bch_code.n + 1)
+    rates[0] = 1.0
+    for weight in range(1, bch_code.n + 1):
+        rng = channel.generator(seed, stream=weight)
+        messages = rng.integers(0, 2, size=(samples_per_weight, bch_code.k), dtype=np.uint8)
+        codewords = bch_code.encode_batch(messages)
+        received = codewords ^ channel.fixed_weight(rng, codewords.shape, weight)
+        decoded, _, failed = bch_code.decode_batch(received)
+        successes = np.count_nonzero(~failed & np.all(decoded[:, :bch_code.k] == messages, axis=1))
+        rates[weight] = successes / samples_per_weight
+    return rates
+
+
+def bounded_distance_curve(n, t, bers):
+    # A bounded-distance decoder succeeds exactly when at most t bits flip
+    return binomial_weights(n, bers)[:, :t + 1].sum(axis=1)
+
+
+def success_curve(k, bch_code, bers, samples_per_weight=1000, seed=None, z=1.96):
+    # Success rates and normal-approximation intervals for a whole BER grid from one set of per-weight trials
+    bers = np.asarray(bers, dtype=np.float64)
+    if bch_code is None:
+        rates = (1 - bers) ** k
+        return rates, np.stack([rates, rates], axis=1)
+    if bch_code.decoder in BOUNDED_DISTANCE_DECODERS:
+        rates = bounded_distance_curve(bch_code.n, bch_code.t, bers)
+        return rates, np.stack([rates, rates], axis=1)
+
+    weight_rates = estimate_weight_rates(bch_code, samples_per_weight, seed)
+    probabilities = binomial_weights(bch_code.n, bers)
+    rates = probabilities @ weight_rates
+    # Strata are independent, so their variances add with the squared stratum weights
+    variances = probabilities ** 2 @ (weight_rates * (1 - weight_rates) / samples_per_weight)
+    half_widths = z * np.sqrt(variances)
+    return rates, np.stack([np.clip(rates - half_widths, 0, 1), np.clip(rates + half_widths, 0, 1)], axis=1)
@@ -0,0 +1,187 @@
+import itertools
+import unittest
+import galois
+import numpy as np
+import bch127_8
+import bch15_11
+import bch15_5
+import bch15_7
+import bch31_6
+import bch7_4
+import bch_utils
+
+
+class TestBCHUtils(unittest.TestCase):
+    def setUp(self):
+        self.codes = [bch7_4.BCH7_4(), bch15_11.BCH15_11(), bch15_7.BCH15_7(), bch15_5.BCH15_5(),
+                      bch31_6.BCH31_6(), bch127_8.BCH127_8()]
+        self.rng = np.random.default_rng(0)
+
+    def test_encoding_matches_validation(self):
+        for code in self.codes:
+            messages = self.rng.integers(0, 2, size=(5, code.k))
+            for data in messages:
+                with self.subTest(code=(code.n, code.k), data=data.tolist()):
+                    codeword, generator, parity = code.encode(data, output="all")
+                    true_codeword, true_generator, true_parity = code.validation_encode(data, output="all")
+                    self.assertTrue(np.array_equal(codeword, true_codeword))
+                    self.assertTrue(np.array_equal(generator, true_generator))
+                    self.assertTrue(np.array_equal(parity, true_parity))
+
+    def test_encode_batch_matches_encode(self):
+        for code in self.codes:
+            with self.subTest(code=(code.n, code.k)):
+                messages = self.rng.integers(0, 2, size=(50, code.k), dtype=np.uint8)
+                codewords = code.encode_batch(messages)
+                self.assertEqual(codewords.shape, (50, code.n))
+                self.assertEqual(codewords.dtype, np.uint8)
+                for message, codeword in zip(messages, codewords):
+                    self.assertTrue(np.array_equal(codeword, code.encode(message)))
+
+    def test_encode_batch_rejects_wrong_shape(self):
+        with self.assertRaises(ValueError):
+            self.codes[0].encode_batch(np.zeros((3, self.codes[0].k + 1), dtype=np.uint8))
+
+    def test_table_decoder_corrects_up_to_t_errors(self):
+        for code in self.codes[:4]:
+            codeword = code.encode(self.rng.integers(0, 2, size=code.k))
+            for weight in range(code.t + 1):
+                for positions in itertools.combinations(range(code.n), weight):
+                    received = codeword.copy()
+                    received[list(positions)] ^= 1
+                    decoded, error_count = code.decode(received)
+                    with self.subTest(code=(code.n, code.k), positions=positions):
+                        self.assertTrue(np.array_equal(decoded, codeword))
+                        self.assertEqual(error_count, weight)
+
+    def test_table_decoder_matches_validation(self):
+        for code in self.codes[:4]:
+            for received in self.rng.integers(0, 2, size=(5, code.n)):
+                with self.subTest(code=(code.n, code.k), received=received.tolist()):
+                    decoded, error_count = code.decode(received)
+                    true_decoded, true_error_count = code.validation_decode(received)
+                    if true_error_count < 0:
+                        self.assertIsNone(decoded)
+                    else:
+                        self.assertTrue(np.array_equal(decoded, true_decoded))
+                        self.assertEqual(error_count, true_error_count)
+
+    def test_algebraic_decoder_matches_validation(self):
+        for code in self.codes[4:]:
+            codeword = code.encode(self.rng.integers(0, 2, size=code.k))
+            for weight in [0, 1, code.t // 2, code.t, code.t + 2]:
+                received = codeword.copy()
+                received[self.rng.choice(code.n, weight, replace=False)] ^= 1
+                with self.subTest(code=(code.n, code.k), weight=weight):
+                    decoded, error_count = code.decode(received)
+                    true_decoded, true_error_count = code.validation_decode(received)
+                    if weight <= code.t:
+                        self.assertTrue(np.array_equal(decoded, codeword))
+                        self.assertEqual(error_count, weight)
+                    if true_error_count < 0:
+                        self.assertIsNone(decoded)
+                    else:
+                        self.assertTrue(np.array_equal(decoded, true_decoded))
+                        self.assertEqual(error_count, true_error_count)
+
+    def test_trapping_decoder_matches_recomputed_syndromes(self):
+        # The straightforward trapping decoder: divide every rotation of the word by g(x) from scratch
+        def reference_decode(codeword, code):
+            for i in range(code.n):
+                rotated = bch_utils._bits_to_int(np.roll(codeword, i))
+                syndrome = bch_utils._syndrome(rotated, code.n, tuple(code.generator))
+                if syndrome.bit_count() <= code.t:
+                    return np.roll(bch_utils._int_to_bits(rotated ^ syndrome, code.n), -i), syndrome.bit_count()
+            return None, None
+
+        for code in self.codes:
+            codewords = code.encode_batch(self.rng.integers(0, 2, size=(40, code.k)))
+            received = codewords ^ (self.rng.random(codewords.shape) < 1.5 * code.t / code.n)
+            for row in range(len(received)):
+                with self.subTest(code=(code.n, code.k), row=row):
+                    decoded, error_count = bch_utils.decode(received[row], code.generator, code.t)
+                    expected, expected_count = reference_decode(received[row], code)
+                    self.assertEqual(decoded is None, expected is None)
+                    if expected is not None:
+                        self.assertTrue(np.array_equal(decoded, expected))
+                        self.assertEqual(error_count, expected_count)
+
+    def test_decode_batch_matches_decode(self):
+        for code in self.codes:
+            for decoder in ["trapping", "table", "algebraic"]:
+                if decoder == "table" and code.n > 15:
+                    continue
+                code.decoder = decoder
+                codewords = code.encode_batch(self.rng.integers(0, 2, size=(30, code.k)))
+                received = codewords ^ (self.rng.random(codewords.shape) < 2 * code.t / code.n)
+                corrected, error_counts, failed = code.decode_batch(received)
+                for row in range(len(received)):
+                    with self.subTest(code=(code.n, code.k), decoder=decoder, row=row):
+                        decoded, error_count = code.decode(received[row])
+                        self.assertEqual(failed[row], decoded is None)
+                        if decoded is None:
+                            self.assertTrue(np.array_equal(corrected[row], received[row]))
+                        else:
+                            self.assertTrue(np.array_equal(corrected[row], decoded))
+                            self.assertEqual(error_counts[row], error_count)
+
+    def test_algebraic_decoder_handles_long_codes(self):
+        for n, k in [(255, 131), (1023, 923)]:
+            code = bch_utils.BCHCode(n, k)
+            codewords = code.encode_batch(self.rng.integers(0, 2, size=(20, k)))
+            errors = np.zeros(codewords.shape, dtype=np.uint8)
+            for row, weight in enumerate(np.arange(20) % (code.t + 1)):
+                errors[row, self.rng.choice(n, weight, replace=False)] = 1
+            corrected, error_counts, failed = code.decode_batch(codewords ^ errors)
+            with self.subTest(n=n, k=k):
+                self.assertEqual(code.decoder, "algebraic")
+                self.assertFalse(failed.any())
+                self.assertTrue(np.array_equal(corrected, codewords))
+                self.assertTrue(np.array_equal(error_counts, errors.sum(axis=1)))
+
+    def test_long_high_rate_codes_default_to_algebraic(self):
+        # n - k <= 16 but n > 63, too long for packed coset leaders
+        for n, k in [(127, 120), (255, 239)]:
+            code = bch_utils.BCHCode(n, k)
+            codewords = code.encode_batch(self.rng.integers(0, 2, size=(10, k)))
+            errors = np.zeros(codewords.shape, dtype=np.uint8)
+            errors[np.arange(10), self.rng.choice(n, 10, replace=False)] = 1
+            corrected, error_counts, failed = code.decode_batch(codewords ^ errors)
+            with self.subTest(n=n, k=k):
+                self.assertEqual(code.decoder, "algebraic")
+                self.assertFalse(failed.any())
+                self.assertTrue(np.array_equal(corrected, codewords))
+                self.assertTrue(np.all(error_counts == 1))
+
+    def test_syndromes_are_linear(self):
+        for code in self.codes[:4] + [bch_utils.BCHCode(31, 6, "algebraic"), bch_utils.BCHCode(15, 7, "trapping")]:
+            received = self.rng.integers(0, 2, size=(40, code.n), dtype=np.uint8)
+            errors = self.rng.integers(0, 2, size=(40, code.n), dtype=np.uint8)
+            syndromes = code.syndrome_batch(received)
+            for position in range(code.n):
+                syndromes[errors[:, position] == 1] ^= code.position_syndromes()[position]
+            with self.subTest(code=(code.n, code.k), decoder=code.decoder):
+                self.assertTrue(np.array_equal(syndromes, code.syndrome_batch(received ^ errors)))
+                for expected, result in zip(code.decode_batch(received ^ errors),
+                                            code.decode_syndromes(received ^ errors, syndromes)):
+                    self.assertTrue(np.array_equal(expected, result))
+
+    def test_generic_code_matches_validation(self):
+        for n, k in [(7, 4), (15, 7), (31, 6), (63, 45), (63, 7), (127, 8)]:
+            with self.subTest(n=n, k=k):
+                code = bch_utils.BCHCode(n, k)
+                reference = galois.BCH(n, k)
+                self.assertEqual(code.t, reference.t)
+                self.assertEqual(code.generator, [int(c) for c in reference.generator_poly.coeffs])
+
+    def test_generic_code_rejects_unknown_parameters(self):
+        for n, k in [(15, 6), (16, 8), (7, 7)]:
+            with self.subTest(n=n, k=k):
+                with self.assertRaises(ValueError):
+                    bch_utils.BCHCode(n, k)
+        with self.assertRaises(ValueError):
+            bch_utils.BCHCode(15, 7, decoder="magic")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,35 @@
+import unittest
+import bch15_7
+from benchmarks import throughput
+
+
+class TestThroughputBenchmarks(unittest.TestCase):
+    def test_every_stage_is_measured(self):
+        results = throughput.benchmark_code(bch15_7.BCH15_7(), batch_sizes=(10, 50), single_count=5, repeat=1)
+        stages = {(entry["stage"], entry["path"]) for entry in results}
+        self.assertEqual(stages, {("encode", "single"), ("encode", "batch"), ("channel", "batch"),
+                                  ("syndrome", "batch"), ("decode", "single"), ("decode", "batch"),
+                                  ("end_to_end", "batch")})
+        self.assertEqual({entry["error_weight"] for entry in results if entry["stage"] == "decode"}, {0, 2, 3})
+        for entry in results:
+            self.assertGreater(entry["codewords_per_second"], 0)
+            self.assertAlmostEqual(entry["mbit_per_second"], entry["codewords_per_second"] * 15 / 1e6)
+
+    def test_compare_flags_only_regressions_beyond_threshold(self):
+        baseline = {"results": throughput.benchmark_code(bch15_7.BCH15_7(), batch_sizes=(10,), single_count=5,
+                                                         repeat=1)}
+        faster = [dict(entry, codewords_per_second=entry["codewords_per_second"] * 2) for entry in baseline["results"]]
+        slightly_slower = [dict(entry, codewords_per_second=entry["codewords_per_second"] * 0.95)
+                           for entry in baseline["results"]]
+        slower = [dict(entry, codewords_per_second=entry["codewords_per_second"] * 0.5)
+                  for entry in baseline["results"]]
+        self.assertEqual(throughput.compare(baseline, faster), [])
+        self.assertEqual(throughput.compare(baseline, slightly_slower, threshold=0.1), [])
+        regressions = throughput.compare(baseline, slower, threshold=0.1)
+        self.assertEqual(len(regressions), len(baseline["results"]))
+        self.assertTrue(all(abs(regression["ratio"] - 0.5) < 1e-9 for regression in regressions))
+        self.assertEqual(throughput.compare({"results": []}, slower), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
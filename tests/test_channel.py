@@ -0,0 +1,68 @@
+import unittest
+import numpy as np
+import channel
+import transmission_simulation
+
+
+class TestChannel(unittest.TestCase):
+    def test_streams_are_reproducible(self):
+        first = channel.binary_symmetric(channel.generator(7, stream=1), (100, 15), 0.1)
+        second = channel.binary_symmetric(channel.generator(7, stream=1), (100, 15), 0.1)
+        other = channel.binary_symmetric(channel.generator(7, stream=2), (100, 15), 0.1)
+        self.assertTrue(np.array_equal(first, second))
+        self.assertFalse(np.array_equal(first, other))
+
+    def test_binary_symmetric_error_rate(self):
+        mask = channel.binary_symmetric(channel.generator(0), (20000, 15), 0.1)
+        self.assertEqual(mask.shape, (20000, 15))
+        self.assertEqual(mask.dtype, np.uint8)
+        self.assertAlmostEqual(mask.mean(), 0.1, delta=0.005)
+        self.assertFalse(channel.binary_symmetric(channel.generator(0), (100, 15), 0.0).any())
+
+    def test_binary_symmetric_packed(self):
+        # Same draws as binary_symmetric however the rows are chunked
+        expected = np.packbits(channel.binary_symmetric(channel.generator(3), (1000, 31), 0.2), axis=1)
+        for chunk_bits in (1, 100, 31 * 1000, 1 << 20):
+            with self.subTest(chunk_bits=chunk_bits):
+                errors = channel.binary_symmetric_packed(channel.generator(3), 1000, 31, 0.2, chunk_bits)
+                self.assertEqual(errors.dtype, np.uint8)
+                self.assertTrue(np.array_equal(errors, expected))
+
+    def test_fixed_weight(self):
+        rng = channel.generator(0)
+        self.assertTrue(np.all(channel.fixed_weight(rng, (1000, 31), 7).sum(axis=1) == 7))
+        weights = np.arange(16)
+        self.assertTrue(np.array_equal(channel.fixed_weight(rng, (16, 15), weights).sum(axis=1), weights))
+        with self.assertRaises(ValueError):
+            channel.fixed_weight(rng, (10, 15), 16)
+
+    def test_gilbert_elliott_bursts(self):
+        rng = channel.generator(0)
+        mask = channel.gilbert_elliott(rng, (20000, 127), 0.01, 0.1, ber_good=0.0, ber_bad=0.5)
+        self.assertEqual(mask.shape, (20000, 127))
+        # Stationary bad-state probability is 0.01 / 0.11, half of those bits flip
+        self.assertAlmostEqual(mask.mean(), 0.5 * 0.01 / 0.11, delta=0.005)
+        # Errors cluster: a flipped bit is much more likely to be followed by another one
+        following = mask[:, 1:][mask[:, :-1] == 1].mean()
+        self.assertGreater(following, 3 * mask.mean())
+
+    def test_bpsk_awgn(self):
+        codewords = channel.generator(0).integers(0, 2, size=(20000, 15), dtype=np.uint8)
+        llrs = channel.bpsk_awgn(channel.generator(1), codewords, 3.0, 7 / 15)
+        self.assertEqual(llrs.shape, codewords.shape)
+        errors = (llrs < 0) != codewords
+        self.assertAlmostEqual(errors.mean(), channel.hard_decision_ber(3.0, 7 / 15), delta=0.003)
+        # Wrong hard decisions are the unreliable ones
+        self.assertLess(np.abs(llrs[errors]).mean(), np.abs(llrs[~errors]).mean() / 2)
+        self.assertAlmostEqual(float(channel.hard_decision_ber(0.0, 1.0)), 0.0786, places=4)
+
+    def test_simulation_helpers(self):
+        data = np.zeros(15, dtype=np.uint8)
+        self.assertEqual(transmission_simulation.flip_random_bits(data, 3).sum(), 3)
+        self.assertTrue(np.array_equal(transmission_simulation.introduce_error(data, 0.0), data))
+        with self.assertRaises(ValueError):
+            transmission_simulation.flip_random_bits(data, 16)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,68 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+import bch15_7
+import bch31_6
+import bch_utils
+import channel
+import chase
+import results_store
+import transmission_simulation
+
+
+class TestChase(unittest.TestCase):
+    def setUp(self):
+        self.rng = np.random.default_rng(0)
+
+    def test_test_patterns(self):
+        patterns = chase.test_patterns(3)
+        self.assertEqual(patterns.shape, (8, 3))
+        self.assertEqual(len({tuple(pattern) for pattern in patterns}), 8)
+        self.assertTrue(np.array_equal(patterns[5], [1, 0, 1]))
+
+    def test_corrects_errors_in_unreliable_positions(self):
+        # t + 1 errors are beyond the hard decoder, but flipping t of them leaves one it can correct
+        for code in (bch15_7.BCH15_7(), bch31_6.BCH31_6(), bch_utils.BCHCode(15, 7, "trapping")):
+            codewords = code.encode_batch(self.rng.integers(0, 2, size=(20, code.k)))
+            llrs = np.where(codewords == 0, 4.0, -4.0) + self.rng.uniform(-0.5, 0.5, codewords.shape)
+            for row in range(len(llrs)):
+                positions = self.rng.choice(code.n, code.t + 1, replace=False)
+                llrs[row, positions] = -0.1 * np.sign(llrs[row, positions])
+            with self.subTest(code=code):
+                hard_decoded, _, _ = code.decode_batch((llrs < 0).astype(np.uint8))
+                corrected, error_counts, failed = chase.chase_decode(code, llrs)
+                self.assertFalse(np.all(hard_decoded == codewords, axis=1).any())
+                self.assertFalse(failed.any())
+                self.assertTrue(np.array_equal(corrected, codewords))
+                self.assertTrue(np.all(error_counts == code.t + 1))
+
+    def test_never_worse_than_hard_decisions(self):
+        code = bch15_7.BCH15_7()
+        codewords = code.encode_batch(self.rng.integers(0, 2, size=(2000, code.k)))
+        llrs = channel.bpsk_awgn(self.rng, codewords, 3.0, code.k / code.n)
+        hard_decoded, _, _ = code.decode_batch((llrs < 0).astype(np.uint8))
+        corrected, _, failed = chase.chase_decode(code, llrs)
+        self.assertFalse(code.syndrome_batch(corrected[~failed]).any())
+        hard_successes = np.all(hard_decoded == codewords, axis=1).sum()
+        self.assertGreater(np.all(corrected == codewords, axis=1).sum(), hard_successes)
+
+    def test_soft_sweep(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        with results_store.ResultsStore(os.path.join(directory.name, "results.db")) as store:
+            histories = transmission_simulation.run_soft_sweep([bch15_7.BCH15_7()], 4.0, 2.0, 300, seed=1,
+                                                               store=store)
+            hard_history, chase_history, grid = histories[0]
+            self.assertEqual(grid, [0.0, 2.0, 4.0])
+            self.assertTrue(all(soft >= hard for hard, soft in zip(hard_history, chase_history)))
+            self.assertEqual(hard_history, transmission_simulation.run_soft_sweep([bch15_7.BCH15_7()], 4.0, 2.0, 300,
+                                                                                  seed=1)[0][0])
+            curve = store.load_curve(15, 7, decoder="chase2", channel="awgn")
+            # Points come back sorted by raw BER, which falls as Eb/N0 grows
+            self.assertEqual(curve["rate"].tolist(), chase_history[::-1])
+            self.assertIsNone(store.latest_run(("monte_carlo", "stratified")))
+
+
+if __name__ == '__main__':
+    unittest.main()
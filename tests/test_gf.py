@@ -0,0 +1,51 @@
+import unittest
+import galois
+import numpy as np
+import gf
+
+
+class TestGF(unittest.TestCase):
+    def setUp(self):
+        self.rng = np.random.default_rng(0)
+
+    def test_arithmetic_matches_galois(self):
+        for m in (2, 4, 8, 10, 16):
+            field = gf.field(m)
+            reference = galois.GF(2 ** m, irreducible_poly=gf.PRIMITIVE_POLYS[m])
+            a = self.rng.integers(0, 2 ** m, 500)
+            b = self.rng.integers(1, 2 ** m, 500)
+            exponents = self.rng.integers(-20, 20, 500)
+            with self.subTest(m=m):
+                self.assertEqual(int(reference.primitive_element), 2)
+                self.assertTrue(np.array_equal(field.multiply(a, b), reference(a) * reference(b)))
+                self.assertTrue(np.array_equal(field.divide(a, b), reference(a) / reference(b)))
+                self.assertTrue(np.array_equal(field.inverse(b), np.reciprocal(reference(b))))
+                self.assertTrue(np.array_equal(field.power(b, exponents), reference(b) ** exponents))
+                self.assertTrue(np.array_equal(field.alpha_power(exponents),
+                                               reference.primitive_element ** exponents))
+
+    def test_zero(self):
+        field = gf.field(4)
+        self.assertTrue(np.array_equal(field.multiply([0, 5], [7, 0]), [0, 0]))
+        self.assertTrue(np.array_equal(field.power([0, 0], [0, 3]), [1, 0]))
+        with self.assertRaises(ZeroDivisionError):
+            field.inverse([3, 0])
+
+    def test_evaluate_matches_galois(self):
+        field = gf.field(6)
+        reference = galois.GF(2 ** 6, irreducible_poly=gf.PRIMITIVE_POLYS[6])
+        coefficients = self.rng.integers(0, 64, (3, 5))
+        points = self.rng.integers(0, 64, 20)
+        values = field.evaluate(coefficients, points)
+        self.assertEqual(values.shape, (3, 20))
+        for row in range(3):
+            self.assertTrue(np.array_equal(values[row], galois.Poly(reference(coefficients[row]))(reference(points))))
+
+    def test_rejects_unsupported_degree(self):
+        for m in (1, 17):
+            with self.assertRaises(ValueError):
+                gf.Field(m)
+
+
+if __name__ == '__main__':
+    unittest.main()
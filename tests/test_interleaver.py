@@ -0,0 +1,87 @@
+import unittest
+from unittest import mock
+import numpy as np
+import bch15_7
+import channel
+import interleaver
+import transmission_simulation
+
+
+class TestInterleaver(unittest.TestCase):
+    def setUp(self):
+        self.batch = channel.generator(0).integers(0, 2, size=(37, 15), dtype=np.uint8)
+
+    def test_round_trip(self):
+        for stage in (interleaver.BlockInterleaver(8), interleaver.BlockInterleaver(4, 10),
+                      interleaver.ConvolutionalInterleaver(5, 2), interleaver.ConvolutionalInterleaver(1, 0)):
+            with self.subTest(stage=stage):
+                stream = stage.interleave(self.batch)
+                self.assertEqual(stream.ndim, 1)
+                self.assertGreaterEqual(stream.size, self.batch.size)
+                self.assertTrue(np.array_equal(stage.deinterleave(stream, self.batch.shape), self.batch))
+
+    def test_block_interleaver_spreads_bursts(self):
+        stage = interleaver.BlockInterleaver(8)
+        size = stage.interleave(self.batch).size
+        for start in range(0, size - 8, 5):
+            errors = np.zeros(size, dtype=np.uint8)
+            errors[start:start + 8] = 1
+            hits = stage.deinterleave(errors, self.batch.shape).sum(axis=1)
+            self.assertLessEqual(hits.max(), 1)
+
+    def test_convolutional_interleaver_spreads_bursts(self):
+        stage = interleaver.ConvolutionalInterleaver(5, 3)
+        size = stage.interleave(self.batch).size
+        errors = np.zeros(size, dtype=np.uint8)
+        errors[200:205] = 1
+        positions = np.flatnonzero(stage.deinterleave(errors, self.batch.shape).reshape(-1))
+        self.assertEqual(len(positions), 5)
+        self.assertTrue(np.all(np.diff(positions) >= 5 * 3 - 1))
+
+    def test_create(self):
+        self.assertIsNone(interleaver.create(None, 8))
+        self.assertEqual(interleaver.create("block", 8).name, "block(8xn)")
+        self.assertEqual(interleaver.create("convolutional", 6, 2).name, "convolutional(6x2)")
+        with self.assertRaises(ValueError):
+            interleaver.create("helical", 8)
+        with self.assertRaises(ValueError):
+            interleaver.BlockInterleaver(0)
+
+
+class TestLink(unittest.TestCase):
+    def test_memoryless_link_matches_binary_symmetric(self):
+        batch = np.zeros((100, 15), dtype=np.uint8)
+        received = channel.Link().transmit(channel.generator(3), batch, 0.1)
+        self.assertTrue(np.array_equal(received, channel.binary_symmetric(channel.generator(3), batch.shape, 0.1)))
+
+    def test_burst_stream_error_rate(self):
+        for ber in (0.0, 0.01, 0.05, 0.3, 0.7):
+            with self.subTest(ber=ber):
+                errors = channel.burst_stream(channel.generator(0), 300000, *channel.burst_parameters(ber, 10))
+                self.assertEqual(errors.shape, (300000,))
+                self.assertAlmostEqual(errors.mean(), ber, delta=0.1 * ber + 0.002)
+
+    def test_burst_stream_runs_continue_across_chunks(self):
+        # With every bad bit flipped and no good one, the mask is the state sequence itself. Drawn three run
+        # pairs at a time, its runs still have the geometric means 1/p of each state
+        with mock.patch.object(channel, "_BURST_RUN_PAIRS", 3):
+            states = channel.burst_stream(channel.generator(0), 200000, 0.05, 0.2, ber_good=0.0, ber_bad=1.0)
+        boundaries = np.flatnonzero(np.diff(states)) + 1
+        runs = np.diff(boundaries)
+        run_states = states[boundaries[:-1]]
+        self.assertAlmostEqual(runs[run_states == 1].mean(), 1 / 0.2, delta=0.2)
+        self.assertAlmostEqual(runs[run_states == 0].mean(), 1 / 0.05, delta=0.8)
+
+    def test_interleaving_helps_against_bursts(self):
+        code = bch15_7.BCH15_7()
+        plain = channel.Link(burst_length=8)
+        interleaved = channel.Link(burst_length=8, interleaver=interleaver.BlockInterleaver(16))
+        self.assertEqual(interleaved.name, "burst(8,0.5)+block(16xn)")
+        plain_successes, _ = transmission_simulation.simulate_point(7, code, 0.02, 4000, seed=1, link=plain)
+        interleaved_successes, _ = transmission_simulation.simulate_point(7, code, 0.02, 4000, seed=1,
+                                                                          link=interleaved)
+        self.assertGreater(interleaved_successes, plain_successes + 100)
+
+
+if __name__ == '__main__':
+    unittest.main()
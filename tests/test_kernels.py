@@ -0,0 +1,81 @@
+import importlib.util
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import bch127_8
+import bch15_5
+import bch15_7
+import bch31_6
+import bch7_4
+import chase
+import channel
+import kernels
+
+HAS_NUMBA = importlib.util.find_spec("numba") is not None
+CODES = [bch7_4.BCH7_4, bch15_7.BCH15_7, bch15_5.BCH15_5, bch31_6.BCH31_6, bch127_8.BCH127_8]
+
+
+class TestKernels(unittest.TestCase):
+    def setUp(self):
+        self.rng = np.random.default_rng(0)
+        self.requested = kernels._requested
+
+    def tearDown(self):
+        kernels.set_backend(self.requested)
+
+    def decode_with(self, backend, code, received):
+        kernels.set_backend(backend)
+        self.assertEqual(kernels.backend(), backend)
+        return code.decode_batch(received)
+
+    def test_unknown_backend(self):
+        with self.assertRaises(ValueError):
+            kernels.set_backend("cuda")
+
+    def test_numpy_backend_skips_numba(self):
+        kernels.set_backend("numpy")
+        self.assertIsNone(kernels.compiled())
+        self.assertEqual(kernels.backend(), "numpy")
+
+    @unittest.skipUnless(HAS_NUMBA, "numba is not installed")
+    def test_threads_share_one_set_of_kernels(self):
+        # The service decodes on executor threads; none of them may see the backend half loaded
+        kernels.set_backend("numba")
+        with ThreadPoolExecutor(8) as executor:
+            namespaces = list(executor.map(lambda _: kernels.compiled(), range(32)))
+        self.assertIsNotNone(namespaces[0])
+        self.assertTrue(all(namespace is namespaces[0] for namespace in namespaces))
+
+    @unittest.skipUnless(HAS_NUMBA, "numba is not installed")
+    def test_backends_are_bit_identical(self):
+        for code_class in CODES:
+            for decoder in ("trapping", "algebraic"):
+                code = code_class(decoder=decoder)
+                codewords = code.encode_batch(self.rng.integers(0, 2, (500, code.k), dtype=np.uint8))
+                # From no errors to well past t, so decoded, miscorrected and failed words all occur
+                errors = self.rng.random(codewords.shape) < self.rng.uniform(0, 0.2, (len(codewords), 1))
+                received = codewords ^ errors.astype(np.uint8)
+                expected = self.decode_with("numpy", code, received)
+                actual = self.decode_with("numba", code, received)
+                with self.subTest(code=code_class.__name__, decoder=decoder):
+                    for expected_part, actual_part in zip(expected, actual):
+                        self.assertTrue(np.array_equal(expected_part, actual_part))
+
+    @unittest.skipUnless(HAS_NUMBA, "numba is not installed")
+    def test_chase_backends_are_bit_identical(self):
+        # Chase feeds incrementally updated syndromes straight to the kernels
+        for decoder in ("trapping", "algebraic"):
+            code = bch31_6.BCH31_6(decoder=decoder)
+            codewords = code.encode_batch(self.rng.integers(0, 2, (50, code.k), dtype=np.uint8))
+            llrs = channel.bpsk_awgn(self.rng, codewords, 1.0, code.k / code.n)
+            results = []
+            for backend in ("numpy", "numba"):
+                kernels.set_backend(backend)
+                results.append(chase.chase_decode(code, llrs))
+            with self.subTest(decoder=decoder):
+                for expected_part, actual_part in zip(*results):
+                    self.assertTrue(np.array_equal(expected_part, actual_part))
+
+
+if __name__ == '__main__':
+    unittest.main()
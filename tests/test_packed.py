@@ -0,0 +1,73 @@
+import unittest
+import numpy as np
+import bch127_8
+import bch15_11
+import bch15_5
+import bch15_7
+import bch31_6
+import bch7_4
+import bch_utils
+import channel
+import packed
+
+
+class TestPacked(unittest.TestCase):
+    def setUp(self):
+        self.rng = np.random.default_rng(0)
+
+    def test_round_trip(self):
+        for n in (1, 7, 8, 15, 63, 127):
+            with self.subTest(n=n):
+                bits = self.rng.integers(0, 2, size=(50, n), dtype=np.uint8)
+                words = packed.PackedCodewords.from_bits(bits)
+                self.assertEqual(words.data.shape, (50, (n + 7) // 8))
+                self.assertEqual(words.nbytes, 50 * ((n + 7) // 8))
+                self.assertTrue(np.array_equal(words.to_bits(), bits))
+                self.assertTrue(np.array_equal(words.weights(), bits.sum(axis=1)))
+                self.assertTrue(np.array_equal(words[3:5].to_bits(), bits[3:5]))
+                self.assertTrue(np.array_equal(words[7].to_bits(), bits[7:8]))
+
+    def test_xor_prefix_and_comparison(self):
+        bits = self.rng.integers(0, 2, size=(100, 15), dtype=np.uint8)
+        errors = channel.binary_symmetric(self.rng, bits.shape, 0.1)
+        words = packed.PackedCodewords.from_bits(bits)
+        received = words ^ packed.PackedCodewords.from_bits(errors)
+        self.assertTrue(np.array_equal(received.to_bits(), bits ^ errors))
+        self.assertTrue(np.array_equal(received.equal_rows(words), ~errors.any(axis=1)))
+        for length in (3, 8, 11):
+            with self.subTest(length=length):
+                prefix = received.prefix(length)
+                self.assertEqual(prefix.n, length)
+                self.assertTrue(np.array_equal(prefix.to_bits(), (bits ^ errors)[:, :length]))
+                self.assertTrue(np.array_equal(prefix.equal_rows(words.prefix(length)),
+                                               ~errors[:, :length].any(axis=1)))
+        with self.assertRaises(ValueError):
+            words ^ packed.PackedCodewords.from_bits(bits[:, :7])
+        with self.assertRaises(ValueError):
+            packed.PackedCodewords(words.data, 17)
+
+    def test_byte_tables(self):
+        matrix = self.rng.integers(0, 2, size=(21, 13), dtype=np.uint8)
+        bits = self.rng.integers(0, 2, size=(40, 21), dtype=np.uint8)
+        images = packed.apply_tables(packed.byte_tables(matrix), np.packbits(bits, axis=1))
+        self.assertTrue(np.array_equal(np.unpackbits(images, axis=1, count=13), (bits.astype(int) @ matrix) & 1))
+
+    def test_packed_codes_match_bit_codes(self):
+        codes = [bch7_4.BCH7_4(), bch15_11.BCH15_11(), bch15_7.BCH15_7(), bch15_5.BCH15_5(), bch31_6.BCH31_6(),
+                 bch127_8.BCH127_8(), bch_utils.BCHCode(63, 45), bch_utils.BCHCode(15, 7, "trapping")]
+        for code in codes:
+            with self.subTest(code=code):
+                messages = self.rng.integers(0, 2, size=(300, code.k), dtype=np.uint8)
+                received = code.encode_batch(messages) ^ channel.binary_symmetric(self.rng, (300, code.n),
+                                                                                  1.5 * code.t / code.n)
+                codewords = code.encode_packed(packed.PackedCodewords.from_bits(messages))
+                self.assertTrue(np.array_equal(codewords.to_bits(), code.encode_batch(messages)))
+                decoded, error_counts, failed = code.decode_packed(packed.PackedCodewords.from_bits(received))
+                expected, expected_counts, expected_failed = code.decode_batch(received)
+                self.assertTrue(np.array_equal(decoded.to_bits(), expected))
+                self.assertTrue(np.array_equal(error_counts, expected_counts))
+                self.assertTrue(np.array_equal(failed, expected_failed))
+
+
+if __name__ == '__main__':
+    unittest.main()
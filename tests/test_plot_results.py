@@ -0,0 +1,36 @@
+import os
+import tempfile
+import unittest
+import matplotlib
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+import bch7_4
+import plot_results
+import results_store
+import transmission_simulation
+
+
+class TestPlotResults(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.store = results_store.ResultsStore(os.path.join(directory.name, "results.db"))
+        self.addCleanup(self.store.close)
+        self.addCleanup(plt.close, "all")
+
+    def test_soft_run_keeps_decoders_apart(self):
+        histories = transmission_simulation.run_soft_sweep([bch7_4.BCH7_4()], 2.0, 1.0, 200, seed=1, store=self.store)
+        hard_history, chase_history, _ = histories[0]
+        series = plot_results.load_series(self.store, self.store.latest_run())
+        self.assertEqual(sorted(decoder for decoder, _ in series[7, 4]), ["chase2", "table"])
+
+        plt.figure()
+        plot_results.plot_curves(series, plot_results.ALL_CODES)
+        lines = {line.get_label(): line.get_ydata().tolist() for line in plt.gca().get_lines()}
+        # Curves run along the raw channel BER, which falls as Eb/N0 grows
+        self.assertEqual(lines, {"BCH(7,4), t=1 [chase2]": chase_history[::-1],
+                                 "BCH(7,4), t=1 [table]": hard_history[::-1]})
+
+
+if __name__ == '__main__':
+    unittest.main()
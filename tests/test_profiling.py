@@ -0,0 +1,81 @@
+import unittest
+import numpy as np
+import bch15_7
+import bch7_4
+import profiling
+import transmission_simulation
+
+
+class TestProfiling(unittest.TestCase):
+    def test_stages_counters_and_merge(self):
+        profile = profiling.Profile()
+        for _ in range(3):
+            with profile.stage("encode"):
+                pass
+        profile.count("words", 10)
+        other = profiling.Profile()
+        with other.stage("encode"):
+            pass
+        other.count("words", 5)
+        profile.merge(other)
+        report = profile.report()
+        self.assertEqual(report["stages"]["encode"]["calls"], 4)
+        self.assertEqual(report["counters"], {"words": 15})
+        self.assertNotIn("functions", report)
+
+    def test_count_only_reaches_the_active_profile(self):
+        profiling.count("ignored")
+        profile = profiling.Profile()
+        with profile.activate():
+            profiling.count("shifts", 2)
+        profiling.count("shifts", 7)
+        self.assertEqual(profile.counters, {"shifts": 2})
+
+    def test_trapping_decoder_counts_shifts(self):
+        code = bch15_7.BCH15_7(decoder="trapping")
+        received = code.encode_batch(np.zeros((4, 7), dtype=np.uint8))
+        received[:, 0] ^= 1
+        profile = profiling.Profile()
+        with profile.activate():
+            code.decode_batch(received)
+        self.assertEqual(profile.counters["nonzero_syndromes"], 4)
+        self.assertEqual(profile.counters["trapping_words"], 4)
+        self.assertGreater(profile.counters["trapping_shifts"], 0)
+
+    def test_profiled_sweep_reports_every_code(self):
+        sweeps = [(7, bch15_7.BCH15_7(decoder="trapping")), (7, bch15_7.BCH15_7(decoder="table")),
+                  (4, bch7_4.BCH7_4()), (15, None)]
+        report = profiling.Report(cprofile_codes=["BCH(7,4)"])
+        profiled = transmission_simulation.run_parallel_sweep(sweeps, 0.3, 0.1, 100, 3, 0.01, seed=2, workers=2,
+                                                              profile=report)
+        plain = transmission_simulation.run_parallel_sweep(sweeps, 0.3, 0.1, 100, 3, 0.01, seed=2, workers=2)
+        self.assertEqual(profiled, plain)
+
+        # The same code under two decoders keeps two reports
+        reports = report.as_dict()
+        self.assertEqual(set(reports), {"BCH(15,7) [trapping, bsc]", "BCH(15,7) [table, bsc]",
+                                        "BCH(7,4) [table, bsc]", "No encoding (k=15) [bsc]"})
+        for (k, bch_code), (success_history, _, _) in zip(sweeps, profiled):
+            code_report = reports[transmission_simulation.profile_name(k, bch_code)]
+            self.assertEqual(code_report["counters"]["words"], 100 * len(success_history))
+            expected_stages = {"messages", "channel", "compare"} | ({"encode", "decode"} if bch_code else set())
+            self.assertEqual(set(code_report["stages"]), expected_stages)
+        self.assertGreater(reports["BCH(15,7) [trapping, bsc]"]["counters"]["trapping_shifts"], 0)
+        self.assertNotIn("trapping_shifts", reports["BCH(15,7) [table, bsc]"]["counters"])
+        self.assertIn("functions", reports["BCH(7,4) [table, bsc]"])
+        self.assertNotIn("functions", reports["BCH(15,7) [trapping, bsc]"])
+
+    def test_profiled_simulation_matches_sweep_report(self):
+        code = bch15_7.BCH15_7()
+        report = profiling.Report()
+        profiled = transmission_simulation.run_simulation(7, code, 0.3, 0.1, 100, 3, 0.01, seed=2, profile=report)
+        self.assertEqual(profiled, transmission_simulation.run_simulation(7, code, 0.3, 0.1, 100, 3, 0.01, seed=2))
+        reports = report.as_dict()
+        self.assertEqual(set(reports), {"BCH(15,7) [table, bsc]"})
+        self.assertEqual(reports["BCH(15,7) [table, bsc]"]["counters"]["words"], 100 * len(profiled[0]))
+        self.assertEqual(set(reports["BCH(15,7) [table, bsc]"]["stages"]),
+                         {"messages", "encode", "channel", "decode", "compare"})
+
+
+if __name__ == '__main__':
+    unittest.main()
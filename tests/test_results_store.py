@@ -0,0 +1,45 @@
+import os
+import tempfile
+import unittest
+import bch15_7
+import results_store
+import transmission_simulation
+
+
+class TestResultsStore(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.store = results_store.ResultsStore(os.path.join(directory.name, "results.db"))
+        self.addCleanup(self.store.close)
+
+    def test_curves_are_not_padded(self):
+        sweeps = [(7, bch15_7.BCH15_7()), (15, None)]
+        histories = transmission_simulation.run_parallel_sweep(sweeps, 0.7, 0.05, 200, 3, 0.01, seed=5, workers=2,
+                                                               store=self.store)
+        run_id = self.store.latest_run()
+        self.assertEqual(self.store.runs()[0]["seed"], "5")
+        for (k, bch_code), (success_history, ber_history, interval_history) in zip(sweeps, histories):
+            curve = self.store.load_curve(getattr(bch_code, "n", k), k, run_id=run_id)
+            self.assertEqual(curve["ber"].tolist(), [round(ber, 10) for ber in ber_history])
+            self.assertEqual(curve["rate"].tolist(), success_history)
+            self.assertEqual(list(zip(curve["low"], curve["high"])), interval_history)
+            self.assertTrue((curve["trials"] == 200).all())
+            self.assertEqual((curve["successes"] / curve["trials"]).tolist(), success_history)
+
+    def test_runs_are_kept_apart(self):
+        sweeps = [(7, bch15_7.BCH15_7())]
+        for seed in (1, 2):
+            transmission_simulation.run_stratified_sweep(sweeps, 0.3, 0.1, 100, 3, 0.01, seed=seed, store=self.store)
+        curves = self.store.load_curves(15, 7, decoder="table")
+        self.assertEqual(len(curves), 2)
+        self.assertEqual([run["id"] for run in self.store.runs(n=15, k=7)], sorted(curves, reverse=True))
+        self.assertEqual(len(self.store.runs(seed=2)), 1)
+        self.assertEqual(self.store.load_curve(15, 7)["run_id"], max(curves))
+        self.assertEqual(len(self.store.load_curve(15, 7, decoder="algebraic")["ber"]), 0)
+        self.assertTrue(all(curve["trials"].size and (curve["trials"] != curve["trials"]).all()
+                            for curve in curves.values()))
+
+
+if __name__ == '__main__':
+    unittest.main()
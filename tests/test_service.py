@@ -0,0 +1,137 @@
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+import unittest
+from unittest import mock
+import numpy as np
+import bch15_7
+import bch31_6
+import channel
+import service
+
+
+def bit_string(bits):
+    return "".join(str(int(bit)) for bit in bits)
+
+
+class SlowDecoder(bch15_7.BCH15_7):
+    delay = 0.0
+
+    def decode_batch(self, received):
+        time.sleep(self.delay)
+        return super().decode_batch(received)
+
+
+class TestService(unittest.TestCase):
+    def setUp(self):
+        self.rng = np.random.default_rng(0)
+
+    def test_concurrent_requests_are_batched(self):
+        code = bch15_7.BCH15_7()
+        messages = self.rng.integers(0, 2, size=(200, code.k), dtype=np.uint8)
+        received = code.encode_batch(messages) ^ channel.fixed_weight(self.rng, (200, code.n), 2)
+
+        async def run():
+            codec = service.CodecService([bch15_7.BCH15_7(), bch31_6.BCH31_6()], max_batch=64, max_delay=0.05)
+            encoded = await asyncio.gather(*[codec.handle({"id": i, "op": "encode", "code": "15,7",
+                                                           "bits": bit_string(message)})
+                                             for i, message in enumerate(messages)])
+            decoded = await asyncio.gather(*[codec.handle({"id": i, "op": "decode", "code": "BCH(15,7)",
+                                                           "bits": bit_string(word)})
+                                             for i, word in enumerate(received)])
+            return encoded, decoded, codec.stats()
+
+        encoded, decoded, stats = asyncio.run(run())
+        for i, message in enumerate(messages):
+            self.assertEqual(encoded[i], {"id": i, "bits": bit_string(code.encode(message))})
+            self.assertEqual(decoded[i]["bits"], encoded[i]["bits"])
+            self.assertEqual(decoded[i]["errors"], 2)
+            self.assertFalse(decoded[i]["failed"])
+        for operation in ("encode", "decode"):
+            with self.subTest(operation=operation):
+                entry = stats[f"15,7/{operation}"]
+                self.assertEqual(entry["requests"], 200)
+                self.assertLessEqual(entry["batches"], 8)
+                self.assertEqual(entry["queue_depth"], 0)
+                self.assertLessEqual(entry["latency_ms"]["p50"], entry["latency_ms"]["p99"])
+
+    def test_bad_requests(self):
+        async def run(requests):
+            codec = service.CodecService([bch15_7.BCH15_7()])
+            return [await codec.handle_line(request) for request in requests]
+
+        responses = asyncio.run(run(['{"id": 1, "op": "encode", "code": "31,6", "bits": "010101"}',
+                                     '{"id": 2, "op": "encode", "code": "15,7", "bits": "0101"}',
+                                     '{"id": 3, "op": "transmit"}', '[1, 2]', 'not json']))
+        self.assertEqual([response["id"] for response in responses], [1, 2, 3, None, None])
+        self.assertTrue(all("error" in response for response in responses))
+
+    def test_slow_batch_does_not_block_other_batchers(self):
+        async def run():
+            slow = SlowDecoder()
+            codec = service.CodecService([slow, bch31_6.BCH31_6()], max_delay=0.001)
+            slow.delay = 0.5
+            decode = asyncio.create_task(codec.handle({"id": 1, "op": "decode", "code": "15,7", "bits": "0" * 15}))
+            await asyncio.sleep(0.05)
+            start = time.perf_counter()
+            encoded = await codec.handle({"id": 2, "op": "encode", "code": "31,6", "bits": "101010"})
+            elapsed = time.perf_counter() - start
+            self.assertFalse(decode.done())
+            return encoded, elapsed, await decode
+
+        encoded, elapsed, decoded = asyncio.run(run())
+        self.assertEqual(encoded["bits"][:6], "101010")
+        self.assertLess(elapsed, 0.3)
+        self.assertEqual(decoded, {"id": 1, "bits": "0" * 15, "errors": 0, "failed": False})
+
+    def test_unix_socket(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        path = os.path.join(directory.name, "codec.sock")
+        code = bch15_7.BCH15_7()
+        messages = self.rng.integers(0, 2, size=(20, code.k), dtype=np.uint8)
+
+        async def run():
+            ready = asyncio.Event()
+            server = asyncio.create_task(service.serve_unix(service.CodecService([code]), path, ready))
+            await ready.wait()
+            reader, writer = await asyncio.open_unix_connection(path)
+            for i, message in enumerate(messages):
+                writer.write(json.dumps({"id": i, "op": "encode", "code": "15,7",
+                                         "bits": bit_string(message)}).encode() + b"\n")
+            writer.write(b'{"id": "stats", "op": "stats"}\n')
+            await writer.drain()
+            responses = [json.loads(await reader.readline()) for _ in range(len(messages) + 1)]
+            writer.close()
+            server.cancel()
+            return {response["id"]: response for response in responses}
+
+        responses = asyncio.run(run())
+        for i, message in enumerate(messages):
+            self.assertEqual(responses[i]["bits"], bit_string(code.encode(message)))
+        self.assertIn("stats", responses["stats"])
+
+    def test_stdio(self):
+        code = bch15_7.BCH15_7()
+        messages = self.rng.integers(0, 2, size=(20, code.k), dtype=np.uint8)
+        requests = b"".join(json.dumps({"id": i, "op": "encode", "code": "15,7",
+                                        "bits": bit_string(message)}).encode() + b"\n"
+                            for i, message in enumerate(messages))
+        stdin_read, stdin_write = os.pipe()
+        stdout_read, stdout_write = os.pipe()
+        os.write(stdin_write, requests)
+        os.close(stdin_write)
+        with open(stdin_read, 'rb') as stdin, open(stdout_write, 'wb') as stdout, \
+                mock.patch.object(sys, "stdin", stdin), mock.patch.object(sys, "stdout", stdout):
+            asyncio.run(service.serve_stdio(service.CodecService([code])))
+        with open(stdout_read, 'rb') as output:
+            responses = {response["id"]: response for response in map(json.loads, output)}
+        for i, message in enumerate(messages):
+            self.assertEqual(responses[i]["bits"], bit_string(code.encode(message)))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,69 @@
+import unittest
+from multiprocessing import shared_memory
+import numpy as np
+import bch15_7
+import shared_tables
+
+BUILDS = []
+
+
+@shared_tables.table
+def squares(size):
+    BUILDS.append(size)
+    return np.arange(size) ** 2, np.arange(size, dtype=np.uint8)
+
+
+class TestSharedTables(unittest.TestCase):
+    def setUp(self):
+        BUILDS.clear()
+        shared_tables._tables.pop(squares.key(10), None)
+
+    def test_table_is_cached(self):
+        self.assertIs(squares(10), squares(10))
+        self.assertEqual(BUILDS, [10])
+
+    def test_publish_and_attach(self):
+        expected = squares(10)
+        with shared_tables.Publisher() as publisher:
+            publisher.publish(squares, 10)
+            published = squares(10)
+            self.assertIsNot(published, expected)
+            self.assertFalse(published[0].flags.writeable)
+
+            # A fresh worker maps the blocks instead of building the table
+            shared_tables._tables.pop(squares.key(10))
+            shared_tables.attach(publisher.handles)
+            attached = squares(10)
+            self.assertEqual(BUILDS, [10])
+            for expected_part, attached_part in zip(expected, attached):
+                self.assertEqual(attached_part.dtype, expected_part.dtype)
+                self.assertTrue(np.array_equal(attached_part, expected_part))
+                self.assertFalse(attached_part.flags.writeable)
+            names = [name for name, _, _ in publisher.handles[squares.key(10)][0]]
+
+        # Closing unlinks the blocks and the next call builds the table again
+        for name in names:
+            with self.assertRaises(FileNotFoundError):
+                shared_memory.SharedMemory(name=name)
+        squares(10)
+        self.assertEqual(BUILDS, [10, 10])
+
+    def test_decoding_with_published_tables(self):
+        code = bch15_7.BCH15_7(decoder="table")
+        received = np.random.default_rng(0).integers(0, 2, (200, code.n), dtype=np.uint8)
+        expected = code.decode_batch(received)
+        with shared_tables.Publisher() as publisher:
+            code.publish_tables(publisher)
+            self.assertEqual(len(publisher.handles), 2)
+            actual = code.decode_batch(received)
+        for expected_part, actual_part in zip(expected, actual):
+            self.assertTrue(np.array_equal(expected_part, actual_part))
+
+    def test_other_decoders_publish_nothing(self):
+        with shared_tables.Publisher() as publisher:
+            bch15_7.BCH15_7(decoder="trapping").publish_tables(publisher)
+            self.assertEqual(publisher.handles, {})
+
+
+if __name__ == '__main__':
+    unittest.main()
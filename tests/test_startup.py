@@ -0,0 +1,34 @@
+import json
+import os
+import subprocess
+import sys
+import unittest
+
+# Seconds the code modules may take to import in a fresh interpreter; numpy alone takes about a tenth of that
+IMPORT_BUDGET = 1.0
+HEAVY_MODULES = ("galois", "numba", "pyinputplus", "matplotlib")
+
+SCRIPT = """
+import json, sys, time
+start_time = time.perf_counter()
+import bch127_8, bch15_11, bch15_5, bch15_7, bch31_6, bch7_4, transcoder
+elapsed = time.perf_counter() - start_time
+codeword = bch15_7.encode([1, 0, 1, 1, 0, 0, 1])
+print(json.dumps({"seconds": elapsed, "modules": sorted(sys.modules)}))
+"""
+
+
+class TestStartup(unittest.TestCase):
+    def test_core_imports_are_lean(self):
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        # Best of a few runs, so a busy machine does not fail the budget on one slow start
+        results = [json.loads(subprocess.run([sys.executable, "-c", SCRIPT], cwd=root, capture_output=True,
+                                             text=True, check=True).stdout) for _ in range(3)]
+        for module in HEAVY_MODULES:
+            with self.subTest(module=module):
+                self.assertNotIn(module, results[0]["modules"])
+        self.assertLess(min(result["seconds"] for result in results), IMPORT_BUDGET)
+
+
+if __name__ == '__main__':
+    unittest.main()
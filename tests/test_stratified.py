@@ -0,0 +1,48 @@
+import math
+import unittest
+import numpy as np
+import bch15_5
+import bch15_7
+import stratified
+import transmission_simulation
+
+
+class TestStratified(unittest.TestCase):
+    def setUp(self):
+        self.bers = np.array([0.0, 0.05, 0.1, 0.2, 0.4])
+
+    def test_binomial_weights(self):
+        probabilities = stratified.binomial_weights(15, [0.0, 0.3, 1.0])
+        self.assertTrue(np.allclose(probabilities.sum(axis=1), 1.0))
+        self.assertEqual(probabilities[0, 0], 1.0)
+        self.assertEqual(probabilities[2, 15], 1.0)
+        self.assertAlmostEqual(probabilities[1, 1], 15 * 0.3 * 0.7 ** 14)
+
+    def test_bounded_distance_closed_form(self):
+        code = bch15_7.BCH15_7()
+        rates, intervals = stratified.success_curve(code.k, code, self.bers)
+        expected = [sum(math.comb(15, i) * p ** i * (1 - p) ** (15 - i) for i in range(3)) for p in self.bers]
+        for ber, rate in zip(self.bers, rates):
+            with self.subTest(ber=ber):
+                successes, trials, _ = transmission_simulation.run_point(code.k, code, ber, 20000, 1)
+                self.assertAlmostEqual(rate, successes / trials, delta=0.015)
+        self.assertTrue(np.array_equal(intervals[:, 0], rates))
+        self.assertTrue(np.allclose(rates, expected))
+
+    def test_weight_stratified_estimate_matches_monte_carlo(self):
+        # Error trapping is not bounded-distance for BCH(15,5), so this goes through the sampled path
+        code = bch15_5.BCH15_5(decoder="trapping")
+        rates, intervals = stratified.success_curve(code.k, code, self.bers, samples_per_weight=200, seed=0)
+        self.assertTrue(np.all(intervals[:, 0] <= rates) and np.all(rates <= intervals[:, 1]))
+        exact = stratified.success_curve(code.k, bch15_5.BCH15_5(), self.bers)[0]
+        # Trapping misses some weight-3 patterns, so it can only do worse than the bounded-distance decoder
+        self.assertTrue(np.all(rates <= exact + 1e-12))
+        self.assertAlmostEqual(rates[2], exact[2], delta=0.02)
+
+    def test_uncoded_baseline(self):
+        rates, _ = stratified.success_curve(7, None, self.bers)
+        self.assertTrue(np.allclose(rates, (1 - self.bers) ** 7))
+
+
+if __name__ == '__main__':
+    unittest.main()
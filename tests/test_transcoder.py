@@ -0,0 +1,101 @@
+import io
+import os
+import tempfile
+import unittest
+import numpy as np
+import bch15_5
+import bch15_7
+import bch31_6
+import bch7_4
+import transcoder
+
+
+def encode_bytes(code, data, chunk_blocks=transcoder.CHUNK_BLOCKS):
+    output = io.BytesIO()
+    stats = transcoder.encode_stream(code, io.BytesIO(data).read, output.write, chunk_blocks)
+    return output.getvalue(), stats
+
+
+def decode_bytes(stream):
+    output = io.BytesIO()
+    stats = transcoder.decode_stream(io.BytesIO(stream).read, output.write)
+    return output.getvalue(), stats
+
+
+class TestTranscoder(unittest.TestCase):
+    def setUp(self):
+        self.rng = np.random.default_rng(0)
+
+    def test_round_trip_with_padding_and_several_frames(self):
+        for code in (bch7_4.BCH7_4(), bch15_7.BCH15_7(), bch15_5.BCH15_5(), bch31_6.BCH31_6()):
+            for length in (0, 1, 3, 100, 1001):
+                with self.subTest(code=code, length=length):
+                    data = self.rng.integers(0, 256, size=length, dtype=np.uint8).tobytes()
+                    stream, stats = encode_bytes(code, data, chunk_blocks=16)
+                    # 16 blocks per frame read 2k bytes at a time, only the last frame is padded
+                    chunks = [data[offset:offset + 2 * code.k] for offset in range(0, length, 2 * code.k)]
+                    self.assertEqual(stats["blocks"], sum(-(-8 * len(chunk) // code.k) for chunk in chunks))
+                    decoded, decode_stats = decode_bytes(stream)
+                    self.assertEqual(decoded, data)
+                    self.assertEqual(decode_stats["blocks"], stats["blocks"])
+                    self.assertEqual(decode_stats["uncorrectable_blocks"], 0)
+
+    def test_frame_bit_count_fits_uint32(self):
+        # 2^30 blocks of BCH(7,4) read 2^29 bytes per frame, 2^32 bits; eight blocks fewer is the largest that fits
+        code = bch7_4.BCH7_4()
+        data = b"frame"
+        stream, _ = encode_bytes(code, data, chunk_blocks=2 ** 30 - 8)
+        self.assertEqual(decode_bytes(stream)[0], data)
+        output = io.BytesIO()
+        with self.assertRaises(ValueError):
+            transcoder.encode_stream(code, io.BytesIO(data).read, output.write, 2 ** 30)
+        self.assertEqual(output.getvalue(), b"")
+
+    def test_corrected_and_uncorrectable_blocks(self):
+        code = bch15_7.BCH15_7()
+        data = self.rng.integers(0, 256, size=700, dtype=np.uint8).tobytes()
+        stream, stats = encode_bytes(code, data)
+        header = transcoder._HEADER.size + transcoder._FRAME.size
+        bits = np.unpackbits(np.frombuffer(stream[header:-transcoder._FRAME.size], dtype=np.uint8))
+
+        # One flipped bit in each of the first 100 codewords is always corrected
+        single = bits.copy()
+        single[np.arange(100) * code.n + 3] ^= 1
+        decoded, decode_stats = decode_bytes(stream[:header] + np.packbits(single).tobytes() +
+                                             stream[-transcoder._FRAME.size:])
+        self.assertEqual(decoded, data)
+        self.assertEqual(decode_stats["corrected_blocks"], 100)
+        self.assertEqual(decode_stats["corrected_bits"], 100)
+
+        # t + 1 flips in one word are either flagged or miscorrected, never passed through as clean
+        burst = bits.copy()
+        burst[:code.t + 1] ^= 1
+        _, decode_stats = decode_bytes(stream[:header] + np.packbits(burst).tobytes() +
+                                       stream[-transcoder._FRAME.size:])
+        self.assertEqual(decode_stats["corrected_blocks"] + decode_stats["uncorrectable_blocks"], 1)
+
+    def test_rejects_foreign_and_truncated_streams(self):
+        stream, _ = encode_bytes(bch7_4.BCH7_4(), b"telemetry")
+        with self.assertRaises(ValueError):
+            decode_bytes(b"XXXX" + stream[4:])
+        with self.assertRaises(ValueError):
+            decode_bytes(stream[:-1])
+
+    def test_files_through_mmap(self):
+        data = self.rng.integers(0, 256, size=5000, dtype=np.uint8).tobytes()
+        with tempfile.TemporaryDirectory() as directory:
+            paths = [os.path.join(directory, name) for name in ("input", "encoded", "decoded", "empty")]
+            with open(paths[0], 'wb') as file:
+                file.write(data)
+            open(paths[3], 'wb').close()
+            for source in (paths[0], paths[3]):
+                with transcoder.open_input(source) as read, transcoder.open_output(paths[1]) as write:
+                    transcoder.encode_stream(bch15_7.BCH15_7(), read, write)
+                with transcoder.open_input(paths[1]) as read, transcoder.open_output(paths[2]) as write:
+                    transcoder.decode_stream(read, write)
+                with open(source, 'rb') as expected, open(paths[2], 'rb') as decoded:
+                    self.assertEqual(decoded.read(), expected.read())
+
+
+if __name__ == '__main__':
+    unittest.main()
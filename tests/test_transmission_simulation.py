@@ -0,0 +1,110 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+import bch15_7
+import bch7_4
+import transmission_simulation
+
+
+class TestTransmissionSimulation(unittest.TestCase):
+    def setUp(self):
+        self.sweeps = [(7, bch15_7.BCH15_7()), (4, bch7_4.BCH7_4()), (15, None)]
+
+    def test_parallel_sweep_is_independent_of_worker_count(self):
+        single = transmission_simulation.run_parallel_sweep(self.sweeps, 0.7, 0.05, 500, 3, 0.01, seed=3, workers=1)
+        several = transmission_simulation.run_parallel_sweep(self.sweeps, 0.7, 0.05, 500, 3, 0.01, seed=3, workers=3)
+        self.assertEqual(single, several)
+
+    def test_parallel_sweep_matches_sequential_runs(self):
+        histories = transmission_simulation.run_parallel_sweep(self.sweeps, 0.7, 0.05, 500, 3, 0.01, seed=3,
+                                                               workers=2)
+        for sweep, (k, bch_code) in enumerate(self.sweeps):
+            with self.subTest(sweep=sweep):
+                expected = transmission_simulation.run_simulation(
+                    k, bch_code, 0.7, 0.05, 500, 3, 0.01, seed=transmission_simulation.child_seed(3, sweep))
+                self.assertEqual(histories[sweep], expected)
+
+    def test_early_stopping_truncates_sweep(self):
+        success_history, ber_history, interval_history = transmission_simulation.run_parallel_sweep(
+            [(15, None)], 0.7, 0.05, 500, 3, 0.01, seed=3, workers=2)[0]
+        self.assertEqual(len(success_history), len(ber_history))
+        self.assertEqual(len(success_history), len(interval_history))
+        self.assertLess(len(ber_history), len(transmission_simulation.ber_grid(0.7, 0.05)))
+        self.assertTrue(all(rate <= 0.01 for rate in success_history[-3:]))
+
+    def test_pool_context_falls_back_to_spawn(self):
+        # Platforms without a fork server, such as Windows, spawn the workers instead
+        with mock.patch("multiprocessing.get_all_start_methods", return_value=["spawn"]):
+            self.assertEqual(transmission_simulation.pool_context().get_start_method(), "spawn")
+            histories = transmission_simulation.run_parallel_sweep(self.sweeps[:1], 0.2, 0.1, 100, 3, 0.01, seed=3,
+                                                                   workers=1)
+        expected = transmission_simulation.run_simulation(*self.sweeps[0], 0.2, 0.1, 100, 3, 0.01,
+                                                          seed=transmission_simulation.child_seed(3, 0))
+        self.assertEqual(histories, [expected])
+
+    def test_wilson_interval(self):
+        low, high = transmission_simulation.wilson_interval(50, 100)
+        self.assertAlmostEqual(low, 0.4038, places=4)
+        self.assertAlmostEqual(high, 0.5962, places=4)
+        low, high = transmission_simulation.wilson_interval(100, 100)
+        self.assertLess(low, 1.0)
+        self.assertAlmostEqual(high, 1.0)
+
+    def test_adaptive_budget(self):
+        code = bch15_7.BCH15_7()
+        # A rate pinned at 1 needs a single batch, a rate near 0.5 needs many
+        _, easy_trials, _ = transmission_simulation.run_point(7, code, 0.0, 200, 1, ci_width=0.02,
+                                                              max_sample_size=50000)
+        successes, hard_trials, _ = transmission_simulation.run_point(7, code, 0.2, 200, 1, ci_width=0.02,
+                                                                      max_sample_size=50000)
+        low, high = transmission_simulation.wilson_interval(successes, hard_trials)
+        self.assertEqual(easy_trials, 200)
+        self.assertGreater(hard_trials, 5000)
+        self.assertLessEqual(high - low, 0.02)
+        _, capped_trials, _ = transmission_simulation.run_point(7, code, 0.2, 200, 1, ci_width=0.02,
+                                                                max_sample_size=1000)
+        self.assertEqual(capped_trials, 1000)
+
+    def test_checkpoint_resume_and_top_up(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "checkpoint.jsonl")
+            complete = transmission_simulation.run_parallel_sweep(self.sweeps, 0.7, 0.05, 200, 3, 0.01, seed=3,
+                                                                  workers=2, checkpoint=path)
+            with open(path) as file:
+                lines = file.readlines()
+            # Points past the early stop may also have finished before the stop was known
+            self.assertGreaterEqual(len(lines), sum(len(history[0]) for history in complete))
+
+            # A run killed after a few points resumes from them, with the seed taken from the checkpoint
+            with open(path, 'w') as file:
+                file.writelines(lines[:4])
+            resumed = transmission_simulation.run_parallel_sweep(self.sweeps, 0.7, 0.05, 200, 3, 0.01, seed=None,
+                                                                 workers=2, checkpoint=path)
+            self.assertEqual(resumed, complete)
+
+            # A larger budget only tops up the stored points, and the topped-up run is itself resumable
+            topped_up = transmission_simulation.run_parallel_sweep(self.sweeps, 0.7, 0.05, 500, 3, 0.01, seed=3,
+                                                                   workers=2, checkpoint=path)
+            records = transmission_simulation.load_checkpoint(path)
+            for (k, bch_code), (_, ber_history, _) in zip(self.sweeps, topped_up):
+                for ber in ber_history:
+                    self.assertEqual(records[transmission_simulation.checkpoint_key(k, bch_code, ber)]["trials"], 500)
+            self.assertEqual(transmission_simulation.run_parallel_sweep(
+                self.sweeps, 0.7, 0.05, 500, 3, 0.01, seed=3, workers=2, checkpoint=path), topped_up)
+
+            with self.assertRaises(ValueError):
+                transmission_simulation.run_parallel_sweep(self.sweeps, 0.7, 0.05, 500, 3, 0.01, seed=4,
+                                                           workers=2, checkpoint=path)
+
+            # Neither another BER grid nor another set of codes resumes it
+            with self.assertRaises(ValueError):
+                transmission_simulation.run_parallel_sweep(self.sweeps, 0.5, 0.05, 500, 3, 0.01, workers=2,
+                                                           checkpoint=path)
+            with self.assertRaises(ValueError):
+                transmission_simulation.run_parallel_sweep(self.sweeps[:1], 0.7, 0.05, 500, 3, 0.01, workers=2,
+                                                           checkpoint=path)
+
+
+if __name__ == '__main__':
+    unittest.main()
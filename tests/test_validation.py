@@ -0,0 +1,27 @@
+import unittest
+import bch15_5
+import bch15_7
+import validation
+
+
+class TestValidation(unittest.TestCase):
+    def test_table_decoder_has_no_mismatches(self):
+        report = validation.validate(bch15_7.BCH15_7(), message_count=2000, batch_size=500, seed=0)
+        self.assertEqual(report["encode_mismatches"], 0)
+        self.assertEqual(report["decode_mismatches"], 0)
+        self.assertEqual(report["failures"], [])
+
+    def test_reports_minimal_failing_cases(self):
+        # Error trapping misses weight-3 patterns that do not fit in an n-k window, e.g. positions 1, 6, 11
+        report = validation.validate(bch15_5.BCH15_5(decoder="trapping"), message_count=2000, batch_size=500,
+                                     max_weight=3, seed=0, max_failures=3)
+        self.assertGreater(report["decode_mismatches"], 0)
+        self.assertLessEqual(len(report["failures"]), 3)
+        for case in report["failures"]:
+            self.assertEqual(case["stage"], "decode")
+            self.assertEqual(case["error_weight"], 3)
+            self.assertIsNone(case["ours"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,132 @@
+import argparse
+import contextlib
+import mmap
+import os
+import struct
+import sys
+import time
+
+import numpy as np
+
+import bch_utils
+
+# Stream layout: header (magic, n, k), then frames of (uint32 message bit count, packed n-bit codewords). The
+# last message of a frame is zero padded to k bits, and a frame with a bit count of 0 ends the stream
+MAGIC = b"BCHS"
+_HEADER = struct.Struct("<4sHH")
+_FRAME = struct.Struct("<I")
+MAX_FRAME_BITS = 2 ** 32 - 1
+CHUNK_BLOCKS = 65536
+
+
+def _read_exactly(read, size):
+    data = read(size)
+    if len(data) != size:
+        raise ValueError(f"Truncated BCH stream: expected {size} bytes, got {len(data)}")
+    return data
+
+
+def encode_stream(code, read, write, chunk_blocks=CHUNK_BLOCKS):
+    # read(size) and write(data) work like file methods. Chunks hold a whole number of k-bit messages, so only
+    # the final frame is padded and memory stays bounded by chunk_blocks codewords
+    chunk_bytes = code.k * ((chunk_blocks + 7) // 8)
+    if 8 * chunk_bytes > MAX_FRAME_BITS:
+        # The frame's bit count would not fit its uint32 field
+        raise ValueError(f"{chunk_blocks} blocks of BCH({code.n},{code.k}) hold more than {MAX_FRAME_BITS} message "
+                         f"bits per frame, use fewer chunk blocks")
+    write(_HEADER.pack(MAGIC, code.n, code.k))
+    total_bytes = 0
+    blocks = 0
+    while True:
+        chunk = read(chunk_bytes)
+        if not chunk:
+            break
+        bits = np.unpackbits(np.frombuffer(chunk, dtype=np.uint8))
+        frame_blocks = -(-len(bits) // code.k)
+        messages = np.zeros(frame_blocks * code.k, dtype=np.uint8)
+        messages[:len(bits)] = bits
+        codewords = code.encode_batch(messages.reshape(frame_blocks, code.k))
+        write(_FRAME.pack(len(bits)))
+        write(np.packbits(codewords.reshape(-1)).tobytes())
+        total_bytes += len(chunk)
+        blocks += frame_blocks
+    write(_FRAME.pack(0))
+    return {"code": f"BCH({code.n},{code.k})", "bytes": total_bytes, "blocks": blocks}
+
+
+def decode_stream(read, write, decoder=None):
+    # The code comes from the stream header. Uncorrectable blocks are passed through with their received
+    # message bits, the codes are systematic
+    magic, n, k = _HEADER.unpack(_read_exactly(read, _HEADER.size))
+    if magic != MAGIC:
+        raise ValueError("Not a BCH stream: bad magic bytes")
+    code = bch_utils.BCHCode(n, k, decoder=decoder)
+    stats = {"code": f"BCH({n},{k})", "decoder": code.decoder, "bytes": 0, "blocks": 0, "corrected_blocks": 0,
+             "corrected_bits": 0, "uncorrectable_blocks": 0}
+    while True:
+        (bit_count,) = _FRAME.unpack(_read_exactly(read, _FRAME.size))
+        if bit_count == 0:
+            return stats
+        frame_blocks = -(-bit_count // k)
+        packed = np.frombuffer(_read_exactly(read, -(-frame_blocks * n // 8)), dtype=np.uint8)
+        received = np.unpackbits(packed, count=frame_blocks * n).reshape(frame_blocks, n)
+        corrected, error_counts, failed = code.decode_batch(received)
+        write(np.packbits(corrected[:, :k].reshape(-1)[:bit_count]).tobytes())
+        stats["bytes"] += bit_count // 8
+        stats["blocks"] += frame_blocks
+        stats["corrected_blocks"] += int(np.count_nonzero(error_counts))
+        stats["corrected_bits"] += int(error_counts.sum())
+        stats["uncorrectable_blocks"] += int(np.count_nonzero(failed))
+
+
+@contextlib.contextmanager
+def open_input(path):
+    # read(size) over a memory-mapped file, or over stdin for '-'. Empty files cannot be mapped
+    if path == "-":
+        yield sys.stdin.buffer.read
+        return
+    with open(path, 'rb') as file:
+        if os.fstat(file.fileno()).st_size == 0:
+            yield file.read
+            return
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            yield mapped.read
+
+
+@contextlib.contextmanager
+def open_output(path):
+    if path == "-":
+        yield sys.stdout.buffer.write
+        sys.stdout.buffer.flush()
+        return
+    with open(path, 'wb') as file:
+        yield file.write
+
+
+def main():
+    parser = argparse.ArgumentParser(description="BCH encode or decode any file or stdin in large chunks")
+    parser.add_argument("mode", choices=("encode", "decode"))
+    parser.add_argument("input", help="input file, - for stdin")
+    parser.add_argument("output", help="output file, - for stdout")
+    parser.add_argument("--code", default="15,7", help="n,k of the code to encode with")
+    parser.add_argument("--decoder", choices=bch_utils.DECODERS, default=None)
+    parser.add_argument("--chunk-blocks", type=int, default=CHUNK_BLOCKS, help="codewords per frame")
+    args = parser.parse_args()
+
+    start_time = time.perf_counter()
+    with open_input(args.input) as read, open_output(args.output) as write:
+        if args.mode == "encode":
+            n, k = (int(value) for value in args.code.split(","))
+            stats = encode_stream(bch_utils.BCHCode(n, k, decoder=args.decoder), read, write, args.chunk_blocks)
+        else:
+            stats = decode_stream(read, write, args.decoder)
+    elapsed = time.perf_counter() - start_time
+
+    # Statistics go to stderr so they never mix with a stream written to stdout
+    summary = " | ".join(f"{name.replace('_', ' ').capitalize()}: {value}" for name, value in stats.items())
+    print(f"{summary} | Time: {elapsed:.3f}s | {stats['bytes'] / max(elapsed, 1e-9) / 1e6:.1f} MB/s",
+          file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,9 @@
-import csv
+import json
+import multiprocessing
 import numpy as np
-import random
+import os
 import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
 
 import bch127_8
 import bch15_11
@@ -9,82 +11,477 @@ import bch15_5
 import bch15_7
 import bch31_6
 import bch7_4
+import channel
+import chase
 import config
+import interleaver
+import packed
+import profiling
+import results_store
+import shared_tables
+import stratified
 
 
-def flip_random_bits(input_data, error_count=1):
-    flipped_data = input_data.copy()
-    data_length = len(flipped_data)
-    if error_count > data_length:
-        raise ValueError("Not enough unique numbers in the specified range.")
+_default_rng = channel.generator()
 
-    flip_indexes = random.sample(range(0, data_length), error_count)
-    for index in flip_indexes:
-        flipped_data[index] ^= 1
 
-    return flipped_data
+def pool_context():
+    # Forking a process that already ran galois' numba kernels can hang, so workers come from a fork server that
+    # only imported this module, or are spawned where there is none (Windows)
+    if "forkserver" not in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("spawn")
+    context = multiprocessing.get_context("forkserver")
+    context.set_forkserver_preload(["transmission_simulation"])
+    return context
 
 
-def introduce_error(input_data, ber=0.1):
-    errors = input_data.copy()
-    for i in range(len(errors)):
-        if random.random() <= ber:
-            errors[i] ^= 1
-    return errors
+def flip_random_bits(input_data, error_count=1, rng=None):
+    input_data = np.asarray(input_data)
+    mask = channel.fixed_weight(rng or _default_rng, input_data.shape, error_count)
+    return input_data ^ mask
 
 
-def run_simulation(k, bch_code=None, max_ber=1.0, ber_step=0.05, sample_size=100, patience_count=5,
-                   patience_threshold=0.0):
-    success_history = []
-    ber_history = []
-    current_step = 0
-    ber = 0.0
+def introduce_error(input_data, ber=0.1, rng=None):
+    input_data = np.asarray(input_data)
+    return input_data ^ channel.binary_symmetric(rng or _default_rng, input_data.shape, ber)
+
 
+def ber_grid(max_ber=1.0, ber_step=0.05):
+    bers = []
+    ber = 0.0
     while round(ber, 10) <= max_ber:
-        start_time = time.perf_counter()
-        success_count = 0
+        bers.append(ber)
+        ber += ber_step
+    return bers
+
+
+def child_seed(seed, index):
+    # The index-th child of seed, like SeedSequence.spawn but without depending on how often spawn was called
+    parent = seed if isinstance(seed, np.random.SeedSequence) else np.random.SeedSequence(seed)
+    return np.random.SeedSequence(parent.entropy, spawn_key=parent.spawn_key + (index,),
+                                  pool_size=parent.pool_size)
+
+
+def simulate_point(k, bch_code, ber, sample_size, seed=None, profile=None, link=None):
+    # profile is an optional profiling.Profile that accumulates the time of every stage. link is an optional
+    # channel.Link (interleaver and burst channel); without one every bit flips independently
+    start_time = time.perf_counter()
+    rng = np.random.default_rng(seed)
+
+    # Words travel packed eight bits to a byte. Messages are drawn as one byte per bit and packed, channel errors
+    # are drawn and packed in bounded chunks; only a link's channel sees whole unpacked words
+    with profiling.stage(profile, "messages"):
+        message_bits = rng.integers(0, 2, size=(sample_size, k), dtype=np.uint8)
+        messages = packed.PackedCodewords.from_bits(message_bits)
+    if bch_code is not None:
+        with profiling.stage(profile, "encode"):
+            codewords = bch_code.encode_packed(messages)
+        with profiling.stage(profile, "channel"):
+            if link is None:
+                errors = channel.binary_symmetric_packed(rng, sample_size, bch_code.n, ber)
+                received = codewords ^ packed.PackedCodewords(errors, bch_code.n)
+            else:
+                received = packed.PackedCodewords.from_bits(link.transmit(rng, codewords.to_bits(), ber))
+        with profiling.stage(profile, "decode"):
+            decoded, _, failed = bch_code.decode_packed(received)
+        with profiling.stage(profile, "compare"):
+            success_count = int(np.count_nonzero(~failed & decoded.prefix(k).equal_rows(messages)))
+        if profile is not None:
+            profile.count("decoder_failures", int(np.count_nonzero(failed)))
+    else:
+        with profiling.stage(profile, "channel"):
+            if link is None:
+                errors = packed.PackedCodewords(channel.binary_symmetric_packed(rng, sample_size, k, ber), k)
+            else:
+                errors = packed.PackedCodewords.from_bits(link.transmit(rng, message_bits, ber)) ^ messages
+        with profiling.stage(profile, "compare"):
+            success_count = int(np.count_nonzero(errors.weights() == 0))
+    if profile is not None:
+        profile.count("words", sample_size)
+
+    return success_count, time.perf_counter() - start_time
+
+
+def wilson_interval(successes, trials, z=1.96):
+    # Wilson score interval for a binomial proportion; stays inside [0, 1] and is sane at 0 and 1
+    if trials == 0:
+        return 0.0, 1.0
+    rate = successes / trials
+    denominator = 1 + z ** 2 / trials
+    center = (rate + z ** 2 / (2 * trials)) / denominator
+    half_width = z * (rate * (1 - rate) / trials + z ** 2 / (4 * trials ** 2)) ** 0.5 / denominator
+    return max(0.0, center - half_width), min(1.0, center + half_width)
+
+
+def budget_met(successes, trials, sample_size, ci_width=None, max_sample_size=None, z=1.96):
+    # Fixed budget of sample_size trials when ci_width is None, otherwise until the Wilson interval is at
+    # most ci_width wide or max_sample_size trials have been spent
+    if ci_width is None:
+        return trials >= sample_size
+    if max_sample_size is not None and trials >= max_sample_size:
+        return True
+    low, high = wilson_interval(successes, trials, z)
+    return trials > 0 and high - low <= ci_width
+
+
+def run_point(k, bch_code, ber, sample_size, seed=None, ci_width=None, max_sample_size=None, z=1.96, successes=0,
+              trials=0, profile=None, link=None):
+    # successes/trials continue a point from earlier counts. Each batch is seeded by its trial offset, so
+    # topping up a point draws fresh streams and resuming the same checkpoint twice gives the same result
+    if not isinstance(seed, np.random.SeedSequence):
+        seed = np.random.SeedSequence(seed)
+    elapsed = 0.0
+    while not budget_met(successes, trials, sample_size, ci_width, max_sample_size, z):
+        if ci_width is None:
+            batch_size = sample_size - trials
+        else:
+            batch_size = sample_size if max_sample_size is None else min(sample_size, max_sample_size - trials)
+        batch_successes, batch_time = simulate_point(k, bch_code, ber, batch_size, child_seed(seed, trials), profile,
+                                                     link)
+        successes += batch_successes
+        trials += batch_size
+        elapsed += batch_time
+    return successes, trials, elapsed
 
-        for _ in range(sample_size):
-            data = np.random.randint(2, size=k)
 
-            if bch_code is not None:
-                encoded_data = bch_code.encode(data)
-                error_data = introduce_error(encoded_data, ber)
-                decoded_data = bch_code.decode(error_data)
+def profiled_run_point(profile, *args, **kwargs):
+    # run_point in a worker process with profile active there; the filled profile travels back with the result
+    with profile.activate():
+        return run_point(*args, profile=profile, **kwargs), profile
 
-                if decoded_data[0] is not None and np.array_equal(decoded_data[0][:len(data)], data):
-                    success_count += 1
-            else:
-                error_data = introduce_error(data, ber)
-                if np.array_equal(error_data, data):
-                    success_count += 1
 
-        success_rate = success_count / sample_size
-        success_history.append(success_rate)
-        ber_history.append(ber)
-        current_step += 1
-        epoch_time = time.perf_counter() - start_time
+def link_name(link):
+    return "bsc" if link is None else link.name
+
+
+def checkpoint_key(k, bch_code, ber, link=None):
+    return describe(k, bch_code), getattr(bch_code, "decoder", None), link_name(link), round(ber, 10)
+
+
+def checkpoint_settings(sweeps, max_ber, ber_step, patience_count, patience_threshold, link=None):
+    # What a checkpoint has to be written with to be resumed. Sample budgets may differ, their points are topped up
+    return {"codes": [[describe(k, bch_code), getattr(bch_code, "decoder", None)] for k, bch_code in sweeps],
+            "max_ber": max_ber, "ber_step": ber_step, "patience_count": patience_count,
+            "patience_threshold": patience_threshold, "channel": link_name(link)}
+
+
+def load_checkpoint(path):
+    # Completed points keyed by checkpoint_key; later lines supersede earlier ones for the same point
+    records = {}
+    if path is None or not os.path.exists(path):
+        return records
+    with open(path, 'r') as file:
+        for line in file:
+            if line.strip():
+                record = json.loads(line)
+                key = record["code"], record["decoder"], record.get("channel", "bsc"), round(record["ber"], 10)
+                records[key] = record
+    return records
+
+
+def save_checkpoint(file, record):
+    # One JSON line per finished point, forced to disk so a preempted run loses at most the points in flight
+    file.write(json.dumps(record) + "\n")
+    file.flush()
+    os.fsync(file.fileno())
 
-        if bch_code is not None:
-            print(
-                f"Code: BCH({bch_code.n},{bch_code.k}) | BER: {ber:.3f} | Step: {current_step:4d} | Success Rate: {success_rate:.4f} | Time: {epoch_time:.3f}s")
+
+def early_stop_index(success_history, patience_count, patience_threshold):
+    # First step that closes a run of patience_count rates at or below the threshold
+    for step in range(patience_count - 1, len(success_history)):
+        if all(rate <= patience_threshold for rate in success_history[step - patience_count + 1:step + 1]):
+            return step
+    return None
+
+
+def store_point(k, bch_code, ber, success_rate, interval, trials=None, successes=None, epoch_time=None, link=None):
+    # One row for results_store; the uncoded baseline is stored as a (k, k) code with t = 0
+    return {"n": getattr(bch_code, "n", k), "k": k, "t": getattr(bch_code, "t", 0),
+            "decoder": getattr(bch_code, "decoder", None), "channel": link_name(link), "ber": ber,
+            "rate": success_rate, "low": interval[0], "high": interval[1], "trials": trials, "successes": successes,
+            "time": epoch_time}
+
+
+def profile_name(k, bch_code, link=None):
+    # Report key of a sweep, kept apart per decoder and channel like the checkpoint and store keys
+    code, decoder, channel_name, _ = checkpoint_key(k, bch_code, 0.0, link)
+    return f"{code} [{decoder}, {channel_name}]" if decoder is not None else f"{code} [{channel_name}]"
+
+
+def describe(k, bch_code):
+    return f"BCH({bch_code.n},{bch_code.k})" if bch_code is not None else f"No encoding (k={k})"
+
+
+def print_point(k, bch_code, ber, step, success_rate, interval, trials, epoch_time):
+    print(
+        f"Code: {describe(k, bch_code)} | BER: {ber:.3f} | Step: {step:4d} | Success Rate: {success_rate:.4f} "
+        f"[{interval[0]:.4f}, {interval[1]:.4f}] | Trials: {trials:6d} | Time: {epoch_time:.3f}s")
+
+
+def run_simulation(k, bch_code=None, max_ber=1.0, ber_step=0.05, sample_size=100, patience_count=5,
+                   patience_threshold=0.0, seed=None, ci_width=None, max_sample_size=None, link=None, profile=None):
+    # With a profiling.Report every point is timed per stage and merged under its profile_name, as in
+    # run_parallel_sweep
+    if not isinstance(seed, np.random.SeedSequence):
+        seed = np.random.SeedSequence(seed)
+    success_history = []
+    ber_history = []
+    interval_history = []
+
+    for index, ber in enumerate(ber_grid(max_ber, ber_step)):
+        arguments = (k, bch_code, ber, sample_size, child_seed(seed, index), ci_width, max_sample_size)
+        if profile is None:
+            successes, trials, epoch_time = run_point(*arguments, link=link)
         else:
-            print(
-                f"Code: No encoding (k={k}) | BER: {ber:.3f} | Step: {current_step:4d} | Success Rate: {success_rate:.4f} | Time: {epoch_time:.3f}s")
+            (successes, trials, epoch_time), point_profile = profiled_run_point(
+                profile.new_profile(describe(k, bch_code)), *arguments, link=link)
+            profile.add(profile_name(k, bch_code, link), point_profile)
+        success_rate = successes / trials
+        success_history.append(success_rate)
+        ber_history.append(ber)
+        interval_history.append(wilson_interval(successes, trials))
+        print_point(k, bch_code, ber, index + 1, success_rate, interval_history[-1], trials, epoch_time)
 
-        if len(success_history) >= patience_count and all(
-                rate <= patience_threshold for rate in success_history[-patience_count:]):
+        if early_stop_index(success_history[-patience_count:], patience_count, patience_threshold) is not None:
             print("Early stopping triggered!")
             break
 
-        ber += ber_step
+    return success_history, ber_history, interval_history
 
-    return success_history, ber_history
+
+def publish_tables(sweeps):
+    # Every code's large decoding tables are built once here and mapped by the workers, which would otherwise
+    # each build a private copy; they are unlinked when the returned Publisher closes
+    publisher = shared_tables.Publisher()
+    try:
+        for _, bch_code in sweeps:
+            if bch_code is not None:
+                bch_code.publish_tables(publisher)
+    except BaseException:
+        publisher.close()
+        raise
+    return publisher
+
+
+def run_parallel_sweep(sweeps, max_ber=1.0, ber_step=0.05, sample_size=100, patience_count=5,
+                       patience_threshold=0.0, seed=None, workers=None, ci_width=None, max_sample_size=None,
+                       checkpoint=None, store=None, profile=None, link=None):
+    # sweeps is a list of (k, bch_code) pairs, bch_code None for the uncoded baseline. Every (sweep, BER point)
+    # task has its own seed derived from its position, so results do not depend on the number of workers.
+    # With a checkpoint path every finished point is appended to it, and a restarted run only tops up
+    # points whose stored trials fall short of the current budget; a checkpoint of other settings is refused.
+    # With a ResultsStore the kept points of every sweep are saved as a new run. With a profiling.Report every
+    # point is timed per stage and merged into the report under its profile_name. link is an optional
+    # channel.Link shared by every sweep.
+    records = load_checkpoint(checkpoint)
+    settings = checkpoint_settings(sweeps, max_ber, ber_step, patience_count, patience_threshold, link)
+    if records and any(record.get("settings") != settings for record in records.values()):
+        raise ValueError(f"{checkpoint} was written by a sweep with other codes, BER grid, early stopping or "
+                         f"channel; delete it to start over")
+    if records and seed is None:
+        # Resume the streams of the interrupted run
+        seed = next(iter(records.values()))["seed"]
+    if not isinstance(seed, np.random.SeedSequence):
+        seed = np.random.SeedSequence(seed)
+    if records and any(record["seed"] != seed.entropy for record in records.values()):
+        raise ValueError(f"{checkpoint} was written with a different seed than {seed.entropy}")
+    bers = ber_grid(max_ber, ber_step)
+    results = [{} for _ in sweeps]
+    intervals = [{} for _ in sweeps]
+    counts = [{} for _ in sweeps]
+    stops = [None] * len(sweeps)
+    futures = [{} for _ in sweeps]
+
+    def finish_point(sweep, index, successes, trials, epoch_time):
+        k, bch_code = sweeps[sweep]
+        results[sweep][index] = successes / trials
+        intervals[sweep][index] = wilson_interval(successes, trials)
+        counts[sweep][index] = (trials, successes, epoch_time)
+        print_point(k, bch_code, bers[index], index + 1, results[sweep][index], intervals[sweep][index], trials,
+                    epoch_time)
+
+        if stops[sweep] is None:
+            # Only the contiguous prefix of finished points decides, exactly like a sequential run
+            prefix = []
+            while len(prefix) in results[sweep]:
+                prefix.append(results[sweep][len(prefix)])
+            stops[sweep] = early_stop_index(prefix, patience_count, patience_threshold)
+            if stops[sweep] is not None:
+                print(f"Early stopping triggered for {describe(k, bch_code)}!")
+                for other, other_index in futures[sweep].items():
+                    if other_index > stops[sweep]:
+                        other.cancel()
+
+    checkpoint_file = open(checkpoint, 'a') if checkpoint is not None else None
+    try:
+        with publish_tables(sweeps) as publisher, ProcessPoolExecutor(
+                max_workers=workers, mp_context=pool_context(), initializer=shared_tables.attach,
+                initargs=(publisher.handles,)) as executor:
+            # Submit low BER points first so early stopping can cancel the tail before it runs
+            for index, ber in enumerate(bers):
+                for sweep, (k, bch_code) in enumerate(sweeps):
+                    if stops[sweep] is not None and index > stops[sweep]:
+                        continue
+                    record = records.get(checkpoint_key(k, bch_code, ber, link))
+                    successes, trials = (record["successes"], record["trials"]) if record else (0, 0)
+                    if record and budget_met(successes, trials, sample_size, ci_width, max_sample_size):
+                        # Restored points count for early stopping like freshly finished ones
+                        finish_point(sweep, index, successes, trials, record["time"])
+                        continue
+                    point_seed = child_seed(child_seed(seed, sweep), index)
+                    arguments = (k, bch_code, ber, sample_size, point_seed, ci_width, max_sample_size, 1.96, successes,
+                                 trials)
+                    if profile is None:
+                        future = executor.submit(run_point, *arguments, link=link)
+                    else:
+                        future = executor.submit(profiled_run_point, profile.new_profile(describe(k, bch_code)),
+                                                 *arguments, link=link)
+                    futures[sweep][future] = index
+
+            pending = {future: sweep for sweep in range(len(sweeps)) for future in futures[sweep]}
+            for future in as_completed(pending):
+                sweep = pending[future]
+                index = futures[sweep][future]
+                if future.cancelled() or (stops[sweep] is not None and index > stops[sweep]):
+                    continue
+
+                k, bch_code = sweeps[sweep]
+                if profile is None:
+                    successes, trials, epoch_time = future.result()
+                else:
+                    (successes, trials, epoch_time), point_profile = future.result()
+                    profile.add(profile_name(k, bch_code, link), point_profile)
+                if checkpoint_file is not None:
+                    point_seed = child_seed(child_seed(seed, sweep), index)
+                    previous = records.get(checkpoint_key(k, bch_code, bers[index], link))
+                    save_checkpoint(checkpoint_file, {
+                        "code": describe(k, bch_code), "decoder": getattr(bch_code, "decoder", None),
+                        "channel": link_name(link), "n": getattr(bch_code, "n", k), "k": k, "ber": bers[index],
+                        "trials": trials, "successes": successes, "seed": point_seed.entropy,
+                        "spawn_key": list(point_seed.spawn_key),
+                        "time": epoch_time + (previous["time"] if previous else 0.0), "settings": settings})
+                finish_point(sweep, index, successes, trials, epoch_time)
+    finally:
+        if checkpoint_file is not None:
+            checkpoint_file.close()
+
+    histories = []
+    for sweep in range(len(sweeps)):
+        length = len(bers) if stops[sweep] is None else stops[sweep] + 1
+        histories.append(([results[sweep][index] for index in range(length)], bers[:length],
+                          [intervals[sweep][index] for index in range(length)]))
+
+    if store is not None:
+        run_id = store.start_run("monte_carlo", seed.entropy, {
+            "max_ber": max_ber, "ber_step": ber_step, "sample_size": sample_size, "ci_width": ci_width,
+            "max_sample_size": max_sample_size, "patience_count": patience_count,
+            "patience_threshold": patience_threshold, "channel": link_name(link)})
+        store.add_points(run_id, [store_point(k, bch_code, bers[index], results[sweep][index], intervals[sweep][index],
+                                              *counts[sweep][index], link)
+                                  for sweep, (k, bch_code) in enumerate(sweeps)
+                                  for index in range(len(histories[sweep][0]))])
+    return histories
+
+
+def run_stratified_sweep(sweeps, max_ber=1.0, ber_step=0.05, samples_per_weight=1000, patience_count=5,
+                         patience_threshold=0.0, seed=None, store=None):
+    # Same histories as run_parallel_sweep, but every curve comes from one set of per-weight trials
+    # (or from the closed form for bounded-distance decoders) instead of fresh samples at every BER point
+    if not isinstance(seed, np.random.SeedSequence):
+        seed = np.random.SeedSequence(seed)
+    bers = ber_grid(max_ber, ber_step)
+    histories = []
+    points = []
+
+    for sweep, (k, bch_code) in enumerate(sweeps):
+        start_time = time.perf_counter()
+        rates, intervals = stratified.success_curve(k, bch_code, bers, samples_per_weight, child_seed(seed, sweep))
+        success_history = [float(rate) for rate in rates]
+        interval_history = [(float(low), float(high)) for low, high in intervals]
+        print(f"Code: {describe(k, bch_code)} | Stratified over {len(bers)} BER points | "
+              f"Time: {time.perf_counter() - start_time:.3f}s")
+
+        stop = early_stop_index(success_history, patience_count, patience_threshold)
+        length = len(bers) if stop is None else stop + 1
+        histories.append((success_history[:length], bers[:length], interval_history[:length]))
+        # Stratified points have no per-BER trial counts, only the estimate and its interval
+        points += [store_point(k, bch_code, bers[index], success_history[index], interval_history[index])
+                   for index in range(length)]
+
+    if store is not None:
+        run_id = store.start_run("stratified", seed.entropy, {
+            "max_ber": max_ber, "ber_step": ber_step, "samples_per_weight": samples_per_weight,
+            "patience_count": patience_count, "patience_threshold": patience_threshold})
+        store.add_points(run_id, points)
+    return histories
+
+
+def ebn0_grid(max_ebn0, ebn0_step):
+    return [round(ebn0, 10) for ebn0 in np.arange(0.0, max_ebn0 + ebn0_step / 2, ebn0_step)]
+
+
+def simulate_soft_point(bch_code, ebn0_db, sample_size, seed=None, positions=None):
+    # Frame successes of hard-decision decoding and of Chase-2 on the same AWGN words, with the decoding time of
+    # each, so the coding gain can be weighed against the extra work per word
+    rng = np.random.default_rng(seed)
+    messages = rng.integers(0, 2, size=(sample_size, bch_code.k), dtype=np.uint8)
+    codewords = bch_code.encode_batch(messages)
+    llrs = channel.bpsk_awgn(rng, codewords, ebn0_db, bch_code.k / bch_code.n)
+
+    start_time = time.perf_counter()
+    hard_decoded, _, _ = bch_code.decode_batch((llrs < 0).astype(np.uint8))
+    hard_time = time.perf_counter() - start_time
+    start_time = time.perf_counter()
+    chase_decoded, _, _ = chase.chase_decode(bch_code, llrs, positions)
+    chase_time = time.perf_counter() - start_time
+
+    hard_successes = int(np.count_nonzero(np.all(hard_decoded[:, :bch_code.k] == messages, axis=1)))
+    chase_successes = int(np.count_nonzero(np.all(chase_decoded[:, :bch_code.k] == messages, axis=1)))
+    return hard_successes, chase_successes, hard_time, chase_time
+
+
+def run_soft_sweep(codes, max_ebn0=8.0, ebn0_step=0.5, sample_size=1000, seed=None, positions=None, store=None):
+    # Frame success against Eb/N0 on an AWGN/BPSK channel for every code, hard-decision and Chase-2 side by side.
+    # In the store both curves are kept under channel 'awgn', the Chase-2 one as decoder 'chase2', with the
+    # channel's raw bit error rate in the BER column
+    if not isinstance(seed, np.random.SeedSequence):
+        seed = np.random.SeedSequence(seed)
+    grid = ebn0_grid(max_ebn0, ebn0_step)
+    histories = []
+    points = []
+
+    for sweep, bch_code in enumerate(codes):
+        hard_history, chase_history = [], []
+        for index, ebn0 in enumerate(grid):
+            hard_successes, chase_successes, hard_time, chase_time = simulate_soft_point(
+                bch_code, ebn0, sample_size, child_seed(child_seed(seed, sweep), index), positions)
+            hard_history.append(hard_successes / sample_size)
+            chase_history.append(chase_successes / sample_size)
+            print(f"Code: {describe(bch_code.k, bch_code)} | Eb/N0: {ebn0:.2f} dB | "
+                  f"Hard: {hard_history[-1]:.4f} ({hard_time:.3f}s) | Chase-2: {chase_history[-1]:.4f} "
+                  f"({chase_time:.3f}s)")
+
+            ber = float(channel.hard_decision_ber(ebn0, bch_code.k / bch_code.n))
+            for decoder, successes, decode_time in ((bch_code.decoder, hard_successes, hard_time),
+                                                    ("chase2", chase_successes, chase_time)):
+                point = store_point(bch_code.k, bch_code, ber, successes / sample_size,
+                                    wilson_interval(successes, sample_size), sample_size, successes, decode_time)
+                points.append(dict(point, decoder=decoder, channel="awgn"))
+        histories.append((hard_history, chase_history, grid))
+
+    if store is not None:
+        run_id = store.start_run("soft_decision", seed.entropy, {
+            "max_ebn0": max_ebn0, "ebn0_step": ebn0_step, "sample_size": sample_size, "positions": positions})
+        store.add_points(run_id, points)
+    return histories
 
 
 if __name__ == "__main__":
     print("Starting BCH simulation...")
-    print(f"Max BER: {config.MAX_BER}, Step: {config.BER_STEP}, Samples: {config.SAMPLE_SIZE}")
+    print(f"Max BER: {config.MAX_BER}, Step: {config.BER_STEP}, Samples: {config.SAMPLE_SIZE}, Seed: {config.SEED}, "
+          f"Workers: {config.WORKERS or 'all cores'}")
+    if config.ADAPTIVE:
+        print(f"Adaptive sampling: CI width {config.CI_WIDTH}, at most {config.MAX_SAMPLE_SIZE} samples per point")
 
     simulation_start_time = time.perf_counter()
 
@@ -96,84 +493,35 @@ if __name__ == "__main__":
     bch15_11 = bch15_11.BCH15_11()
     bch7_4 = bch7_4.BCH7_4()
 
-    # Run simulations
-    bch127_8_success, bch127_8_ber = run_simulation(bch127_8.k, bch127_8, config.MAX_BER, config.BER_STEP,
-                                                    config.SAMPLE_SIZE, config.PATIENCE, config.THRESHOLD)
-    bch31_6_success, bch31_6_ber = run_simulation(bch31_6.k, bch31_6, config.MAX_BER, config.BER_STEP,
-                                                  config.SAMPLE_SIZE, config.PATIENCE, config.THRESHOLD)
-    bch15_5_success, bch15_5_ber = run_simulation(bch15_5.k, bch15_5, config.MAX_BER, config.BER_STEP,
-                                                  config.SAMPLE_SIZE, config.PATIENCE, config.THRESHOLD)
-    bch15_7_success, bch15_7_ber = run_simulation(bch15_7.k, bch15_7, config.MAX_BER, config.BER_STEP,
-                                                  config.SAMPLE_SIZE, config.PATIENCE, config.THRESHOLD)
-    bch15_11_success, bch15_11_ber = run_simulation(bch15_11.k, bch15_11, config.MAX_BER, config.BER_STEP,
-                                                    config.SAMPLE_SIZE, config.PATIENCE, config.THRESHOLD)
-    bch7_4_success, bch7_4_ber = run_simulation(bch7_4.k, bch7_4, config.MAX_BER, config.BER_STEP, config.SAMPLE_SIZE,
-                                                config.PATIENCE, config.THRESHOLD)
-    baseline_15_success, baseline_15_ber = run_simulation(15, None, config.MAX_BER, config.BER_STEP, config.SAMPLE_SIZE,
-                                                          config.PATIENCE, config.THRESHOLD)
-    baseline_7_success, baseline_7_ber = run_simulation(7, None, config.MAX_BER, config.BER_STEP, config.SAMPLE_SIZE,
-                                                        config.PATIENCE, config.THRESHOLD)
-
-    # Find longest history
-    max_length = max(len(bch127_8_success), len(bch31_6_success), len(bch15_5_success),
-                     len(bch15_7_success), len(bch15_11_success), len(bch7_4_success),
-                     len(baseline_15_success), len(baseline_7_success))
-
-    BER_history = max([bch127_8_ber, bch31_6_ber, bch15_5_ber, bch15_7_ber,
-                       bch15_11_ber, bch7_4_ber, baseline_15_ber, baseline_7_ber], key=len)
-
-
-    # Pad lists to same length
-    def pad_list(lst, length):
-        return lst + [0] * (length - len(lst))
-
-
-    bch127_8_success = pad_list(bch127_8_success, max_length)
-    bch31_6_success = pad_list(bch31_6_success, max_length)
-    bch15_5_success = pad_list(bch15_5_success, max_length)
-    bch15_7_success = pad_list(bch15_7_success, max_length)
-    bch15_11_success = pad_list(bch15_11_success, max_length)
-    bch7_4_success = pad_list(bch7_4_success, max_length)
-    baseline_15_success = pad_list(baseline_15_success, max_length)
-    baseline_7_success = pad_list(baseline_7_success, max_length)
-
-
-    # Calculate code rates
-    def get_code_rate(bch_code, success_history):
-        data_ratio = bch_code.k / bch_code.n
-        return [success_rate * data_ratio for success_rate in success_history]
-
-
-    bch127_8_rate = get_code_rate(bch127_8, bch127_8_success)
-    bch31_6_rate = get_code_rate(bch31_6, bch31_6_success)
-    bch15_5_rate = get_code_rate(bch15_5, bch15_5_success)
-    bch15_7_rate = get_code_rate(bch15_7, bch15_7_success)
-    bch15_11_rate = get_code_rate(bch15_11, bch15_11_success)
-    bch7_4_rate = get_code_rate(bch7_4, bch7_4_success)
+    # Run simulations, every (code, BER point) task on its own reproducible random stream
+    sweeps = [(bch127_8.k, bch127_8), (bch31_6.k, bch31_6), (bch15_5.k, bch15_5), (bch15_7.k, bch15_7),
+              (bch15_11.k, bch15_11), (bch7_4.k, bch7_4), (15, None), (7, None)]
+    profile = profiling.Report(config.CPROFILE_CODES) if config.PROFILE else None
+    link = None
+    if config.BURST_LENGTH is not None or config.INTERLEAVER is not None:
+        link = channel.Link(config.BURST_LENGTH, config.BER_BAD, interleaver.create(
+            config.INTERLEAVER, config.INTERLEAVER_DEPTH, config.INTERLEAVER_DELAY))
+        print(f"Channel: {link.name}")
+    if config.STRATIFIED and config.BURST_LENGTH is not None:
+        raise SystemExit("Stratified estimates assume independent bit errors, set BURST_LENGTH = None to use them")
+    with results_store.ResultsStore(config.RESULTS_DB) as store:
+        if config.SOFT_DECISION:
+            run_soft_sweep([bch_code for _, bch_code in sweeps if bch_code is not None], config.MAX_EBN0,
+                           config.EBN0_STEP, config.SAMPLE_SIZE, config.SEED, config.CHASE_POSITIONS, store)
+        elif config.STRATIFIED:
+            run_stratified_sweep(sweeps, config.MAX_BER, config.BER_STEP, config.SAMPLES_PER_WEIGHT, config.PATIENCE,
+                                 config.THRESHOLD, config.SEED, store)
+        else:
+            run_parallel_sweep(sweeps, config.MAX_BER, config.BER_STEP, config.SAMPLE_SIZE, config.PATIENCE,
+                               config.THRESHOLD, config.SEED, config.WORKERS,
+                               config.CI_WIDTH if config.ADAPTIVE else None, config.MAX_SAMPLE_SIZE,
+                               config.CHECKPOINT_FILE, store, profile, link)
+        run_id = store.latest_run()
 
     total_time = time.perf_counter() - simulation_start_time
     print(f"Simulation took {int(total_time // 60)} minutes and {total_time % 60:.2f} seconds")
-
-    # Save success results
-    with open('success_results.csv', 'w', newline='') as file:
-        writer = csv.writer(file)
-        writer.writerow(
-            ['BER', 'BCH(127,8)', 'BCH(31,6)', 'BCH(15,5)', 'BCH(15,7)', 'BCH(15,11)', 'BCH(7,4)', 'No encoding (k=15)',
-             'No encoding (k=7)'])
-        for i in range(max_length):
-            writer.writerow([BER_history[i], bch127_8_success[i], bch31_6_success[i], bch15_5_success[i],
-                             bch15_7_success[i], bch15_11_success[i], bch7_4_success[i],
-                             baseline_15_success[i], baseline_7_success[i]])
-
-    # Save rate results
-    with open('rate_results.csv', 'w', newline='') as file:
-        writer = csv.writer(file)
-        writer.writerow(
-            ['BER', 'BCH(127,8)', 'BCH(31,6)', 'BCH(15,5)', 'BCH(15,7)', 'BCH(15,11)', 'BCH(7,4)', 'No encoding (k=15)',
-             'No encoding (k=7)'])
-        for i in range(max_length):
-            writer.writerow([BER_history[i], bch127_8_rate[i], bch31_6_rate[i], bch15_5_rate[i],
-                             bch15_7_rate[i], bch15_11_rate[i], bch7_4_rate[i],
-                             baseline_15_success[i], baseline_7_success[i]])
-
-    print("Results saved! Run plot_results.py to generate plots.")
+    if profile is not None:
+        profile.print()
+        profile.save(config.PROFILE_REPORT)
+        print(f"Profile report saved to {config.PROFILE_REPORT}")
+    print(f"Results saved to {config.RESULTS_DB} as run {run_id}! Run plot_results.py to generate plots.")
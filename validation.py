@@ -0,0 +1,109 @@
+import argparse
+import json
+import time
+
+import numpy as np
+
+import bch_utils
+
+DEFAULT_CODES = [(7, 4), (15, 11), (15, 7), (15, 5), (31, 6), (127, 8)]
+
+
+def random_error_patterns(rng, count, n, max_weight):
+    # Uniformly distributed weights in [0, max_weight], positions uniform for each weight
+    weights = rng.integers(0, max_weight + 1, size=count)
+    ranks = np.argsort(rng.random((count, n)), axis=1)
+    return (ranks < weights[:, None]).astype(np.uint8), weights
+
+
+def validate(code, message_count=100_000, batch_size=10_000, max_weight=None, seed=None, max_failures=10):
+    rng = np.random.default_rng(seed)
+    reference = bch_utils.reference_code(code.n, code.k)
+    if max_weight is None:
+        max_weight = min(code.n, code.t + 2)
+
+    encode_mismatches = 0
+    decode_mismatches = 0
+    failures = []
+    start_time = time.perf_counter()
+
+    for offset in range(0, message_count, batch_size):
+        count = min(batch_size, message_count - offset)
+        messages = rng.integers(0, 2, size=(count, code.k), dtype=np.uint8)
+
+        codewords = code.encode_batch(messages)
+        reference_codewords = reference.encode(messages).view(np.ndarray).astype(np.uint8)
+        bad_encodes = np.flatnonzero(np.any(codewords != reference_codewords, axis=1))
+        encode_mismatches += len(bad_encodes)
+        for row in bad_encodes:
+            failures.append({"stage": "encode", "error_weight": 0, "message": messages[row].tolist(),
+                             "ours": codewords[row].tolist(), "reference": reference_codewords[row].tolist()})
+
+        errors, weights = random_error_patterns(rng, count, code.n, max_weight)
+        received = reference_codewords ^ errors
+        corrected, error_counts, failed = code.decode_batch(received)
+        reference_corrected, reference_counts = reference.decode(received, output="codeword", errors=True)
+        reference_corrected = reference_corrected.view(np.ndarray)
+        reference_failed = reference_counts < 0
+
+        # galois returns the received word unchanged when it cannot decode, so only compare successes
+        bad_decodes = np.flatnonzero((failed != reference_failed) | (~failed & ~reference_failed & (
+                np.any(corrected != reference_corrected, axis=1) | (error_counts != reference_counts))))
+        decode_mismatches += len(bad_decodes)
+        for row in bad_decodes:
+            failures.append({"stage": "decode", "error_weight": int(weights[row]),
+                             "codeword": reference_codewords[row].tolist(), "received": received[row].tolist(),
+                             "ours": None if failed[row] else corrected[row].tolist(),
+                             "ours_errors": None if failed[row] else int(error_counts[row]),
+                             "reference": None if reference_failed[row] else reference_corrected[row].tolist(),
+                             "reference_errors": int(reference_counts[row])})
+
+        # Keep only the smallest failing cases, they are the easiest to debug
+        failures = sorted(failures, key=lambda case: case["error_weight"])[:max_failures]
+
+    return {
+        "code": f"BCH({code.n},{code.k})",
+        "decoder": code.decoder,
+        "messages": message_count,
+        "max_error_weight": max_weight,
+        "seed": seed,
+        "encode_mismatches": encode_mismatches,
+        "decode_mismatches": decode_mismatches,
+        "time": time.perf_counter() - start_time,
+        "failures": failures,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cross-check our encoders and decoders against galois.BCH")
+    parser.add_argument("--codes", nargs="+", default=[f"{n},{k}" for n, k in DEFAULT_CODES],
+                        help="codes to validate as n,k pairs")
+    parser.add_argument("--decoder", choices=bch_utils.DECODERS, default=None)
+    parser.add_argument("--messages", type=int, default=100_000)
+    parser.add_argument("--batch-size", type=int, default=10_000)
+    parser.add_argument("--max-weight", type=int, default=None, help="largest error weight to inject")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--dump", default=None, help="write the minimal failing cases to this JSON file")
+    args = parser.parse_args()
+
+    reports = []
+    for spec in args.codes:
+        n, k = (int(value) for value in spec.split(","))
+        code = bch_utils.BCHCode(n, k, decoder=args.decoder)
+        report = validate(code, args.messages, args.batch_size, args.max_weight, args.seed)
+        reports.append(report)
+        print(f"Code: {report['code']} | Decoder: {report['decoder']} | Messages: {report['messages']} | "
+              f"Encode mismatches: {report['encode_mismatches']} | Decode mismatches: {report['decode_mismatches']} | "
+              f"Time: {report['time']:.3f}s")
+
+    if args.dump is not None:
+        with open(args.dump, 'w') as file:
+            json.dump(reports, file, indent=2)
+        print(f"Failing cases saved to {args.dump}")
+
+    if any(report["encode_mismatches"] or report["decode_mismatches"] for report in reports):
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()